@@ -10,12 +10,15 @@ Endpoints:
 - POST /api/v1/enforce/acknowledge - Acknowledge soft fails
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import Dict, Any
+from fastapi.responses import ORJSONResponse
+from datetime import datetime
+from typing import Dict, Any, Optional
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_db
 from app.api.dependencies import get_current_user
+from app.db.models.user import User
 from app.services.enforcement_service import EnforcementService
 
 router = APIRouter(prefix="/api/v1/enforce", tags=["enforcement"])
@@ -70,7 +73,7 @@ async def get_release_gate(
     try:
         enforcement_service = EnforcementService(db)
         result = await enforcement_service.enforce_release_gate(
-            tenant_id=str(tenant_id),
+            tenant_id=tenant_id,
             pipeline_id=pipeline_id
         )
         return result
@@ -82,6 +85,8 @@ async def get_release_gate(
 async def get_enforcement_history(
     tenant_id: UUID,
     limit: int = Query(100, ge=1, le=1000),
+    before: Optional[datetime] = Query(None),
+    before_id: Optional[UUID] = Query(None),
     current_user: str = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> Dict[str, Any]:
@@ -93,6 +98,11 @@ async def get_enforcement_history(
     Query Parameters:
     - tenant_id: UUID of tenant
     - limit: Max results (default 100, max 1000)
+    - before: Only decisions made before this time
+    - before_id: With before, only decisions after this one in the
+      result order; pass the previous page's next_before.decided_at and
+      next_before.decision_id as before and before_id to page through
+      the history
     
     Returns:
     ```json
@@ -114,7 +124,11 @@ async def get_enforcement_history(
           "acked_at": null
         }
       ],
-      "count": 1
+      "count": 1,
+      "next_before": {
+        "decided_at": "2025-12-21T10:30:00Z",
+        "decision_id": "550e8400-e29b-41d4-a716-446655440001"
+      }
     }
     ```
     
@@ -126,15 +140,26 @@ async def get_enforcement_history(
     try:
         enforcement_service = EnforcementService(db)
         history = await enforcement_service.get_enforcement_history(
-            tenant_id=str(tenant_id),
-            limit=limit
+            tenant_id=tenant_id,
+            limit=limit,
+            before=before,
+            before_id=before_id
         )
         
-        return {
+        next_before = None
+        if len(history) == limit:
+            next_before = {
+                "decided_at": history[-1]["decided_at"],
+                "decision_id": history[-1]["decision_id"],
+            }
+        
+        # History rows are already JSON-ready; skip jsonable_encoder's walk
+        return ORJSONResponse({
             "tenant_id": str(tenant_id),
             "decisions": history,
             "count": len(history),
-        }
+            "next_before": next_before,
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -142,7 +167,7 @@ async def get_enforcement_history(
 @router.post("/acknowledge")
 async def acknowledge_soft_fail(
     decision_id: UUID,
-    current_user: str = Depends(get_current_user),
+    current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> Dict[str, Any]:
     """
@@ -174,8 +199,8 @@ async def acknowledge_soft_fail(
     try:
         enforcement_service = EnforcementService(db)
         success = await enforcement_service.acknowledge_enforcement_decision(
-            decision_id=str(decision_id),
-            acked_by=current_user
+            decision_id=decision_id,
+            acked_by=current_user.id
         )
         
         if not success:
@@ -185,7 +210,7 @@ async def acknowledge_soft_fail(
         
         return {
             "success": True,
-            "message": f"Decision acknowledged by {current_user}",
+            "message": f"Decision acknowledged by {current_user.email}",
             "decision_id": str(decision_id),
         }
     except Exception as e:
@@ -228,7 +253,7 @@ async def check_enforcement_quota(
     """
     try:
         enforcement_service = EnforcementService(db)
-        result = await enforcement_service.check_enforcement_quota(str(tenant_id))
+        result = await enforcement_service.check_enforcement_quota(tenant_id)
         
         # Fetch tier for additional context
         from sqlalchemy import text
@@ -75,6 +75,7 @@ class Settings(BaseSettings):
     ZAP_PROXY_URL: str = "http://zap:8080"
     SCAN_TIMEOUT_SECONDS: int = 3600
     MAX_CONCURRENT_SCANS: int = 5
+    SCA_WORKSPACE_ROOT: Optional[str] = None  # Checkouts SCA scans may read
     
     # Storage (Backblaze B2)
     S3_BUCKET: Optional[str] = None
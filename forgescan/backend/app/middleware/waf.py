@@ -6,7 +6,34 @@ Blocks: SQL injection, XSS, CSRF, Path traversal, etc.
 
 import re
 from fastapi import HTTPException, Request
-from typing import List, Pattern
+from typing import Callable, List, Pattern
+
+try:
+    import pcre2
+    HAVE_PCRE2 = True
+except ImportError:
+    HAVE_PCRE2 = False
+
+
+def _fuse_patterns(patterns: List[Pattern]) -> str:
+    """Join patterns into one alternation, scoping each pattern's flags to its branch"""
+    branches = []
+    for pattern in patterns:
+        flags = ""
+        if pattern.flags & re.IGNORECASE:
+            flags += "i"
+        if pattern.flags & re.DOTALL:
+            flags += "s"
+        branches.append(f"(?{flags}:{pattern.pattern})")
+    return "|".join(branches)
+
+
+def _compile_scanner(patterns: List[Pattern]) -> Callable:
+    """Compile patterns into a single search function (PCRE2-JIT when available)"""
+    source = _fuse_patterns(patterns)
+    if HAVE_PCRE2:
+        return pcre2.compile(source, jit=True).search
+    return re.compile(source).search
 
 class WAF:
     """Web Application Firewall"""
@@ -27,25 +54,36 @@ class WAF:
         re.compile(r"<iframe", re.IGNORECASE),
     ]
     
-    PATH_TRAVERSAL_PATTERNS: List[Pattern] = [
-        re.compile(r"\.\./"),
-        re.compile(r"\.\.\\"),
-        re.compile(r"%2e%2e/", re.IGNORECASE),
-    ]
+    # Plain substrings: `in` is a direct memchr/memmem search, no regex engine
+    PATH_TRAVERSAL_MARKERS = ("../", "..\\")
+    ENCODED_TRAVERSAL_MARKER = "%2e%2e/"
+    
+    # Single charset scan; also covers `&&` and `||`
+    COMMAND_INJECTION_CHARS: Pattern = re.compile(r"[;&|`$()]")
     
-    COMMAND_INJECTION_PATTERNS: List[Pattern] = [
-        re.compile(r"[;&|`$()]"),
-        re.compile(r"&&|\|\|"),
+    # Keyword-only patterns that can match plain alphanumeric text
+    UNGATED_PATTERNS: List[Pattern] = [
+        SQL_INJECTION_PATTERNS[0],
+        SQL_INJECTION_PATTERNS[4],
     ]
     
+    # Every other pattern needs at least one of these characters to match,
+    # so benign values without them skip the full pattern set
+    ATTACK_TRIGGER: Pattern = re.compile(r"[<;#/\-.%&|`$()=:\\]")
+    
+    GATED_PATTERNS: List[Pattern] = SQL_INJECTION_PATTERNS[1:4] + XSS_PATTERNS
+    
+    # Fused scanners, compiled once at import rather than per WAF instance
+    _keyword_scan = staticmethod(_compile_scanner(UNGATED_PATTERNS))
+    _gated_scan = staticmethod(_compile_scanner(GATED_PATTERNS))
+    
     def __init__(self):
         self.blocked_ips: set = self.load_blocked_ips()
         self.suspicious_patterns = (
             self.SQL_INJECTION_PATTERNS +
-            self.XSS_PATTERNS +
-            self.PATH_TRAVERSAL_PATTERNS +
-            self.COMMAND_INJECTION_PATTERNS
+            self.XSS_PATTERNS
         )
+        self.gated_patterns = self.GATED_PATTERNS
     
     def load_blocked_ips(self) -> set:
         """Load blocked IPs from database/redis"""
@@ -83,10 +121,23 @@ class WAF:
     
     def _contains_attack_pattern(self, text: str) -> bool:
         """Check if text contains attack patterns"""
-        for pattern in self.suspicious_patterns:
-            if pattern.search(text):
+        if self._keyword_scan(text) is not None:
+            return True
+        
+        if not self.ATTACK_TRIGGER.search(text):
+            return False
+        
+        if self._has_path_traversal(text) or self.COMMAND_INJECTION_CHARS.search(text):
+            return True
+        
+        return self._gated_scan(text) is not None
+    
+    def _has_path_traversal(self, text: str) -> bool:
+        """Check for ../ and ..\\ sequences, including the URL-encoded form"""
+        for marker in self.PATH_TRAVERSAL_MARKERS:
+            if marker in text:
                 return True
-        return False
+        return "%" in text and self.ENCODED_TRAVERSAL_MARKER in text.lower()
     
     async def _log_attack(self, request: Request, reason: str):
         """Log attack attempt"""
@@ -1,20 +1,66 @@
-import re
 from typing import List, Dict, Any
 
+from pydantic import TypeAdapter
+
 from .models import Remediation, Priority
 from .priorities import BusinessImpactScore, calculate_priority
-from .rules import RULES
+from .rules import RULES, match_rules
+
+try:
+    import hyperscan
+    HAVE_HYPERSCAN = True
+except ImportError:
+    HAVE_HYPERSCAN = False
+
+# Built once: serializes a whole remediation list in a single pydantic-core pass
+_REMEDIATION_LIST = TypeAdapter(List[Remediation])
+
+# Lookup tables shared by every finding instead of being rebuilt per call
+BUSINESS_IMPACT_SCORES = {
+    "LOW": BusinessImpactScore.LOW,
+    "MEDIUM": BusinessImpactScore.MEDIUM,
+    "HIGH": BusinessImpactScore.HIGH,
+    "CRITICAL": BusinessImpactScore.CRITICAL,
+}
+
+SEVERITY_SCALE = {
+    "critical": 9,
+    "high": 7,
+    "medium": 5,
+    "low": 3,
+    "info": 1,
+}
+
+PRIORITY_ORDER = {"P0": 0, "P1": 1, "P2": 2, "P3": 3, "P4": 4}
+
+
+def _build_rule_database():
+    """
+    Compile every rule matcher into one Hyperscan block database.
+
+    Each pipe-separated pattern gets its rule's index as expression ID, so
+    the smallest ID reported by a scan is the first matching rule.
+    """
+    expressions, ids = [], []
+    for index, rule in enumerate(RULES):
+        for pattern in rule.get("matcher", "").split("|"):
+            expressions.append(pattern.strip().encode("utf-8"))
+            ids.append(index)
+
+    flags = [hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(ids)
+    database = hyperscan.Database()
+    database.compile(
+        expressions=expressions, ids=ids, elements=len(ids), flags=flags
+    )
+    return database
+
+
+_RULE_DATABASE = _build_rule_database() if HAVE_HYPERSCAN else None
 
 
 def map_business_impact(impact_str: str) -> BusinessImpactScore:
     """Convert string business impact to BusinessImpactScore enum"""
-    mapping = {
-        "LOW": BusinessImpactScore.LOW,
-        "MEDIUM": BusinessImpactScore.MEDIUM,
-        "HIGH": BusinessImpactScore.HIGH,
-        "CRITICAL": BusinessImpactScore.CRITICAL,
-    }
-    return mapping.get(impact_str.upper(), BusinessImpactScore.LOW)
+    return BUSINESS_IMPACT_SCORES.get(impact_str.upper(), BusinessImpactScore.LOW)
 
 
 def find_matching_rule(finding: Dict[str, Any]) -> Dict[str, Any] | None:
@@ -24,19 +70,25 @@ def find_matching_rule(finding: Dict[str, Any]) -> Dict[str, Any] | None:
     Uses case-insensitive regex matching on rule matchers.
     Returns first matching rule or None.
     """
-    finding_desc = finding.get("description", "").lower()
-    finding_title = finding.get("title", "").lower()
+    finding_desc = finding.get("description", "")
+    finding_title = finding.get("title", "")
     
-    for rule in RULES:
-        matcher = rule.get("matcher", "").lower()
-        # Split by pipe for multiple match patterns
-        patterns = [p.strip() for p in matcher.split("|")]
-        
-        for pattern in patterns:
-            if re.search(pattern, finding_desc) or re.search(pattern, finding_title):
-                return rule
+    if _RULE_DATABASE is not None:
+        # Newline separator: matchers never span description and title
+        hit = []
+
+        def on_match(rule_index, start, end, flags, context):
+            hit.append(rule_index)
+
+        _RULE_DATABASE.scan(
+            f"{finding_desc}\n{finding_title}".encode("utf-8", "ignore"),
+            match_event_handler=on_match,
+        )
+        return RULES[min(hit)] if hit else None
     
-    return None
+    # Same newline separation as above; match_rules returns RULES order
+    matches = match_rules(f"{finding_desc}\n{finding_title}")
+    return matches[0] if matches else None
 
 
 def extract_technical_severity(finding: Dict[str, Any]) -> int:
@@ -50,16 +102,8 @@ def extract_technical_severity(finding: Dict[str, Any]) -> int:
     - low: 3
     - info: 1
     """
-    severity_mapping = {
-        "critical": 9,
-        "high": 7,
-        "medium": 5,
-        "low": 3,
-        "info": 1,
-    }
-    
     severity = finding.get("severity", "low").lower()
-    return severity_mapping.get(severity, 3)
+    return SEVERITY_SCALE.get(severity, 3)
 
 
 def extract_exploitability(finding: Dict[str, Any]) -> int:
@@ -129,8 +173,7 @@ def evaluate_scan(findings: List[Dict[str, Any]]) -> List[Remediation]:
             remediations.append(remediation)
 
     # Sort by priority (P0 first)
-    priority_order = {"P0": 0, "P1": 1, "P2": 2, "P3": 3, "P4": 4}
-    remediations.sort(key=lambda x: priority_order.get(x.priority, 999))
+    remediations.sort(key=lambda x: PRIORITY_ORDER.get(x.priority, 999))
     
     return remediations
 
@@ -142,4 +185,4 @@ def evaluate_scan_json(findings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     Useful for API responses that need plain dict format.
     """
     remediations = evaluate_scan(findings)
-    return [r.dict() for r in remediations]
+    return _REMEDIATION_LIST.dump_python(remediations, mode="json")
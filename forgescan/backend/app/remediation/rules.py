@@ -8,6 +8,15 @@
 #
 # Structure allows easy addition of new rules as threat landscape evolves.
 
+import re
+from typing import Any, Dict, List, Optional, Set
+
+try:
+    import ahocorasick
+    HAVE_AHOCORASICK = True
+except ImportError:
+    HAVE_AHOCORASICK = False
+
 RULES = [
     {
         "id": "R001",
@@ -110,3 +119,89 @@ RULES = [
         "confidence": "Medium"
     },
 ]
+
+# Compile each matcher once at import; the pipe-separated alternatives are
+# matched case-insensitively as a single pattern
+for _rule in RULES:
+    _rule["_compiled"] = re.compile(_rule["matcher"], re.IGNORECASE)
+
+
+# Multi-pattern matching: literal alternatives go into one Aho-Corasick
+# automaton; the few regex alternatives (e.g. "api.?key") are checked
+# separately, one combined pattern per rule
+_REGEX_SYNTAX = re.compile(r"[.*?+\[\](){}^$\\]")
+
+
+def _build_rule_automaton():
+    """Build the literal automaton and the per-rule regex fallbacks"""
+    automaton = ahocorasick.Automaton()
+    regex_alternatives: Dict[int, List[str]] = {}
+
+    for index, rule in enumerate(RULES):
+        for alternative in rule["matcher"].lower().split("|"):
+            alternative = alternative.strip()
+            if _REGEX_SYNTAX.search(alternative):
+                regex_alternatives.setdefault(index, []).append(alternative)
+            else:
+                # The same literal may appear in several rules
+                automaton.add_word(
+                    alternative, automaton.get(alternative, ()) + (index,)
+                )
+
+    automaton.make_automaton()
+    regex_matchers = [
+        (index, re.compile("|".join(alternatives)))
+        for index, alternatives in regex_alternatives.items()
+    ]
+    return automaton, regex_matchers
+
+
+if HAVE_AHOCORASICK:
+    _RULE_AUTOMATON, _RULE_REGEX_MATCHERS = _build_rule_automaton()
+else:
+    _RULE_AUTOMATON, _RULE_REGEX_MATCHERS = None, []
+
+
+def match_rules(description: str) -> List[Dict[str, Any]]:
+    """
+    Return every rule whose matcher hits the given text, in RULES order.
+
+    Uses a single Aho-Corasick pass over the text when pyahocorasick is
+    installed, falling back to the per-rule compiled patterns otherwise.
+    """
+    text = description.lower()
+    indexes: Set[int] = set()
+
+    if _RULE_AUTOMATON is not None:
+        for _, rule_indexes in _RULE_AUTOMATON.iter(text):
+            indexes.update(rule_indexes)
+        for index, pattern in _RULE_REGEX_MATCHERS:
+            if index not in indexes and pattern.search(text):
+                indexes.add(index)
+    else:
+        indexes = {
+            index for index, rule in enumerate(RULES)
+            if rule["_compiled"].search(text)
+        }
+
+    return [RULES[index] for index in sorted(indexes)]
+
+
+# Highest business impact first, then highest technical severity, so
+# priority-driven consumers can stop at the first matching rule
+_IMPACT_RANK = {"CRITICAL": 0, "HIGH": 1, "MEDIUM": 2, "LOW": 3}
+
+RULES_BY_PRIORITY = sorted(
+    RULES,
+    key=lambda rule: (_IMPACT_RANK[rule["business_impact"]], -rule["technical_severity"]),
+)
+
+RULES_BY_ID = {rule["id"]: rule for rule in RULES}
+
+
+def match_highest_priority_rule(description: str) -> Optional[Dict[str, Any]]:
+    """Return the highest-priority rule matching the given text, or None"""
+    for rule in RULES_BY_PRIORITY:
+        if rule["_compiled"].search(description):
+            return rule
+    return None
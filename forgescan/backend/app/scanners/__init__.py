@@ -1,9 +1,23 @@
 # backend/app/scanners/__init__.py
+import importlib
+
 from app.scanners.base import BaseScannerPlugin, ScanResult, ScanStatus
 from app.scanners.plugin_manager import PluginManager
-from app.scanners.web_scanner import WebScanner
-from app.scanners.api_scanner import APIScanner
-from app.scanners.sca_scanner import SCAScanner
+
+# Scanner classes are imported on first access to keep package import light
+_LAZY_SCANNERS = {
+    "WebScanner": "app.scanners.web_scanner",
+    "APIScanner": "app.scanners.api_scanner",
+    "SCAScanner": "app.scanners.sca_scanner",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_SCANNERS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name), name)
+
 
 __all__ = [
     "BaseScannerPlugin",
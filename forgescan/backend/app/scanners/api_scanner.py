@@ -1,14 +1,182 @@
 # backend/app/scanners/api_scanner.py
-import aiohttp
-import json
-from typing import Dict, Any, List, Optional
+import httpx
+import orjson
+import re
+from collections import Counter
+from hashlib import blake2b
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
 from urllib.parse import urlparse
 import asyncio
+import weakref
+from contextlib import asynccontextmanager
 
 from app.scanners.base import BaseScannerPlugin, ScanResult, ScanStatus
 from app.core.constants import SeverityLevel, OWASP_API_TOP_10
 from app.core.logging import logger
 
+try:
+    import ijson
+    HAVE_IJSON = True
+except ImportError:
+    HAVE_IJSON = False
+
+
+# Probe inputs shared by every scan
+WEAK_TOKENS = ("test", "admin", "123456", "token")
+
+IDOR_TEST_IDS = ("1", "2", "999", "admin")
+
+OVERFLOW_PAYLOAD = "A" * 10000
+
+INPUT_VALIDATION_PAYLOADS = {
+    "xss": "<script>alert('XSS')</script>",
+    "sqli": "' OR '1'='1",
+    "xxe": "<?xml version='1.0'?><!DOCTYPE foo [<!ENTITY xxe SYSTEM 'file:///etc/passwd'>]><foo>&xxe;</foo>",
+    "overflow": OVERFLOW_PAYLOAD,
+}
+
+# Encoded once for the byte-level reflection check
+INPUT_VALIDATION_PAYLOAD_BYTES = {
+    payload_type: payload.encode("utf-8")
+    for payload_type, payload in INPUT_VALIDATION_PAYLOADS.items()
+}
+
+HTTP_METHODS = ("GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS", "HEAD", "TRACE")
+
+VERSION_PATTERNS = ("/v1/", "/v2/", "/api/v1/", "/api/v2/")
+
+ERROR_TRIGGERS = (
+    ("invalid_json", '{"invalid": json}', "application/json"),
+    ("malformed_request", "not a valid request", "text/plain"),
+)
+
+SENSITIVE_FIELDS = (
+    "password", "secret", "token", "api_key",
+    "ssn", "credit_card", "private_key",
+)
+
+# Rate-limit probing: AIMD concurrency, capped total request budget
+RATE_LIMIT_MAX_PROBES = 30
+RATE_LIMIT_INITIAL_CONCURRENCY = 8.0
+RATE_LIMIT_MAX_CONCURRENCY = 16
+RATE_LIMIT_HEADERS = (
+    "retry-after",
+    "x-ratelimit-limit",
+    "x-ratelimit-remaining",
+    "ratelimit-limit",
+    "ratelimit-remaining",
+)
+
+# Information-disclosure markers in error responses, matched in one pass
+DISCLOSURE_RE = re.compile(
+    r"stacktrace|traceback|exception|file path|database|sql|connection string",
+    re.IGNORECASE,
+)
+
+# Only the head of an error body is inspected for disclosure markers
+ERROR_BODY_SCAN_BYTES = 65536
+
+# Read size when streaming response bodies for payload reflection
+REFLECTION_CHUNK_BYTES = 32768
+
+# Stop walking a JSON response once this many sensitive paths are found
+MAX_EXPOSED_FIELDS = 50
+
+# Fields identifying a finding; findings agreeing on all of them are duplicates
+FINDING_KEY_FIELDS = ("title", "url", "method", "cwe_id", "parameter")
+
+# Undecodable bodies are skipped by the data-exposure check
+if HAVE_IJSON:
+    JSON_DECODE_ERRORS = (orjson.JSONDecodeError, ijson.JSONError)
+else:
+    JSON_DECODE_ERRORS = (orjson.JSONDecodeError,)
+
+# Per-host outbound concurrency (AIMD) shared by all APIScanner instances
+HOST_INITIAL_CONCURRENCY = 8
+HOST_MAX_CONCURRENCY = 64
+HOST_MAX_RETRY_AFTER = 30.0
+
+
+class HostLimiter:
+    """
+    AIMD concurrency limit for requests to a single host.
+    
+    The limit grows by roughly one slot per window of successful responses
+    and halves on 429, 5xx or connection errors. A Retry-After header
+    delays new requests until the indicated time. Cancelled requests give
+    their slot back without moving the limit.
+    """
+    
+    def __init__(self):
+        self.limit = float(HOST_INITIAL_CONCURRENCY)
+        self._in_flight = 0
+        self._resume_at = 0.0
+        self._condition = asyncio.Condition()
+    
+    async def acquire(self) -> None:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < int(self.limit))
+            self._in_flight += 1
+        
+        delay = self._resume_at - asyncio.get_running_loop().time()
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                await self.release(None, cancelled=True)
+                raise
+    
+    async def release(
+        self,
+        status: Optional[int],
+        retry_after: Optional[str] = None,
+        cancelled: bool = False
+    ) -> None:
+        async with self._condition:
+            self._in_flight -= 1
+            
+            if cancelled:
+                pass
+            elif status is None or status == 429 or status >= 500:
+                self.limit = max(1.0, self.limit * 0.5)
+            else:
+                self.limit = min(float(HOST_MAX_CONCURRENCY), self.limit + 1.0 / self.limit)
+            
+            if retry_after and retry_after.strip().isdigit():
+                delay = min(float(retry_after), HOST_MAX_RETRY_AFTER)
+                self._resume_at = asyncio.get_running_loop().time() + delay
+            
+            self._condition.notify_all()
+
+
+# Limiters are tied to the event loop they were first used on
+_HOST_LIMITERS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, HostLimiter]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_host_limiter(url: str) -> HostLimiter:
+    """Return the shared limiter for the URL's host on the running loop"""
+    limiters = _HOST_LIMITERS.setdefault(asyncio.get_running_loop(), {})
+    host = urlparse(url).netloc
+    limiter = limiters.get(host)
+    if limiter is None:
+        limiter = limiters[host] = HostLimiter()
+    return limiter
+
+
+class AsyncByteReader:
+    """Async file-like view of a byte-chunk iterator, as ijson expects"""
+    
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self._chunks = chunks
+    
+    async def read(self, size: int = -1) -> bytes:
+        # ijson probes with read(0) and accepts short reads; b"" ends the body
+        if size == 0:
+            return b""
+        return await anext(self._chunks, b"")
+
 
 class APIScanner(BaseScannerPlugin):
     """API security scanner"""
@@ -19,18 +187,28 @@ class APIScanner(BaseScannerPlugin):
     supported_protocols = ["http", "https"]
     
     def __init__(self):
-        self.timeout = aiohttp.ClientTimeout(total=300)
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.timeout = httpx.Timeout(300.0)
+        self.limits = httpx.Limits(max_connections=200, max_keepalive_connections=100)
+        self.session: Optional[httpx.AsyncClient] = None
         self.findings: List[Dict[str, Any]] = []
+        self._severity_counts: Counter = Counter()
+        self._finding_hashes: set[bytes] = set()
+        self._finding_queue: Optional[asyncio.Queue] = None
     
     async def initialize(self) -> None:
         """Initialize HTTP session"""
-        self.session = aiohttp.ClientSession(timeout=self.timeout)
+        # HTTP/2 multiplexes concurrent probes over one connection per host
+        self.session = httpx.AsyncClient(
+            http2=True,
+            timeout=self.timeout,
+            limits=self.limits,
+            follow_redirects=True,
+        )
     
     async def cleanup(self) -> None:
         """Close HTTP session"""
         if self.session:
-            await self.session.close()
+            await self.session.aclose()
     
     async def validate_target(self, target: str) -> bool:
         """Validate target URL"""
@@ -49,20 +227,38 @@ class APIScanner(BaseScannerPlugin):
     ) -> ScanResult:
         """Execute API security scan"""
         self.findings = []
+        self._severity_counts = Counter()
+        self._finding_hashes = set()
         options = options or {}
         
         try:
             logger.info(f"Starting API scan for {target}", extra={"scan_id": scan_id})
             
-            # Perform API-specific security checks
-            await self._check_authentication(target, options)
-            await self._check_authorization(target, options)
-            await self._check_rate_limiting(target)
-            await self._check_input_validation(target)
-            await self._check_http_methods(target)
-            await self._check_api_versioning(target)
-            await self._check_error_handling(target)
-            await self._check_data_exposure(target)
+            # Checks report findings through a queue drained by one writer
+            self._finding_queue = asyncio.Queue()
+            collector = asyncio.create_task(self._collect_findings())
+            
+            # Perform API-specific security checks; they are independent
+            # network probes, so run them concurrently
+            try:
+                results = await asyncio.gather(
+                    self._check_authentication(target, options),
+                    self._check_authorization(target, options),
+                    self._check_rate_limiting(target),
+                    self._check_input_validation(target),
+                    self._check_http_methods(target),
+                    self._check_api_versioning(target),
+                    self._check_error_handling(target),
+                    self._check_data_exposure(target),
+                    return_exceptions=True,
+                )
+            finally:
+                await self._finding_queue.put(None)
+                await collector
+            
+            for result in results:
+                if isinstance(result, BaseException):
+                    logger.debug(f"API check failed: {str(result)}")
             
             # Calculate summary
             summary = self._calculate_summary()
@@ -88,97 +284,115 @@ class APIScanner(BaseScannerPlugin):
                 error=str(e)
             )
     
-    async def _check_authentication(self, target: str, options: Dict[str, Any]):
+    async def _check_authentication(self, target: str, options: Dict[str, Any]) -> None:
         """Check authentication mechanisms"""
         # Test without authentication
-        try:
-            async with self.session.get(target) as response:
-                if response.status == 200:
-                    self.findings.append({
-                        "title": "API Accessible Without Authentication",
-                        "description": "API endpoint is accessible without any authentication",
-                        "severity": SeverityLevel.HIGH,
-                        "url": target,
-                        "method": "GET",
-                        "owasp_category": "API2:2023-Broken Authentication",
-                        "cwe_id": "CWE-306",
-                        "remediation": "Implement proper authentication mechanism (OAuth2, API keys, JWT)",
-                        "references": ["https://owasp.org/API-Security/editions/2023/en/0xa2-broken-authentication/"]
-                    })
-        except Exception as e:
-            logger.debug(f"Error checking authentication: {str(e)}")
+        if await self._fetch_head_status(target) == 200:
+            await self._report_finding({
+                "title": "API Accessible Without Authentication",
+                "description": "API endpoint is accessible without any authentication",
+                "severity": SeverityLevel.HIGH,
+                "url": target,
+                "method": "GET",
+                "owasp_category": "API2:2023-Broken Authentication",
+                "cwe_id": "CWE-306",
+                "remediation": "Implement proper authentication mechanism (OAuth2, API keys, JWT)",
+                "references": ["https://owasp.org/API-Security/editions/2023/en/0xa2-broken-authentication/"]
+            })
         
         # Test weak authentication
-        weak_tokens = ["test", "admin", "123456", "token"]
-        for token in weak_tokens:
-            try:
-                headers = {"Authorization": f"Bearer {token}"}
-                async with self.session.get(target, headers=headers) as response:
-                    if response.status == 200:
-                        self.findings.append({
-                            "title": "Weak Authentication Token Accepted",
-                            "description": f"API accepts weak/predictable authentication token: {token}",
-                            "severity": SeverityLevel.CRITICAL,
-                            "url": target,
-                            "method": "GET",
-                            "evidence": f"Token: {token}",
-                            "owasp_category": "API2:2023-Broken Authentication",
-                            "cwe_id": "CWE-521",
-                            "remediation": "Implement strong token generation and validation",
-                            "references": ["https://owasp.org/API-Security/editions/2023/en/0xa2-broken-authentication/"]
-                        })
-                        break
-            except Exception as e:
-                logger.debug(f"Error testing weak token: {str(e)}")
+        statuses = await asyncio.gather(*(
+            self._fetch_status("GET", target, headers={"Authorization": f"Bearer {token}"})
+            for token in WEAK_TOKENS
+        ))
+        
+        # Report the first accepted token in list order
+        for token, status in zip(WEAK_TOKENS, statuses):
+            if status == 200:
+                await self._report_finding({
+                    "title": "Weak Authentication Token Accepted",
+                    "description": f"API accepts weak/predictable authentication token: {token}",
+                    "severity": SeverityLevel.CRITICAL,
+                    "url": target,
+                    "method": "GET",
+                    "evidence": f"Token: {token}",
+                    "owasp_category": "API2:2023-Broken Authentication",
+                    "cwe_id": "CWE-521",
+                    "remediation": "Implement strong token generation and validation",
+                    "references": ["https://owasp.org/API-Security/editions/2023/en/0xa2-broken-authentication/"]
+                })
+                break
     
-    async def _check_authorization(self, target: str, options: Dict[str, Any]):
+    async def _check_authorization(self, target: str, options: Dict[str, Any]) -> None:
         """Check for broken object level authorization"""
         # Test IDOR (Insecure Direct Object Reference)
-        test_ids = ["1", "2", "999", "admin"]
+        test_urls = [f"{target.rstrip('/')}/{test_id}" for test_id in IDOR_TEST_IDS]
+        statuses = await asyncio.gather(*(
+            self._fetch_head_status(test_url) for test_url in test_urls
+        ))
         
-        for test_id in test_ids:
-            test_url = f"{target.rstrip('/')}/{test_id}"
-            
-            try:
-                async with self.session.get(test_url) as response:
-                    if response.status == 200:
-                        # Check if we can access other users' data
-                        self.findings.append({
-                            "title": "Potential Broken Object Level Authorization",
-                            "description": "API may allow access to unauthorized resources through direct object references",
-                            "severity": SeverityLevel.HIGH,
-                            "url": test_url,
-                            "method": "GET",
-                            "parameter": "id",
-                            "owasp_category": "API1:2023-Broken Object Level Authorization",
-                            "cwe_id": "CWE-639",
-                            "remediation": "Implement proper authorization checks for all object access",
-                            "references": ["https://owasp.org/API-Security/editions/2023/en/0xa1-broken-object-level-authorization/"]
-                        })
-                        break
-            except Exception as e:
-                logger.debug(f"Error testing IDOR: {str(e)}")
+        for test_url, status in zip(test_urls, statuses):
+            if status == 200:
+                # Check if we can access other users' data
+                await self._report_finding({
+                    "title": "Potential Broken Object Level Authorization",
+                    "description": "API may allow access to unauthorized resources through direct object references",
+                    "severity": SeverityLevel.HIGH,
+                    "url": test_url,
+                    "method": "GET",
+                    "parameter": "id",
+                    "owasp_category": "API1:2023-Broken Object Level Authorization",
+                    "cwe_id": "CWE-639",
+                    "remediation": "Implement proper authorization checks for all object access",
+                    "references": ["https://owasp.org/API-Security/editions/2023/en/0xa1-broken-object-level-authorization/"]
+                })
+                break
     
-    async def _check_rate_limiting(self, target: str):
+    async def _check_rate_limiting(self, target: str) -> None:
         """Check for rate limiting"""
-        # Make multiple rapid requests
-        requests = []
-        for _ in range(100):
-            requests.append(self.session.get(target))
+        # Probe in waves: grow concurrency additively while the target keeps
+        # answering, halve it on errors, and stop as soon as it signals a limit
+        concurrency = RATE_LIMIT_INITIAL_CONCURRENCY
+        sent = 0
+        success_count = 0
+        limited = False
         
         try:
-            responses = await asyncio.gather(*requests, return_exceptions=True)
-            
-            # Check if all requests succeeded (no rate limiting)
-            success_count = sum(1 for r in responses if not isinstance(r, Exception) and r.status == 200)
+            while sent < RATE_LIMIT_MAX_PROBES and not limited:
+                wave = min(int(concurrency), RATE_LIMIT_MAX_PROBES - sent)
+                probes = [
+                    asyncio.create_task(self._probe_rate_limit(target))
+                    for _ in range(wave)
+                ]
+                sent += wave
+                
+                try:
+                    # Consume probes as they land so a limit signal ends the
+                    # wave without waiting on the slowest responses
+                    for probe in asyncio.as_completed(probes):
+                        response = await probe
+                        if response is None or response[0] >= 500:
+                            concurrency = max(1.0, concurrency * 0.5)
+                            continue
+                        status, rate_limited = response
+                        if rate_limited:
+                            limited = True
+                            break
+                        if status == 200:
+                            success_count += 1
+                            concurrency = min(RATE_LIMIT_MAX_CONCURRENCY, concurrency + 0.5)
+                finally:
+                    for probe in probes:
+                        probe.cancel()
             
-            if success_count >= 95:  # If 95%+ requests succeeded
-                self.findings.append({
+            # Check if nearly all requests succeeded (no rate limiting)
+            if not limited and success_count >= sent * 0.95:
+                await self._report_finding({
                     "title": "No Rate Limiting Detected",
                     "description": "API does not implement rate limiting, allowing potential abuse",
                     "severity": SeverityLevel.MEDIUM,
                     "url": target,
-                    "evidence": f"{success_count}/100 requests succeeded",
+                    "evidence": f"{success_count}/{sent} requests succeeded",
                     "owasp_category": "API4:2023-Unrestricted Resource Consumption",
                     "cwe_id": "CWE-770",
                     "remediation": "Implement rate limiting to prevent abuse",
@@ -187,57 +401,49 @@ class APIScanner(BaseScannerPlugin):
         except Exception as e:
             logger.debug(f"Error checking rate limiting: {str(e)}")
     
-    async def _check_input_validation(self, target: str):
+    async def _check_input_validation(self, target: str) -> None:
         """Check input validation"""
-        # Test with malicious payloads
-        payloads = {
-            "xss": "<script>alert('XSS')</script>",
-            "sqli": "' OR '1'='1",
-            "xxe": "<?xml version='1.0'?><!DOCTYPE foo [<!ENTITY xxe SYSTEM 'file:///etc/passwd'>]><foo>&xxe;</foo>",
-            "overflow": "A" * 10000,
-        }
         
-        for payload_type, payload in payloads.items():
-            try:
-                # Test as query parameter
-                test_url = f"{target}?input={payload}"
-                async with self.session.get(test_url) as response:
-                    text = await response.text()
-                    
-                    # Check if payload is reflected
-                    if payload in text:
-                        self.findings.append({
-                            "title": f"Insufficient Input Validation ({payload_type.upper()})",
-                            "description": "API does not properly validate/sanitize input",
-                            "severity": SeverityLevel.HIGH,
-                            "url": test_url,
-                            "parameter": "input",
-                            "evidence": f"Payload type: {payload_type}",
-                            "owasp_category": "API8:2023-Security Misconfiguration",
-                            "cwe_id": "CWE-20",
-                            "remediation": "Implement strict input validation and sanitization",
-                            "references": ["https://owasp.org/API-Security/editions/2023/en/0xa8-security-misconfiguration/"]
-                        })
-            except Exception as e:
-                logger.debug(f"Error testing input validation: {str(e)}")
-    
-    async def _check_http_methods(self, target: str):
-        """Check for unrestricted HTTP methods"""
-        methods = ["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS", "HEAD", "TRACE"]
-        allowed_methods = []
+        # Test malicious payloads as query parameter
+        probes = [
+            (payload_type, f"{target}?input={payload}")
+            for payload_type, payload in INPUT_VALIDATION_PAYLOADS.items()
+        ]
+        reflected = await asyncio.gather(*(
+            self._is_reflected(test_url, INPUT_VALIDATION_PAYLOAD_BYTES[payload_type])
+            for payload_type, test_url in probes
+        ))
         
-        for method in methods:
-            try:
-                async with self.session.request(method, target) as response:
-                    if response.status not in [405, 501]:  # Not Method Not Allowed
-                        allowed_methods.append(method)
-            except Exception as e:
-                logger.debug(f"Error testing HTTP method {method}: {str(e)}")
+        for (payload_type, test_url), is_reflected in zip(probes, reflected):
+            # Check if payload is reflected
+            if is_reflected:
+                await self._report_finding({
+                    "title": f"Insufficient Input Validation ({payload_type.upper()})",
+                    "description": "API does not properly validate/sanitize input",
+                    "severity": SeverityLevel.HIGH,
+                    "url": test_url,
+                    "parameter": "input",
+                    "evidence": f"Payload type: {payload_type}",
+                    "owasp_category": "API8:2023-Security Misconfiguration",
+                    "cwe_id": "CWE-20",
+                    "remediation": "Implement strict input validation and sanitization",
+                    "references": ["https://owasp.org/API-Security/editions/2023/en/0xa8-security-misconfiguration/"]
+                })
+    
+    async def _check_http_methods(self, target: str) -> None:
+        """Check for unrestricted HTTP methods"""
+        statuses = await asyncio.gather(*(
+            self._fetch_status(method, target) for method in HTTP_METHODS
+        ))
+        allowed_methods = [
+            method for method, status in zip(HTTP_METHODS, statuses)
+            if status is not None and status not in [405, 501]  # Not Method Not Allowed
+        ]
         
         # Check for potentially dangerous methods
         dangerous_methods = set(allowed_methods) & {"TRACE", "TRACK"}
         if dangerous_methods:
-            self.findings.append({
+            await self._report_finding({
                 "title": "Dangerous HTTP Methods Enabled",
                 "description": f"API allows potentially dangerous HTTP methods: {', '.join(dangerous_methods)}",
                 "severity": SeverityLevel.MEDIUM,
@@ -249,100 +455,76 @@ class APIScanner(BaseScannerPlugin):
                 "references": ["https://owasp.org/www-community/vulnerabilities/Unsafe_HTTP_Methods"]
             })
     
-    async def _check_api_versioning(self, target: str):
+    async def _check_api_versioning(self, target: str) -> None:
         """Check API versioning"""
         # Check if old API versions are accessible
-        version_patterns = ["/v1/", "/v2/", "/api/v1/", "/api/v2/"]
+        test_urls = [
+            target.replace("/api/", pattern)
+            for pattern in VERSION_PATTERNS
+            if pattern not in target
+        ]
+        statuses = await asyncio.gather(*(
+            self._fetch_head_status(test_url) for test_url in test_urls
+        ))
         
-        for pattern in version_patterns:
-            if pattern not in target:
-                test_url = target.replace("/api/", pattern)
-                
-                try:
-                    async with self.session.get(test_url) as response:
-                        if response.status == 200:
-                            self.findings.append({
-                                "title": "Multiple API Versions Accessible",
-                                "description": "Old API versions remain accessible, potentially containing unfixed vulnerabilities",
-                                "severity": SeverityLevel.MEDIUM,
-                                "url": test_url,
-                                "owasp_category": "API9:2023-Improper Inventory Management",
-                                "cwe_id": "CWE-1059",
-                                "remediation": "Deprecate and remove old API versions",
-                                "references": ["https://owasp.org/API-Security/editions/2023/en/0xa9-improper-inventory-management/"]
-                            })
-                except Exception as e:
-                    logger.debug(f"Error checking API version: {str(e)}")
+        for test_url, status in zip(test_urls, statuses):
+            if status == 200:
+                await self._report_finding({
+                    "title": "Multiple API Versions Accessible",
+                    "description": "Old API versions remain accessible, potentially containing unfixed vulnerabilities",
+                    "severity": SeverityLevel.MEDIUM,
+                    "url": test_url,
+                    "owasp_category": "API9:2023-Improper Inventory Management",
+                    "cwe_id": "CWE-1059",
+                    "remediation": "Deprecate and remove old API versions",
+                    "references": ["https://owasp.org/API-Security/editions/2023/en/0xa9-improper-inventory-management/"]
+                })
     
-    async def _check_error_handling(self, target: str):
+    async def _check_error_handling(self, target: str) -> None:
         """Check error handling"""
         # Trigger errors and check responses
-        error_triggers = [
-            ("invalid_json", '{"invalid": json}', "application/json"),
-            ("malformed_request", "not a valid request", "text/plain"),
-        ]
+        texts = await asyncio.gather(*(
+            self._fetch_text(
+                "POST", target,
+                max_bytes=ERROR_BODY_SCAN_BYTES,
+                content=payload,
+                headers={"Content-Type": content_type},
+            )
+            for _, payload, content_type in ERROR_TRIGGERS
+        ))
         
-        for trigger_name, payload, content_type in error_triggers:
-            try:
-                headers = {"Content-Type": content_type}
-                async with self.session.post(target, data=payload, headers=headers) as response:
-                    text = await response.text()
-                    
-                    # Check for information disclosure in error messages
-                    disclosure_patterns = [
-                        "stacktrace", "traceback", "exception", "file path",
-                        "database", "sql", "connection string"
-                    ]
-                    
-                    if any(pattern in text.lower() for pattern in disclosure_patterns):
-                        self.findings.append({
-                            "title": "Verbose Error Messages",
-                            "description": "API returns detailed error messages that may leak sensitive information",
-                            "severity": SeverityLevel.MEDIUM,
-                            "url": target,
-                            "method": "POST",
-                            "evidence": f"Trigger: {trigger_name}",
-                            "owasp_category": "API8:2023-Security Misconfiguration",
-                            "cwe_id": "CWE-209",
-                            "remediation": "Implement generic error messages and log detailed errors server-side",
-                            "references": ["https://owasp.org/www-community/Improper_Error_Handling"]
-                        })
-                        break
-            except Exception as e:
-                logger.debug(f"Error checking error handling: {str(e)}")
+        for (trigger_name, _, _), text in zip(ERROR_TRIGGERS, texts):
+            # Check for information disclosure in error messages
+            if text is not None and DISCLOSURE_RE.search(text):
+                await self._report_finding({
+                    "title": "Verbose Error Messages",
+                    "description": "API returns detailed error messages that may leak sensitive information",
+                    "severity": SeverityLevel.MEDIUM,
+                    "url": target,
+                    "method": "POST",
+                    "evidence": f"Trigger: {trigger_name}",
+                    "owasp_category": "API8:2023-Security Misconfiguration",
+                    "cwe_id": "CWE-209",
+                    "remediation": "Implement generic error messages and log detailed errors server-side",
+                    "references": ["https://owasp.org/www-community/Improper_Error_Handling"]
+                })
+                break
     
-    async def _check_data_exposure(self, target: str):
+    async def _check_data_exposure(self, target: str) -> None:
         """Check for excessive data exposure"""
         try:
-            async with self.session.get(target) as response:
-                if response.status == 200:
+            async with self._request("GET", target) as response:
+                if response.status_code == 200:
                     try:
-                        data = await response.json()
-                        
                         # Check for sensitive fields
-                        sensitive_fields = [
-                            "password", "secret", "token", "api_key",
-                            "ssn", "credit_card", "private_key"
-                        ]
-                        
-                        def check_dict(d, path=""):
-                            found = []
-                            if isinstance(d, dict):
-                                for key, value in d.items():
-                                    current_path = f"{path}.{key}" if path else key
-                                    if any(field in key.lower() for field in sensitive_fields):
-                                        found.append(current_path)
-                                    if isinstance(value, (dict, list)):
-                                        found.extend(check_dict(value, current_path))
-                            elif isinstance(d, list):
-                                for i, item in enumerate(d):
-                                    found.extend(check_dict(item, f"{path}[{i}]"))
-                            return found
-                        
-                        exposed_fields = check_dict(data)
+                        if HAVE_IJSON:
+                            exposed_fields = await self._stream_sensitive_fields(response)
+                        else:
+                            data = orjson.loads(await response.aread())
+                            exposed_fields = self._find_sensitive_fields(data)
                         
                         if exposed_fields:
-                            self.findings.append({
+                            await self._report_finding({
                                 "title": "Excessive Data Exposure",
                                 "description": "API response contains potentially sensitive fields",
                                 "severity": SeverityLevel.HIGH,
@@ -354,25 +536,227 @@ class APIScanner(BaseScannerPlugin):
                                 "remediation": "Implement response filtering to return only necessary data",
                                 "references": ["https://owasp.org/API-Security/editions/2023/en/0xa3-broken-object-property-level-authorization/"]
                             })
-                    except json.JSONDecodeError:
+                    except JSON_DECODE_ERRORS:
                         pass
         except Exception as e:
             logger.debug(f"Error checking data exposure: {str(e)}")
     
-    def _calculate_summary(self) -> Dict[str, Any]:
-        """Calculate summary statistics"""
-        severity_counts = {
-            SeverityLevel.CRITICAL: 0,
-            SeverityLevel.HIGH: 0,
-            SeverityLevel.MEDIUM: 0,
-            SeverityLevel.LOW: 0,
-            SeverityLevel.INFO: 0,
-        }
+    @staticmethod
+    def _find_sensitive_fields(data: Any) -> List[str]:
+        """
+        Walk a decoded JSON document and return paths of sensitive keys.
+        
+        Iterative pre-order walk (same order as a recursive one), stopping
+        once MAX_EXPOSED_FIELDS paths have been collected.
+        """
+        found: List[str] = []
+        # (path, key, value); key is None for the root and list items
+        stack = [("", None, data)]
+        
+        while stack and len(found) < MAX_EXPOSED_FIELDS:
+            path, key, value = stack.pop()
+            
+            if key is not None:
+                key_lower = key.lower()
+                if any(field in key_lower for field in SENSITIVE_FIELDS):
+                    found.append(path)
+            
+            if isinstance(value, dict):
+                children = [
+                    (f"{path}.{child_key}" if path else child_key, child_key, child)
+                    for child_key, child in value.items()
+                ]
+            elif isinstance(value, list):
+                children = [
+                    (f"{path}[{i}]", None, item) for i, item in enumerate(value)
+                ]
+            else:
+                continue
+            
+            stack.extend(reversed(children))
+        
+        return found
+    
+    @staticmethod
+    async def _stream_sensitive_fields(response: httpx.Response) -> List[str]:
+        """
+        Stream-parse a JSON body and return paths of sensitive keys.
+        
+        Yields the same paths, in the same order, as _find_sensitive_fields
+        without materializing the document, and stops reading the body once
+        MAX_EXPOSED_FIELDS paths have been collected.
+        """
+        found: List[str] = []
+        # One [is_array, path, next index or current key path] per open container
+        containers: List[list] = []
+        
+        events = ijson.parse_async(AsyncByteReader(response.aiter_bytes()))
+        async for _, event, value in events:
+            if event == "map_key":
+                frame = containers[-1]
+                frame[2] = f"{frame[1]}.{value}" if frame[1] else value
+                if any(field in value.lower() for field in SENSITIVE_FIELDS):
+                    found.append(frame[2])
+                    if len(found) >= MAX_EXPOSED_FIELDS:
+                        break
+                continue
+            
+            if event in ("end_map", "end_array"):
+                containers.pop()
+                continue
+            
+            # A value starts: work out its path from the enclosing container
+            if not containers:
+                path = ""
+            elif containers[-1][0]:
+                frame = containers[-1]
+                path = f"{frame[1]}[{frame[2]}]"
+                frame[2] += 1
+            else:
+                path = containers[-1][2]
+            
+            if event == "start_map":
+                containers.append([False, path, None])
+            elif event == "start_array":
+                containers.append([True, path, 0])
+        
+        return found
+    
+    @asynccontextmanager
+    async def _request(self, method: str, url: str, **kwargs) -> AsyncIterator[httpx.Response]:
+        """
+        Issue a streamed request through the per-host AIMD limiter.
+        
+        The body is not read unless the caller reads it.
+        """
+        limiter = get_host_limiter(url)
+        await limiter.acquire()
+        status = None
+        retry_after = None
+        cancelled = False
+        try:
+            async with self.session.stream(method, url, **kwargs) as response:
+                status = response.status_code
+                retry_after = response.headers.get("Retry-After")
+                yield response
+        except asyncio.CancelledError:
+            # Abandoned probes say nothing about the host's capacity
+            cancelled = True
+            raise
+        finally:
+            await limiter.release(status, retry_after, cancelled=cancelled)
+    
+    async def _probe_rate_limit(self, target: str) -> Optional[Tuple[int, bool]]:
+        """GET the target; return (status, rate_limited) or None on error"""
+        try:
+            async with self._request("GET", target) as response:
+                rate_limited = response.status_code == 429 or any(
+                    header in response.headers for header in RATE_LIMIT_HEADERS
+                )
+                return response.status_code, rate_limited
+        except Exception as e:
+            logger.debug(f"Error probing rate limit: {str(e)}")
+            return None
+    
+    async def _is_reflected(self, url: str, needle: bytes) -> bool:
+        """
+        GET url and report whether needle appears in the raw response body.
+        
+        The body is streamed in chunks and never decoded; the last
+        len(needle) - 1 bytes of each chunk are carried over so matches that
+        straddle a chunk boundary are still found. Stops at the first hit.
+        """
+        overlap = len(needle) - 1
+        tail = b""
+        try:
+            async with self._request("GET", url) as response:
+                async for chunk in response.aiter_bytes(REFLECTION_CHUNK_BYTES):
+                    if needle in chunk or (tail and needle in tail + chunk[:overlap]):
+                        return True
+                    if overlap:
+                        tail = (tail + chunk)[-overlap:] if len(chunk) < overlap else chunk[-overlap:]
+        except Exception as e:
+            logger.debug(f"Error testing input validation: {str(e)}")
+        return False
+    
+    async def _fetch_status(self, method: str, url: str, **kwargs) -> Optional[int]:
+        """Send a probe request and return its status code, or None on error"""
+        try:
+            async with self._request(method, url, **kwargs) as response:
+                return response.status_code
+        except Exception as e:
+            logger.debug(f"Error probing {method} {url}: {str(e)}")
+            return None
+    
+    async def _fetch_head_status(self, url: str, **kwargs) -> Optional[int]:
+        """
+        Get a URL's status without downloading its body.
+        
+        Uses HEAD, falling back to GET when the server does not allow HEAD.
+        """
+        status = await self._fetch_status("HEAD", url, **kwargs)
+        if status in (405, 501):
+            status = await self._fetch_status("GET", url, **kwargs)
+        return status
+    
+    async def _fetch_text(
+        self,
+        method: str,
+        url: str,
+        max_bytes: Optional[int] = None,
+        **kwargs
+    ) -> Optional[str]:
+        """
+        Send a probe request and return its decoded body, or None on error.
         
-        for finding in self.findings:
-            severity = finding.get("severity")
-            if severity in severity_counts:
-                severity_counts[severity] += 1
+        With max_bytes set, only that many leading bytes are read.
+        """
+        try:
+            async with self._request(method, url, **kwargs) as response:
+                if max_bytes is None:
+                    await response.aread()
+                    return response.text
+                
+                body = bytearray()
+                async for chunk in response.aiter_bytes():
+                    body += chunk
+                    if len(body) >= max_bytes:
+                        break
+                return bytes(body[:max_bytes]).decode(response.encoding or "utf-8", errors="ignore")
+        except Exception as e:
+            logger.debug(f"Error probing {method} {url}: {str(e)}")
+            return None
+    
+    async def _report_finding(self, finding: Dict[str, Any]) -> None:
+        """Hand a finding from a check to the collector"""
+        await self._finding_queue.put(finding)
+    
+    async def _collect_findings(self) -> None:
+        """Single writer: drain the findings queue until the None sentinel"""
+        while True:
+            finding = await self._finding_queue.get()
+            if finding is None:
+                break
+            self._add_finding(finding)
+    
+    @staticmethod
+    def _finding_key(finding: Dict[str, Any]) -> bytes:
+        """Stable identity hash used to drop duplicate findings"""
+        identity = "|".join(str(finding.get(field) or "") for field in FINDING_KEY_FIELDS)
+        return blake2b(identity.encode(), digest_size=16).digest()
+    
+    def _add_finding(self, finding: Dict[str, Any]) -> None:
+        """Record a new finding and update the running severity counts"""
+        key = self._finding_key(finding)
+        if key in self._finding_hashes:
+            return
+        self._finding_hashes.add(key)
+        self.findings.append(finding)
+        self._severity_counts[finding.get("severity")] += 1
+    
+    def _calculate_summary(self) -> Dict[str, Any]:
+        """Calculate summary statistics from the running severity counts"""
+        severity_counts = self._severity_counts
         
         # Calculate risk score
         risk_score = (
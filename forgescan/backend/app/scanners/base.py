@@ -5,6 +5,8 @@ from dataclasses import dataclass
 from enum import Enum
 import asyncio
 
+import aiohttp
+
 
 class ScanStatus(str, Enum):
     PENDING = "pending"
@@ -22,6 +24,17 @@ class ScanResult:
     error: Optional[str] = None
 
 
+def create_http_connector() -> aiohttp.TCPConnector:
+    """Create the keep-alive connection pool used by the aiohttp-based scanners"""
+    return aiohttp.TCPConnector(
+        limit=200,
+        limit_per_host=64,
+        ttl_dns_cache=300,
+        keepalive_timeout=30,
+        enable_cleanup_closed=True,
+    )
+
+
 class BaseScannerPlugin(ABC):
     """Abstract base class for all scanner plugins"""
     
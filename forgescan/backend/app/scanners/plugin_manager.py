@@ -1,39 +1,66 @@
 # backend/app/scanners/plugin_manager.py
 import importlib
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional, Tuple
 from pathlib import Path
 
-from app.scanners.base import BaseScannerPlugin
-from app.scanners.web_scanner import WebScanner
-from app.scanners.api_scanner import APIScanner
-from app.scanners.sca_scanner import SCAScanner
+import aiohttp
+
+from app.scanners.base import BaseScannerPlugin, create_http_connector
 from app.core.logging import logger
 
 
+# scanner_type -> (module, class, uses the shared aiohttp connector).
+# Modules are imported on first use so only requested scanners are loaded.
+SCANNER_REGISTRY: Dict[str, Tuple[str, str, bool]] = {
+    "web": ("app.scanners.web_scanner", "WebScanner", True),
+    "api": ("app.scanners.api_scanner", "APIScanner", False),
+}
+
+
 class PluginManager:
     """Manager for scanner plugins"""
     
     def __init__(self):
         self._plugins: Dict[str, BaseScannerPlugin] = {}
+        # "web" -> WebScanner instance, built once in initialize()
+        self._plugin_by_type: Dict[str, BaseScannerPlugin] = {}
+        # (scanner_type, target) -> validate_target() result
+        self._validate_cache: Dict[Tuple[str, str], bool] = {}
+        self._connector: Optional[aiohttp.TCPConnector] = None
         self._initialized = False
     
-    async def initialize(self) -> None:
-        """Discover and initialize all plugins"""
+    async def initialize(self, scanner_types: Optional[Iterable[str]] = None) -> None:
+        """
+        Import and initialize plugins.
+        
+        Only the registered types in scanner_types are loaded; all
+        registered scanners are loaded when it is None.
+        """
         if self._initialized:
             return
         
         logger.info("Initializing scanner plugins")
         
-        # Register built-in scanners
-        scanners = [
-            WebScanner(),
-            APIScanner(),
-        ]
+        requested = SCANNER_REGISTRY.keys() if scanner_types is None else set(scanner_types)
+        scanners = []
+        for scanner_type, (module_name, class_name, shares_connector) in SCANNER_REGISTRY.items():
+            if scanner_type not in requested:
+                continue
+            
+            scanner_cls = getattr(importlib.import_module(module_name), class_name)
+            if shares_connector:
+                # One keep-alive pool for all aiohttp scanners
+                if self._connector is None:
+                    self._connector = create_http_connector()
+                scanners.append(scanner_cls(connector=self._connector))
+            else:
+                scanners.append(scanner_cls())
         
         # Initialize each scanner
         for scanner in scanners:
             await scanner.initialize()
             self._plugins[scanner.name] = scanner
+            self._plugin_by_type[scanner.name.removesuffix("_scanner")] = scanner
             logger.info(f"Registered scanner: {scanner.name} v{scanner.version}")
         
         self._initialized = True
@@ -44,18 +71,29 @@ class PluginManager:
         target: Optional[str] = None
     ) -> Optional[BaseScannerPlugin]:
         """Get appropriate scanner for target"""
-        scanner_name = f"{scanner_type}_scanner"
+        plugin = self._plugin_by_type.get(scanner_type)
+        if plugin is None:
+            return None
         
-        if scanner_name in self._plugins:
-            plugin = self._plugins[scanner_name]
-            if target and not await plugin.validate_target(target):
+        if target:
+            key = (scanner_type, target)
+            is_valid = self._validate_cache.get(key)
+            if is_valid is None:
+                is_valid = await plugin.validate_target(target)
+                self._validate_cache[key] = is_valid
+            if not is_valid:
                 return None
-            return plugin
         
-        return None
+        return plugin
     
     async def cleanup_all(self) -> None:
         """Cleanup all plugins"""
         for plugin in self._plugins.values():
             await plugin.cleanup()
+        
+        self._validate_cache.clear()
+        
+        if self._connector is not None:
+            await self._connector.close()
+            self._connector = None
 
@@ -5,17 +5,245 @@ Detects vulnerabilities in dependencies (npm, pip, maven, composer, etc.)
 """
 
 import asyncio
-import json
+import bisect
+import concurrent.futures
+import contextlib
+import io
+import mmap
+import os
+import random
 import re
-from typing import Dict, Any, List, Optional, Set
+import time
+from collections import Counter, defaultdict, deque
+from pathlib import Path
+from typing import Deque, Dict, Any, Iterator, List, Optional, Set, Tuple, Union
 from datetime import datetime
+from xml.etree.ElementTree import ParseError, iterparse
 import httpx
-import hashlib
+import orjson
 
 from app.scanners.base import BaseScannerPlugin, ScanResult, ScanStatus
+from app.core.config import settings
 from app.core.constants import SeverityLevel
 from app.core.logging import logger
 
+try:
+    import ijson
+    HAVE_IJSON = True
+except ImportError:
+    HAVE_IJSON = False
+
+
+# Positive OSS Index hits: purl -> (fetched at, vulnerabilities). Shared by
+# every scanner in the process; purls without vulnerabilities, failed
+# lookups and error responses are never cached
+_VULN_CACHE: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+DEFAULT_VULN_CACHE_TTL = 12 * 60 * 60
+
+# Purls that came back clean today (UTC); the set is dropped when the day
+# changes so newly published advisories are picked up within 24h. Kept
+# exact rather than probabilistic: a false positive would hide a real
+# vulnerability
+_CLEAN_PURLS: Set[str] = set()
+_clean_purls_day: Optional[str] = None
+
+
+def _clean_purls() -> Set[str]:
+    """Return today's clean-purl set, rotating it at UTC midnight"""
+    global _clean_purls_day
+    today = datetime.utcnow().strftime("%Y%m%d")
+    if today != _clean_purls_day:
+        _CLEAN_PURLS.clear()
+        _clean_purls_day = today
+    return _CLEAN_PURLS
+
+# Version/requirement patterns, compiled once
+VERSION_CLEAN_RE = re.compile(r'[^\d.]')
+# One requirement per line: package==version, package>=version, ...; comment
+# lines never match since '#' cannot start a package name
+PIP_REQUIREMENT_RE = re.compile(
+    r'^[ \t]*([a-zA-Z0-9\-_]+)[ \t]*(==|>=|<=|>|<)[ \t]*([0-9.]+)',
+    re.MULTILINE,
+)
+PIP_REQUIREMENT_BYTES_RE = re.compile(PIP_REQUIREMENT_RE.pattern.encode(), re.MULTILINE)
+# "Fixed in version X.Y.Z", "Upgrade to X.Y.Z" or "Patched in X.Y.Z"
+FIXED_VERSION_RE = re.compile(r'(?:[Ff]ixed in (?:version )?|[Uu]pgrade to |[Pp]atched in )([0-9.]+)')
+
+# Manifests at least this large are stream-parsed when ijson is available;
+# below it a plain orjson.loads is cheaper
+STREAM_PARSE_MIN_BYTES = 64 * 1024
+
+if HAVE_IJSON:
+    JSON_DECODE_ERRORS = (orjson.JSONDecodeError, ijson.JSONError)
+else:
+    JSON_DECODE_ERRORS = (orjson.JSONDecodeError,)
+
+# Package managers whose files add up to this much are parsed in worker
+# processes, one file per task; smaller inputs are parsed inline
+PROCESS_PARSE_MIN_BYTES = 1024 * 1024
+
+# Findings kept per scan (oldest dropped first); the summary still counts all
+DEFAULT_MAX_FINDINGS = 100_000
+
+# OSS Index batches in flight at once (replaces a fixed sleep between batches)
+DEFAULT_OSS_CONCURRENCY = 4
+
+# Transient vulnerability database failures are retried with jittered
+# exponential backoff
+VULN_DB_MAX_ATTEMPTS = 4
+VULN_DB_BACKOFF_INITIAL = 1.0
+VULN_DB_BACKOFF_MAX = 10.0
+VULN_DB_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Ecosystems looked up in OSV (querybatch + per-id hydration); the rest
+# (packagist, nuget, ...) stay on OSS Index
+OSV_ECOSYSTEMS = frozenset({"npm", "pypi", "maven"})
+OSV_BATCH_SIZE = 1000
+OSV_HYDRATE_CONCURRENCY = 16
+
+# CVSS lower bounds (inclusive) for MEDIUM, HIGH and CRITICAL; any positive
+# score below the first is LOW, zero is INFO
+CVSS_SEVERITY_THRESHOLDS = (4.0, 7.0, 9.0)
+CVSS_SEVERITY_LEVELS = (
+    SeverityLevel.LOW,
+    SeverityLevel.MEDIUM,
+    SeverityLevel.HIGH,
+    SeverityLevel.CRITICAL,
+)
+
+# OSV advisories carry a CVSS vector rather than a score; the v3 base
+# score is computed from the vector's metric weights (CVSS v3.1 spec, 7.4)
+CVSS3_WEIGHTS = {
+    "AV": {"N": 0.85, "A": 0.62, "L": 0.55, "P": 0.2},
+    "AC": {"L": 0.77, "H": 0.44},
+    "UI": {"N": 0.85, "R": 0.62},
+    "C": {"H": 0.56, "L": 0.22, "N": 0.0},
+    "I": {"H": 0.56, "L": 0.22, "N": 0.0},
+    "A": {"H": 0.56, "L": 0.22, "N": 0.0},
+}
+# Privileges Required weighs more when the scope changes
+CVSS3_PRIVILEGE_WEIGHTS = {
+    "U": {"N": 0.85, "L": 0.62, "H": 0.27},
+    "C": {"N": 0.85, "L": 0.68, "H": 0.5},
+}
+
+# Advisories without a v3 vector fall back to the database's qualitative
+# severity; no CVSS number is made up for them
+OSV_SEVERITY_LEVELS = {
+    "CRITICAL": SeverityLevel.CRITICAL,
+    "HIGH": SeverityLevel.HIGH,
+    "MODERATE": SeverityLevel.MEDIUM,
+    "MEDIUM": SeverityLevel.MEDIUM,
+    "LOW": SeverityLevel.LOW,
+}
+
+
+def _cvss_round_up(value: float) -> float:
+    """CVSS v3.1 Roundup: smallest one-decimal number >= value"""
+    scaled = round(value * 100000)
+    if scaled % 10000 == 0:
+        return scaled / 100000.0
+    return (scaled // 10000 + 1) / 10.0
+
+
+def cvss3_base_score(vector: str) -> Optional[float]:
+    """Base score of a CVSS:3.x vector string, or None if it doesn't parse"""
+    prefix, _, body = vector.partition("/")
+    if not prefix.startswith("CVSS:3"):
+        return None
+    
+    metrics = dict(part.split(":", 1) for part in body.split("/") if ":" in part)
+    try:
+        scope = metrics["S"]
+        weights = {name: CVSS3_WEIGHTS[name][metrics[name]] for name in CVSS3_WEIGHTS}
+        privileges = CVSS3_PRIVILEGE_WEIGHTS[scope][metrics["PR"]]
+    except KeyError:
+        return None
+    
+    iss = 1 - (1 - weights["C"]) * (1 - weights["I"]) * (1 - weights["A"])
+    if scope == "U":
+        impact = 6.42 * iss
+    else:
+        impact = 7.52 * (iss - 0.029) - 3.25 * (iss - 0.02) ** 15
+    if impact <= 0:
+        return 0.0
+    
+    exploitability = 8.22 * weights["AV"] * weights["AC"] * privileges * weights["UI"]
+    if scope == "U":
+        return _cvss_round_up(min(impact + exploitability, 10))
+    return _cvss_round_up(min(1.08 * (impact + exploitability), 10))
+
+
+# Manifest content is either the text itself or a path to the file on disk
+ManifestSource = Union[str, Path]
+
+
+def manifest_size(source: ManifestSource) -> int:
+    """Size of a manifest in characters (text) or bytes (file)"""
+    return len(source) if isinstance(source, str) else source.stat().st_size
+
+
+@contextlib.contextmanager
+def open_manifest(source: ManifestSource) -> Iterator[Union[str, mmap.mmap, bytes]]:
+    """
+    Yield manifest content: text as-is, files as a read-only mmap.
+    
+    Mapped files are paged in by the OS on demand instead of being copied
+    into a Python string.
+    """
+    if isinstance(source, str):
+        yield source
+        return
+    
+    with open(source, "rb") as f:
+        # Empty files cannot be mapped
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def manifest_stream(content: Union[str, mmap.mmap, bytes]):
+    """Binary file-like view of manifest content; mapped files are read in place"""
+    if isinstance(content, mmap.mmap):
+        content.seek(0)
+        return content
+    return io.BytesIO(content.encode() if isinstance(content, str) else content)
+
+
+def iter_manifest_requirements(content: Union[str, mmap.mmap, bytes], sections: Tuple[str, ...]):
+    """
+    Yield (section, name, version) from top-level name -> version maps of a
+    JSON manifest, section by section.
+    
+    Large manifests are streamed through ijson so only the requested
+    sections are kept, never the whole document.
+    """
+    if not HAVE_IJSON or len(content) < STREAM_PARSE_MIN_BYTES:
+        if isinstance(content, str):
+            data = orjson.loads(content)
+        else:
+            with memoryview(content) as view:
+                data = orjson.loads(view)
+        for section in sections:
+            for name, version in data.get(section, {}).items():
+                yield section, name, version
+        return
+    
+    found: Dict[str, List[Tuple[str, str]]] = {section: [] for section in sections}
+    current = None
+    
+    for prefix, event, value in ijson.parse(manifest_stream(content)):
+        if event == "map_key" and prefix in found:
+            current = (prefix, value)
+        elif event == "string" and current and prefix == f"{current[0]}.{current[1]}":
+            found[current[0]].append((current[1], value))
+    
+    for section in sections:
+        for name, version in found[section]:
+            yield section, name, version
+
 
 class SCAScanner(BaseScannerPlugin):
     """Software Composition Analysis Scanner"""
@@ -53,14 +281,39 @@ class SCAScanner(BaseScannerPlugin):
         },
     }
     
-    def __init__(self):
-        self.timeout = httpx.AsyncClient(timeout=30.0)
-        self.findings: List[Dict[str, Any]] = []
+    # Package manager -> parser classmethod name
+    MANIFEST_PARSERS = {
+        "npm": "_parse_npm",
+        "pip": "_parse_pip",
+        "maven": "_parse_maven",
+        "composer": "_parse_composer",
+    }
+    
+    def __init__(self, workspace_root: Optional[str] = None):
+        # Only checkouts under this directory are read from disk
+        self.workspace_root = workspace_root or settings.SCA_WORKSPACE_ROOT
+        self.timeout = httpx.Timeout(30.0, connect=5.0)
+        self.limits = httpx.Limits(
+            max_keepalive_connections=20,
+            max_connections=50,
+            keepalive_expiry=30.0,
+        )
+        self.client: Optional[httpx.AsyncClient] = None
+        self._parse_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self.findings: Deque[Dict[str, Any]] = deque(maxlen=DEFAULT_MAX_FINDINGS)
+        self._severity_counts: Counter = Counter()
+        self._vulnerable_deps: Set[str] = set()
+        self._dropped_findings = 0
         self.dependencies: Dict[str, List[Dict]] = {}
+        self._dependency_count = 0
         
         # OSS Index API (Sonatype)
         self.oss_index_url = "https://ossindex.sonatype.org/api/v3/component-report"
         
+        # OSV API (bulk lookup, then per-vulnerability details)
+        self.osv_batch_url = "https://api.osv.dev/v1/querybatch"
+        self.osv_vuln_url = "https://api.osv.dev/v1/vulns/{}"
+        
         # NVD API
         self.nvd_api_url = "https://services.nvd.nist.gov/rest/json/cves/2.0"
         
@@ -69,12 +322,27 @@ class SCAScanner(BaseScannerPlugin):
     
     async def initialize(self) -> None:
         """Initialize scanner"""
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # One pooled client per scanner; HTTP/2 multiplexes concurrent batches
+        self.client = httpx.AsyncClient(
+            http2=True,
+            timeout=self.timeout,
+            limits=self.limits,
+            headers={
+                "Content-Type": "application/json",
+                "User-Agent": f"forgescan-sca/{self.version}",
+            },
+        )
+        # Workers are only spawned on first use (large manifests)
+        self._parse_pool = concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count())
     
     async def cleanup(self) -> None:
         """Cleanup resources"""
         if self.client:
-            await self.client.close()
+            await self.client.aclose()
+            self.client = None
+        if self._parse_pool:
+            self._parse_pool.shutdown(wait=False, cancel_futures=True)
+            self._parse_pool = None
     
     async def validate_target(self, target: str) -> bool:
         """Validate if target can be scanned"""
@@ -89,9 +357,13 @@ class SCAScanner(BaseScannerPlugin):
         options: Optional[Dict[str, Any]] = None
     ) -> ScanResult:
         """Execute SCA scan"""
-        self.findings = []
-        self.dependencies = {}
         options = options or {}
+        self.findings = deque(maxlen=options.get("max_findings", DEFAULT_MAX_FINDINGS))
+        self._severity_counts = Counter()
+        self._vulnerable_deps = set()
+        self._dropped_findings = 0
+        self.dependencies = {}
+        self._dependency_count = 0
         
         try:
             logger.info(f"Starting SCA scan for {target}", extra={"scan_id": scan_id})
@@ -110,9 +382,13 @@ class SCAScanner(BaseScannerPlugin):
             logger.info(f"Detected package managers: {list(detected_managers.keys())}")
             
             # Step 2: Parse dependencies for each package manager
-            for pm_name, pm_data in detected_managers.items():
-                deps = await self._parse_dependencies(pm_name, pm_data, target)
+            parsed = await asyncio.gather(*(
+                self._parse_dependencies(pm_name, pm_data, target)
+                for pm_name, pm_data in detected_managers.items()
+            ))
+            for pm_name, deps in zip(detected_managers, parsed):
                 self.dependencies[pm_name] = deps
+                self._dependency_count += len(deps)
             
             # Step 3: Check vulnerabilities for all dependencies
             all_deps = []
@@ -122,20 +398,24 @@ class SCAScanner(BaseScannerPlugin):
             logger.info(f"Found {len(all_deps)} dependencies to check")
             
             # Step 4: Query vulnerability databases
-            vulnerabilities = await self._check_vulnerabilities(all_deps)
+            vulnerabilities = await self._check_vulnerabilities(
+                all_deps,
+                cache_ttl=options.get("vuln_cache_ttl", DEFAULT_VULN_CACHE_TTL),
+                concurrency=options.get("oss_concurrency", DEFAULT_OSS_CONCURRENCY),
+            )
             
             # Step 5: Create findings
             for vuln in vulnerabilities:
-                self.findings.append(self._create_finding(vuln))
+                self._add_finding(self._create_finding(vuln))
             
             # Step 6: Calculate summary
             summary = self._calculate_summary()
             
-            logger.info(f"SCA scan completed. Found {len(self.findings)} vulnerabilities")
+            logger.info(f"SCA scan completed. Found {summary['total_findings']} vulnerabilities")
             
             return ScanResult(
                 status=ScanStatus.COMPLETED,
-                findings=self.findings,
+                findings=list(self.findings),
                 summary=summary,
                 metadata={
                     "target": target,
@@ -149,7 +429,7 @@ class SCAScanner(BaseScannerPlugin):
             logger.error(f"SCA scan failed: {str(e)}", exc_info=True)
             return ScanResult(
                 status=ScanStatus.FAILED,
-                findings=self.findings,
+                findings=list(self.findings),
                 summary=self._calculate_summary(),
                 metadata={"target": target},
                 error=str(e)
@@ -176,8 +456,46 @@ class SCAScanner(BaseScannerPlugin):
                         "ecosystem": pm_info["ecosystem"]
                     }
         
-        # TODO: Add git repo cloning and file detection
-        # For MVP, we'll support direct file content
+        # Local checkout: manifests at the project root are passed by path
+        # and mapped when parsed, never read into memory up front. The
+        # target comes from the tenant, so it is only resolved inside the
+        # configured workspace root.
+        elif self.workspace_root:
+            loop = asyncio.get_running_loop()
+            detected = await loop.run_in_executor(
+                None, self._find_manifests, Path(self.workspace_root), target
+            )
+        
+        # TODO: Add git repo cloning
+        
+        return detected
+    
+    @classmethod
+    def _find_manifests(cls, workspace: Path, target: str) -> Dict[str, Dict]:
+        """Manifests directly under the checkout target names in workspace, by package manager (blocking)"""
+        detected = {}
+        workspace = workspace.resolve()
+        root = (workspace / target).resolve()
+        if root == workspace or not root.is_relative_to(workspace):
+            logger.warning(f"SCA target outside the workspace root: {target}")
+            return detected
+        if not root.is_dir():
+            return detected
+        
+        for pm_name, pm_info in cls.PACKAGE_MANAGERS.items():
+            # Symlinked manifests must not lead out of the checkout either
+            files = {
+                path.name: path
+                for pattern in pm_info["files"]
+                for path in sorted(root.glob(pattern))
+                if path.is_file() and path.resolve().is_relative_to(root)
+            }
+            if files:
+                detected[pm_name] = {
+                    "files": list(files),
+                    "content": files,
+                    "ecosystem": pm_info["ecosystem"]
+                }
         
         return detected
     
@@ -187,235 +505,533 @@ class SCAScanner(BaseScannerPlugin):
         pm_data: Dict,
         target: str
     ) -> List[Dict[str, Any]]:
-        """Parse dependencies from package manager files"""
+        """
+        Parse dependencies from package manager files.
+        
+        Parsing is CPU-bound, so large inputs are spread over the process
+        pool one file at a time; results keep file order.
+        """
+        files = pm_data["content"]
+        
+        if self._parse_pool and sum(manifest_size(source) for source in files.values()) >= PROCESS_PARSE_MIN_BYTES:
+            loop = asyncio.get_running_loop()
+            try:
+                parsed = await asyncio.gather(*(
+                    loop.run_in_executor(
+                        self._parse_pool, parse_manifest_file, pm_name, filename, source
+                    )
+                    for filename, source in files.items()
+                ))
+                return [dep for deps in parsed for dep in deps]
+            except (OSError, RuntimeError, AssertionError, concurrent.futures.BrokenExecutor) as e:
+                # e.g. daemonic Celery workers may not fork children
+                logger.debug(f"Process pool unavailable, parsing inline: {str(e)}")
         
-        if pm_name == "npm":
-            return await self._parse_npm(pm_data)
-        elif pm_name == "pip":
-            return await self._parse_pip(pm_data)
-        elif pm_name == "maven":
-            return await self._parse_maven(pm_data)
-        elif pm_name == "composer":
-            return await self._parse_composer(pm_data)
+        return self._parse_manifest(pm_name, pm_data)
+    
+    @classmethod
+    def _parse_manifest(cls, pm_name: str, pm_data: Dict) -> List[Dict[str, Any]]:
+        """Dispatch to the parser for pm_name, opening file sources for it"""
+        parser_name = cls.MANIFEST_PARSERS.get(pm_name)
+        if parser_name is None:
+            return []
         
-        return []
+        with contextlib.ExitStack() as stack:
+            contents = {
+                filename: stack.enter_context(open_manifest(source))
+                for filename, source in pm_data["content"].items()
+            }
+            return getattr(cls, parser_name)({**pm_data, "content": contents})
     
-    async def _parse_npm(self, pm_data: Dict) -> List[Dict[str, Any]]:
+    @classmethod
+    def _parse_npm(cls, pm_data: Dict) -> List[Dict[str, Any]]:
         """Parse npm dependencies"""
         dependencies = []
         
         for filename, content in pm_data["content"].items():
             if filename == "package.json":
                 try:
-                    data = json.loads(content)
+                    requirements = iter_manifest_requirements(
+                        content, ("dependencies", "devDependencies")
+                    )
                     
                     # Parse dependencies
-                    for dep_type in ["dependencies", "devDependencies"]:
-                        if dep_type in data:
-                            for name, version in data[dep_type].items():
-                                # Clean version (remove ^, ~, etc.)
-                                clean_version = re.sub(r'[^\d.]', '', version)
-                                
-                                dependencies.append({
-                                    "name": name,
-                                    "version": clean_version,
-                                    "ecosystem": "npm",
-                                    "purl": f"pkg:npm/{name}@{clean_version}",
-                                    "type": dep_type,
-                                })
+                    for dep_type, name, version in requirements:
+                        # Clean version (remove ^, ~, etc.)
+                        clean_version = VERSION_CLEAN_RE.sub('', version)
+                        
+                        dependencies.append({
+                            "name": name,
+                            "version": clean_version,
+                            "ecosystem": "npm",
+                            "purl": f"pkg:npm/{name}@{clean_version}",
+                            "type": dep_type,
+                        })
                 
-                except json.JSONDecodeError:
+                except JSON_DECODE_ERRORS:
                     logger.error(f"Failed to parse {filename}")
         
         return dependencies
     
-    async def _parse_pip(self, pm_data: Dict) -> List[Dict[str, Any]]:
+    @classmethod
+    def _parse_pip(cls, pm_data: Dict) -> List[Dict[str, Any]]:
         """Parse pip dependencies"""
         dependencies = []
         
         for filename, content in pm_data["content"].items():
             if filename == "requirements.txt":
-                for line in content.split('\n'):
-                    line = line.strip()
-                    
-                    # Skip comments and empty lines
-                    if not line or line.startswith('#'):
-                        continue
+                # Single pass over the whole file, no per-line copies
+                if isinstance(content, str):
+                    matches = PIP_REQUIREMENT_RE.finditer(content)
+                else:
+                    matches = PIP_REQUIREMENT_BYTES_RE.finditer(content)
+                
+                for match in matches:
+                    name, _, version = (
+                        group if isinstance(group, str) else group.decode()
+                        for group in match.groups()
+                    )
                     
-                    # Parse package==version or package>=version
-                    match = re.match(r'([a-zA-Z0-9\-_]+)(==|>=|<=|>|<)([0-9.]+)', line)
-                    if match:
-                        name = match.group(1)
-                        version = match.group(3)
-                        
-                        dependencies.append({
-                            "name": name,
-                            "version": version,
-                            "ecosystem": "pypi",
-                            "purl": f"pkg:pypi/{name}@{version}",
-                            "type": "dependencies",
-                        })
+                    dependencies.append({
+                        "name": name,
+                        "version": version,
+                        "ecosystem": "pypi",
+                        "purl": f"pkg:pypi/{name}@{version}",
+                        "type": "dependencies",
+                    })
         
         return dependencies
     
-    async def _parse_maven(self, pm_data: Dict) -> List[Dict[str, Any]]:
+    @classmethod
+    def _parse_maven(cls, pm_data: Dict) -> List[Dict[str, Any]]:
         """Parse Maven dependencies from pom.xml"""
         dependencies = []
         
         for filename, content in pm_data["content"].items():
             if filename == "pom.xml":
-                # Simple XML parsing (for MVP)
-                # In production, use xml.etree.ElementTree
-                dep_pattern = r'<dependency>.*?<groupId>(.*?)</groupId>.*?<artifactId>(.*?)</artifactId>.*?<version>(.*?)</version>.*?</dependency>'
-                matches = re.findall(dep_pattern, content, re.DOTALL)
+                try:
+                    dependencies.extend(cls._iter_maven_dependencies(content))
+                except ParseError:
+                    logger.error(f"Failed to parse {filename}")
+        
+        return dependencies
+    
+    @staticmethod
+    def _iter_maven_dependencies(content: Union[str, mmap.mmap, bytes]):
+        """
+        Stream <dependency> elements out of a pom.xml.
+        
+        Each dependency subtree is cleared once read, and entries under
+        <dependencyManagement> (version pins, not dependencies) are skipped,
+        as are dependencies without an explicit version.
+        """
+        managed_depth = 0
+        
+        for event, elem in iterparse(manifest_stream(content), events=("start", "end")):
+            # Drop the Maven namespace, e.g. {http://maven.apache.org/POM/4.0.0}
+            tag = elem.tag.rsplit("}", 1)[-1]
+            
+            if tag == "dependencyManagement":
+                managed_depth += 1 if event == "start" else -1
+                continue
+            
+            if event != "end" or tag != "dependency":
+                continue
+            
+            if not managed_depth:
+                fields = {
+                    child.tag.rsplit("}", 1)[-1]: (child.text or "").strip()
+                    for child in elem
+                }
+                group_id = fields.get("groupId")
+                artifact_id = fields.get("artifactId")
+                version = fields.get("version")
                 
-                for group_id, artifact_id, version in matches:
-                    dependencies.append({
+                if group_id and artifact_id and version:
+                    yield {
                         "name": f"{group_id}:{artifact_id}",
-                        "version": version.strip(),
+                        "version": version,
                         "ecosystem": "maven",
                         "purl": f"pkg:maven/{group_id}/{artifact_id}@{version}",
                         "type": "dependencies",
-                    })
-        
-        return dependencies
+                    }
+            
+            elem.clear()
     
-    async def _parse_composer(self, pm_data: Dict) -> List[Dict[str, Any]]:
+    @classmethod
+    def _parse_composer(cls, pm_data: Dict) -> List[Dict[str, Any]]:
         """Parse Composer dependencies"""
         dependencies = []
         
         for filename, content in pm_data["content"].items():
             if filename == "composer.json":
                 try:
-                    data = json.loads(content)
+                    requirements = iter_manifest_requirements(
+                        content, ("require", "require-dev")
+                    )
                     
-                    for dep_type in ["require", "require-dev"]:
-                        if dep_type in data:
-                            for name, version in data[dep_type].items():
-                                # Skip PHP itself
-                                if name == "php":
-                                    continue
-                                
-                                # Clean version
-                                clean_version = re.sub(r'[^\d.]', '', version)
-                                
-                                dependencies.append({
-                                    "name": name,
-                                    "version": clean_version,
-                                    "ecosystem": "packagist",
-                                    "purl": f"pkg:composer/{name}@{clean_version}",
-                                    "type": dep_type,
-                                })
+                    for dep_type, name, version in requirements:
+                        # Skip PHP itself
+                        if name == "php":
+                            continue
+                        
+                        # Clean version
+                        clean_version = VERSION_CLEAN_RE.sub('', version)
+                        
+                        dependencies.append({
+                            "name": name,
+                            "version": clean_version,
+                            "ecosystem": "packagist",
+                            "purl": f"pkg:composer/{name}@{clean_version}",
+                            "type": dep_type,
+                        })
                 
-                except json.JSONDecodeError:
+                except JSON_DECODE_ERRORS:
                     logger.error(f"Failed to parse {filename}")
         
         return dependencies
     
     async def _check_vulnerabilities(
         self,
-        dependencies: List[Dict[str, Any]]
+        dependencies: List[Dict[str, Any]],
+        cache_ttl: float = DEFAULT_VULN_CACHE_TTL,
+        concurrency: int = DEFAULT_OSS_CONCURRENCY
     ) -> List[Dict[str, Any]]:
         """Check dependencies against vulnerability databases"""
         
-        vulnerabilities = []
+        # Query each purl once, remembering every dependency record behind it
+        origins: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for dep in dependencies:
+            origins[dep["purl"]].append(dep)
+        unique = [deps[0] for deps in origins.values()]
+        osv_deps = [dep for dep in unique if dep["ecosystem"] in OSV_ECOSYSTEMS]
+        oss_deps = [dep for dep in unique if dep["ecosystem"] not in OSV_ECOSYSTEMS]
         
-        # Split into batches (OSS Index allows 128 per request)
+        # Split into batches (OSV takes 1000 queries per request, OSS Index 128)
         batch_size = 100
-        for i in range(0, len(dependencies), batch_size):
-            batch = dependencies[i:i + batch_size]
-            
-            # Query OSS Index
-            oss_vulns = await self._query_oss_index(batch)
-            vulnerabilities.extend(oss_vulns)
-            
-            # Add small delay to avoid rate limiting
-            await asyncio.sleep(1)
+        batches = [
+            (self._query_osv, osv_deps[i:i + OSV_BATCH_SIZE])
+            for i in range(0, len(osv_deps), OSV_BATCH_SIZE)
+        ] + [
+            (self._query_oss_index, oss_deps[i:i + batch_size])
+            for i in range(0, len(oss_deps), batch_size)
+        ]
+        
+        # The semaphore bounds requests in flight to stay clear of rate limiting
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def query_batch(query, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await query(batch, cache_ttl)
+        
+        results = await asyncio.gather(*(query_batch(query, batch) for query, batch in batches))
+        
+        # gather keeps batch order, so findings come out in batch order;
+        # each vulnerability is reported once per occurrence of its purl
+        vulnerabilities = []
+        for oss_vulns in results:
+            for vuln in oss_vulns:
+                queried = vuln["dependency"]
+                for dep in origins[queried["purl"]]:
+                    vulnerabilities.append(vuln if dep is queried else {**vuln, "dependency": dep})
         
         return vulnerabilities
     
     async def _query_oss_index(
         self,
-        dependencies: List[Dict[str, Any]]
+        dependencies: List[Dict[str, Any]],
+        cache_ttl: float = DEFAULT_VULN_CACHE_TTL
     ) -> List[Dict[str, Any]]:
-        """Query Sonatype OSS Index for vulnerabilities"""
+        """
+        Query Sonatype OSS Index for vulnerabilities.
         
-        vulnerabilities = []
+        Purls with a fresh positive hit in the cache are answered locally;
+        only the remaining coordinates are posted.
+        """
+        now = time.monotonic()
+        results, misses = self._split_cached(dependencies, cache_ttl, now)
         
         try:
-            # Prepare coordinates
-            coordinates = [dep["purl"] for dep in dependencies]
-            
-            # Query OSS Index
-            response = await self.client.post(
-                self.oss_index_url,
-                json={"coordinates": coordinates},
-                headers={"Content-Type": "application/json"}
-            )
-            
-            if response.status_code == 200:
-                results = response.json()
+            if misses:
+                # Prepare coordinates
+                coordinates = [dep["purl"] for dep in misses]
                 
-                for result in results:
-                    if result.get("vulnerabilities"):
-                        # Find matching dependency
-                        dep = next(
-                            (d for d in dependencies if d["purl"] == result["coordinates"]),
-                            None
-                        )
-                        
-                        if not dep:
+                # Query OSS Index
+                response = await self._send_with_retry(
+                    "POST",
+                    self.oss_index_url,
+                    content=orjson.dumps({"coordinates": coordinates}),
+                )
+                
+                if response.status_code != 200:
+                    logger.warning(f"OSS Index returned HTTP {response.status_code}")
+                else:
+                    fetched = orjson.loads(response.content)
+                    clean = _clean_purls()
+                    for result in fetched:
+                        if result.get("vulnerabilities"):
+                            _VULN_CACHE[result["coordinates"]] = (now, result["vulnerabilities"])
+                        else:
+                            clean.add(result["coordinates"])
+                    results.extend(fetched)
+        except Exception as e:
+            logger.error(f"OSS Index query failed: {str(e)}")
+        
+        return self._build_vulnerabilities(dependencies, results)
+    
+    async def _query_osv(
+        self,
+        dependencies: List[Dict[str, Any]],
+        cache_ttl: float = DEFAULT_VULN_CACHE_TTL
+    ) -> List[Dict[str, Any]]:
+        """
+        Query OSV for vulnerabilities.
+        
+        One querybatch call returns vulnerability ids per purl; the
+        distinct ids are then fetched concurrently and normalized to the
+        OSS Index record shape, so caching and finding creation are shared.
+        """
+        now = time.monotonic()
+        results, misses = self._split_cached(dependencies, cache_ttl, now)
+        
+        try:
+            if misses:
+                response = await self._send_with_retry(
+                    "POST",
+                    self.osv_batch_url,
+                    content=orjson.dumps({
+                        "queries": [{"package": {"purl": dep["purl"]}} for dep in misses]
+                    }),
+                )
+                
+                if response.status_code != 200:
+                    logger.warning(f"OSV returned HTTP {response.status_code}")
+                else:
+                    # Results are positional: the i-th answers the i-th query
+                    batch_results = orjson.loads(response.content).get("results", [])
+                    ids_per_dep = [
+                        [vuln["id"] for vuln in result.get("vulns") or []]
+                        for result in batch_results
+                    ]
+                    records = await self._hydrate_osv({
+                        vuln_id for ids in ids_per_dep for vuln_id in ids
+                    })
+                    
+                    clean = _clean_purls()
+                    for dep, ids in zip(misses, ids_per_dep):
+                        if not ids:
+                            clean.add(dep["purl"])
                             continue
-                        
-                        for vuln in result["vulnerabilities"]:
-                            vulnerabilities.append({
-                                "dependency": dep,
-                                "cve_id": vuln.get("cve") or vuln.get("id"),
-                                "title": vuln.get("title"),
-                                "description": vuln.get("description"),
-                                "cvss_score": vuln.get("cvssScore", 0),
-                                "cvss_vector": vuln.get("cvssVector"),
-                                "severity": self._map_cvss_to_severity(vuln.get("cvssScore", 0)),
-                                "reference": vuln.get("reference"),
-                                "published_date": vuln.get("publishedDate"),
-                                "fixed_versions": self._extract_fixed_versions(vuln),
-                            })
+                        vulns = self._dedupe_osv(
+                            [records[vuln_id] for vuln_id in ids if vuln_id in records]
+                        )
+                        # A purl with an advisory that failed to load is
+                        # reported with what did load but not cached, so the
+                        # missing advisory is fetched again next scan
+                        if vulns and all(vuln_id in records for vuln_id in ids):
+                            _VULN_CACHE[dep["purl"]] = (now, vulns)
+                        if vulns:
+                            results.append({"coordinates": dep["purl"], "vulnerabilities": vulns})
+        except Exception as e:
+            logger.error(f"OSV query failed: {str(e)}")
+        
+        return self._build_vulnerabilities(dependencies, results)
+    
+    async def _hydrate_osv(self, vuln_ids: Set[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch OSV advisories by id; ids that fail to load are left out"""
+        semaphore = asyncio.Semaphore(OSV_HYDRATE_CONCURRENCY)
+        
+        async def fetch(vuln_id: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+            async with semaphore:
+                try:
+                    response = await self._send_with_retry("GET", self.osv_vuln_url.format(vuln_id))
+                    if response.status_code == 200:
+                        return vuln_id, self._osv_to_oss_index(orjson.loads(response.content))
+                    logger.warning(f"OSV returned HTTP {response.status_code} for {vuln_id}")
+                except Exception as e:
+                    logger.error(f"OSV lookup of {vuln_id} failed: {str(e)}")
+                return vuln_id, None
+        
+        fetched = await asyncio.gather(*(fetch(vuln_id) for vuln_id in sorted(vuln_ids)))
+        return {vuln_id: record for vuln_id, record in fetched if record}
+    
+    @staticmethod
+    def _osv_to_oss_index(vuln: Dict[str, Any]) -> Dict[str, Any]:
+        """Normalize an OSV advisory to the OSS Index vulnerability fields used here"""
+        aliases = [vuln["id"], *(vuln.get("aliases") or [])]
+        vectors = {
+            entry.get("type"): entry.get("score")
+            for entry in vuln.get("severity") or []
+            if str(entry.get("type", "")).startswith("CVSS") and entry.get("score")
+        }
+        cvss_vector = vectors.get("CVSS_V3") or next(iter(vectors.values()), None)
+        cvss_score = cvss3_base_score(vectors["CVSS_V3"]) if "CVSS_V3" in vectors else None
+        qualitative = str((vuln.get("database_specific") or {}).get("severity", "")).upper()
+        references = vuln.get("references") or []
+        
+        fixed_versions = []
+        for affected in vuln.get("affected") or []:
+            for version_range in affected.get("ranges") or []:
+                for event in version_range.get("events") or []:
+                    fixed = event.get("fixed")
+                    if fixed and fixed not in fixed_versions:
+                        fixed_versions.append(fixed)
+        
+        return {
+            "id": vuln["id"],
+            "aliases": aliases,
+            "cve": next((alias for alias in aliases if alias.startswith("CVE-")), None),
+            "title": vuln.get("summary") or vuln["id"],
+            "description": vuln.get("details") or vuln.get("summary") or "",
+            "cvssScore": cvss_score,
+            "cvssVector": cvss_vector,
+            "severity": OSV_SEVERITY_LEVELS.get(qualitative),
+            "reference": references[0].get("url") if references else None,
+            "publishedDate": vuln.get("published"),
+            "fixedVersions": fixed_versions,
+        }
+    
+    @staticmethod
+    def _dedupe_osv(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Collapse advisories for the same vulnerability (e.g. a GHSA and a
+        PYSEC entry for one CVE) into one, linked through their aliases.
+        Records with a CVSS score, then with a qualitative severity, win.
+        """
+        ranked = sorted(
+            records,
+            key=lambda record: (record["cvssScore"] is None, record["severity"] is None)
+        )
+        seen: Set[str] = set()
+        kept = []
+        for record in ranked:
+            if seen.isdisjoint(record["aliases"]):
+                kept.append(record)
+            seen.update(record["aliases"])
+        return kept
+    
+    @staticmethod
+    def _split_cached(
+        dependencies: List[Dict[str, Any]],
+        cache_ttl: float,
+        now: float
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Split into cached results (OSS Index result shape) and purls to
+        query; purls already known clean today are in neither.
+        """
+        results = []
+        misses = []
+        clean = _clean_purls()
+        
+        for dep in dependencies:
+            if dep["purl"] in clean:
+                continue
+            cached = _VULN_CACHE.get(dep["purl"])
+            if cached and now - cached[0] < cache_ttl:
+                results.append({"coordinates": dep["purl"], "vulnerabilities": cached[1]})
+            else:
+                misses.append(dep)
+        
+        return results, misses
+    
+    def _build_vulnerabilities(
+        self,
+        dependencies: List[Dict[str, Any]],
+        results: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Turn per-purl results into vulnerability records for their dependencies"""
+        vulnerabilities = []
+        
+        try:
+            by_purl = {dep["purl"]: dep for dep in dependencies}
             
+            for result in results:
+                if result.get("vulnerabilities"):
+                    # Find matching dependency
+                    dep = by_purl.get(result["coordinates"])
+                    
+                    if not dep:
+                        continue
+                    
+                    for vuln in result["vulnerabilities"]:
+                        cvss_score = vuln.get("cvssScore")
+                        if cvss_score is not None:
+                            severity = self._map_cvss_to_severity(cvss_score)
+                        else:
+                            severity = vuln.get("severity") or SeverityLevel.INFO
+                        vulnerabilities.append({
+                            "dependency": dep,
+                            "cve_id": vuln.get("cve") or vuln.get("id"),
+                            "title": vuln.get("title"),
+                            "description": vuln.get("description"),
+                            "cvss_score": cvss_score,
+                            "cvss_vector": vuln.get("cvssVector"),
+                            "severity": severity,
+                            "reference": vuln.get("reference"),
+                            "published_date": vuln.get("publishedDate"),
+                            "fixed_versions": self._extract_fixed_versions(vuln),
+                        })
+        
         except Exception as e:
-            logger.error(f"OSS Index query failed: {str(e)}")
+            logger.error(f"Vulnerability result processing failed: {str(e)}")
         
         return vulnerabilities
     
+    async def _send_with_retry(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a vulnerability database request, retrying transport errors,
+        429 and 5xx responses.
+        
+        Waits honour Retry-After when given, otherwise back off
+        exponentially with full jitter. The last attempt's response or
+        exception is passed through.
+        """
+        # Built once: bodies are pre-encoded bytes, so the same request can
+        # be re-sent on every attempt
+        request = self.client.build_request(method, url, **kwargs)
+        
+        for attempt in range(VULN_DB_MAX_ATTEMPTS):
+            is_last = attempt == VULN_DB_MAX_ATTEMPTS - 1
+            retry_after = None
+            
+            try:
+                response = await self.client.send(request)
+                if response.status_code not in VULN_DB_RETRY_STATUSES or is_last:
+                    return response
+                retry_after = response.headers.get("Retry-After", "").strip()
+            except httpx.TransportError:
+                if is_last:
+                    raise
+            
+            if retry_after and retry_after.isdigit():
+                delay = min(float(retry_after), VULN_DB_BACKOFF_MAX)
+            else:
+                backoff = min(VULN_DB_BACKOFF_MAX, VULN_DB_BACKOFF_INITIAL * 2 ** attempt)
+                delay = random.uniform(0, backoff)
+            
+            logger.debug(f"Retrying {url} in {delay:.1f}s (attempt {attempt + 1})")
+            await asyncio.sleep(delay)
+    
     def _map_cvss_to_severity(self, cvss_score: float) -> str:
         """Map CVSS score to severity level"""
-        if cvss_score >= 9.0:
-            return SeverityLevel.CRITICAL
-        elif cvss_score >= 7.0:
-            return SeverityLevel.HIGH
-        elif cvss_score >= 4.0:
-            return SeverityLevel.MEDIUM
-        elif cvss_score > 0:
-            return SeverityLevel.LOW
-        else:
+        if cvss_score <= 0:
             return SeverityLevel.INFO
+        return CVSS_SEVERITY_LEVELS[bisect.bisect_right(CVSS_SEVERITY_THRESHOLDS, cvss_score)]
     
     def _extract_fixed_versions(self, vuln: Dict) -> List[str]:
         """Extract fixed versions from vulnerability data"""
+        # OSV advisories list them explicitly
+        if vuln.get("fixedVersions"):
+            return list(vuln["fixedVersions"])
+        
         fixed_versions = []
         
         # Try to extract from description or references
         description = vuln.get("description", "")
         
-        # Common patterns: "Fixed in version X.Y.Z" or "Upgrade to X.Y.Z"
-        patterns = [
-            r'[Ff]ixed in (?:version )?([0-9.]+)',
-            r'[Uu]pgrade to ([0-9.]+)',
-            r'[Pp]atched in ([0-9.]+)',
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, description)
-            fixed_versions.extend(matches)
+        # Common patterns, matched in a single pass
+        fixed_versions.extend(FIXED_VERSION_RE.findall(description))
         
         return list(set(fixed_versions))  # Remove duplicates
     
@@ -446,20 +1062,19 @@ class SCAScanner(BaseScannerPlugin):
             "published_date": vuln.get("published_date"),
         }
     
-    def _calculate_summary(self) -> Dict[str, Any]:
-        """Calculate scan summary"""
-        severity_counts = {
-            SeverityLevel.CRITICAL: 0,
-            SeverityLevel.HIGH: 0,
-            SeverityLevel.MEDIUM: 0,
-            SeverityLevel.LOW: 0,
-            SeverityLevel.INFO: 0,
-        }
+    def _add_finding(self, finding: Dict[str, Any]) -> None:
+        """Record a finding, updating the running summary state"""
+        self._severity_counts[finding.get("severity")] += 1
+        if finding.get("dependency_name"):
+            self._vulnerable_deps.add(finding["dependency_name"])
         
-        for finding in self.findings:
-            severity = finding.get("severity")
-            if severity in severity_counts:
-                severity_counts[severity] += 1
+        if len(self.findings) == self.findings.maxlen:
+            self._dropped_findings += 1
+        self.findings.append(finding)
+    
+    def _calculate_summary(self) -> Dict[str, Any]:
+        """Calculate scan summary from the running counts"""
+        severity_counts = self._severity_counts
         
         # Calculate risk score
         risk_score = (
@@ -472,21 +1087,24 @@ class SCAScanner(BaseScannerPlugin):
         
         risk_score = min(risk_score, 100)
         
-        # Count unique dependencies with vulnerabilities
-        vulnerable_deps = set()
-        for finding in self.findings:
-            dep_name = finding.get("dependency_name")
-            if dep_name:
-                vulnerable_deps.add(dep_name)
-        
         return {
-            "total_findings": len(self.findings),
+            "total_findings": len(self.findings) + self._dropped_findings,
+            "dropped_findings": self._dropped_findings,
             "critical_count": severity_counts[SeverityLevel.CRITICAL],
             "high_count": severity_counts[SeverityLevel.HIGH],
             "medium_count": severity_counts[SeverityLevel.MEDIUM],
             "low_count": severity_counts[SeverityLevel.LOW],
             "info_count": severity_counts[SeverityLevel.INFO],
             "risk_score": risk_score,
-            "vulnerable_dependencies": len(vulnerable_deps),
-            "total_dependencies": sum(len(deps) for deps in self.dependencies.values()),
+            "vulnerable_dependencies": len(self._vulnerable_deps),
+            "total_dependencies": self._dependency_count,
         }
+
+
+def parse_manifest_file(pm_name: str, filename: str, source: ManifestSource) -> List[Dict[str, Any]]:
+    """
+    Parse a single manifest; module-level so process pools can pickle it.
+    
+    File sources are passed by path and mapped in the worker.
+    """
+    return SCAScanner._parse_manifest(pm_name, {"content": {filename: source}})
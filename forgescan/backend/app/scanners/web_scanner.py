@@ -1,15 +1,137 @@
 # backend/app/scanners/web_scanner.py
 import aiohttp
 import re
-from typing import Dict, Any, List, Optional
-from urllib.parse import urlparse, urljoin
-from bs4 import BeautifulSoup
+from typing import Dict, Any, List, Optional, Tuple, Union
+from urllib.parse import urljoin, urlsplit
+from bs4 import BeautifulSoup, SoupStrainer
+from multidict import CIMultiDictProxy
+from yarl import URL
 import asyncio
+from collections import Counter, deque
 
-from app.scanners.base import BaseScannerPlugin, ScanResult, ScanStatus
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    HAVE_SELECTOLAX = True
+except ImportError:
+    HAVE_SELECTOLAX = False
+
+try:
+    import hyperscan
+    HAVE_HYPERSCAN = True
+except ImportError:
+    HAVE_HYPERSCAN = False
+
+from app.scanners.base import (
+    BaseScannerPlugin, ScanResult, ScanStatus, create_http_connector
+)
 from app.core.constants import SeverityLevel, OWASP_WEB_TOP_10
 from app.core.logging import logger
 
+# Per-request limit so one slow URL cannot hold a connection for the whole
+# scan-wide timeout
+PROBE_TIMEOUT = aiohttp.ClientTimeout(total=15, connect=5)
+
+# Probe bodies are scanned as raw bytes while streaming, up to a cap; each
+# chunk is searched together with the tail of the previous one so matches
+# straddling a chunk boundary are found
+BODY_SCAN_CHUNK_BYTES = 8192
+BODY_SCAN_OVERLAP_BYTES = 2048
+BODY_SCAN_MAX_BYTES = 1 << 20
+
+# Reflected-XSS payloads, with the raw bytes looked for in probe bodies
+XSS_PAYLOADS = {
+    payload: payload.encode()
+    for payload in (
+        "<script>alert('XSS')</script>",
+        "<img src=x onerror=alert('XSS')>",
+        "javascript:alert('XSS')",
+    )
+}
+
+# (parameter, payload) pairs tried by the injection checks, expanded once
+# here rather than through nested loops on every scan
+XSS_PROBES = tuple(
+    (param, payload)
+    for param in ("q", "search", "query", "id", "page")
+    for payload in XSS_PAYLOADS
+)
+SQL_INJECTION_PROBES = tuple(
+    (param, payload)
+    for param in ("id", "user", "page", "search")
+    for payload in (
+        "' OR '1'='1",
+        "1' OR '1'='1",
+        "admin'--",
+        "1 UNION SELECT NULL--",
+    )
+)
+
+
+class HyperscanMatcher:
+    """Case-insensitive Hyperscan block database with an re-style search()"""
+    
+    def __init__(self, patterns: Tuple[bytes, ...]):
+        flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH
+        self._db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        self._db.compile(
+            expressions=list(patterns),
+            ids=list(range(len(patterns))),
+            flags=[flags] * len(patterns),
+        )
+    
+    def search(self, data: bytes) -> bool:
+        matched = []
+        self._db.scan(data, match_event_handler=lambda *_: matched.append(True))
+        return bool(matched)
+
+
+def compile_indicators(patterns: Tuple[bytes, ...]) -> Union[HyperscanMatcher, re.Pattern]:
+    """
+    Compile indicator patterns into one case-insensitive matcher that scans a
+    body once for all of them: a Hyperscan database when available, else a
+    single re alternation.
+    """
+    if HAVE_HYPERSCAN:
+        return HyperscanMatcher(patterns)
+    return re.compile(b"|".join(b"(?:%s)" % pattern for pattern in patterns), re.IGNORECASE)
+
+
+# Database error messages that indicate an injectable parameter. Trailing
+# ".*" is dropped from the original patterns: it cannot change whether a
+# search matches, only how far it backtracks.
+SQL_ERROR_RE = compile_indicators((
+    rb"SQL syntax.*MySQL",
+    rb"Warning.*mysql_",
+    rb"valid MySQL result",
+    rb"MySqlClient\.",
+    rb"PostgreSQL.*ERROR",
+    rb"Warning.*pg_",
+    rb"valid PostgreSQL result",
+    rb"Npgsql\.",
+    rb"Driver.*SQL Server",
+    rb"OLE DB.*SQL Server",
+    rb"SQLServer JDBC Driver",
+    rb"Microsoft SQL Native Client error",
+))
+
+# Without selectolax, only anchors with an href are built into the soup
+LINK_STRAINER = SoupStrainer("a", href=True)
+
+# Markers of a server-generated directory index
+DIRECTORY_LISTING_RE = compile_indicators((rb"index of", rb"parent directory", rb"\[dir\]"))
+
+
+def extract_links(html: str) -> List[str]:
+    """Return the href of every anchor in an HTML page"""
+    if HAVE_SELECTOLAX:
+        return [
+            node.attributes["href"]
+            for node in LexborHTMLParser(html).css("a[href]")
+            if node.attributes["href"] is not None
+        ]
+    soup = BeautifulSoup(html, "html.parser", parse_only=LINK_STRAINER)
+    return [link["href"] for link in soup.find_all("a", href=True)]
+
 
 class WebScanner(BaseScannerPlugin):
     """Web application vulnerability scanner"""
@@ -19,14 +141,26 @@ class WebScanner(BaseScannerPlugin):
     description = "Web application security scanner"
     supported_protocols = ["http", "https"]
     
-    def __init__(self):
+    def __init__(self, connector: Optional[aiohttp.TCPConnector] = None):
         self.timeout = aiohttp.ClientTimeout(total=300)
         self.session: Optional[aiohttp.ClientSession] = None
+        self._connector = connector
+        self.max_concurrency = 20
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._head_unsupported: set[str] = set()
+        self._responses: Dict[Tuple[str, bool], asyncio.Future] = {}
         self.findings: List[Dict[str, Any]] = []
     
     async def initialize(self) -> None:
         """Initialize HTTP session"""
-        self.session = aiohttp.ClientSession(timeout=self.timeout)
+        # A connector handed in by PluginManager is shared and owned by it
+        shared = self._connector is not None
+        self.session = aiohttp.ClientSession(
+            timeout=self.timeout,
+            connector=self._connector if shared else create_http_connector(),
+            connector_owner=not shared,
+        )
+        self._sem = asyncio.Semaphore(self.max_concurrency)
     
     async def cleanup(self) -> None:
         """Close HTTP session"""
@@ -36,7 +170,7 @@ class WebScanner(BaseScannerPlugin):
     async def validate_target(self, target: str) -> bool:
         """Validate target URL"""
         try:
-            parsed = urlparse(target)
+            parsed = urlsplit(target)
             return parsed.scheme in self.supported_protocols and bool(parsed.netloc)
         except Exception:
             return False
@@ -50,19 +184,30 @@ class WebScanner(BaseScannerPlugin):
     ) -> ScanResult:
         """Execute web security scan"""
         self.findings = []
+        self._head_unsupported = set()
+        self._responses = {}
         options = options or {}
         
         try:
             logger.info(f"Starting web scan for {target}", extra={"scan_id": scan_id})
             
-            # Perform various security checks
-            await self._check_ssl_tls(target)
-            await self._check_security_headers(target)
-            await self._check_xss_vulnerabilities(target)
-            await self._check_sql_injection(target)
-            await self._check_directory_listing(target)
-            await self._check_sensitive_files(target)
-            await self._check_cors_misconfiguration(target)
+            # Perform various security checks; they are independent network
+            # probes whose findings are appended without awaiting in between,
+            # so they can run concurrently on the loop
+            results = await asyncio.gather(
+                self._check_ssl_tls(target),
+                self._check_security_headers(target),
+                self._check_xss_vulnerabilities(target),
+                self._check_sql_injection(target),
+                self._check_directory_listing(target),
+                self._check_sensitive_files(target),
+                self._check_cors_misconfiguration(target),
+                return_exceptions=True,
+            )
+            
+            for result in results:
+                if isinstance(result, BaseException):
+                    logger.debug(f"Web check failed: {str(result)}")
             
             # Optional: Deeper crawl if enabled
             if options.get("deep_crawl", False):
@@ -92,6 +237,87 @@ class WebScanner(BaseScannerPlugin):
                 error=str(e)
             )
     
+    async def _get(self, url: str, **kwargs) -> Tuple[int, CIMultiDictProxy, str]:
+        """
+        GET a URL under the scanner's concurrency limit.
+        
+        Requests without custom headers are shared for the rest of the scan:
+        concurrent and repeated GETs of the same URL reuse one response.
+        """
+        if "headers" in kwargs:
+            return await self._send_get(url, **kwargs)
+        
+        key = (url, kwargs.get("allow_redirects", True))
+        response = self._responses.get(key)
+        if response is None:
+            response = self._responses[key] = asyncio.ensure_future(self._send_get(url, **kwargs))
+        # A cancelled caller must not cancel the request other callers share
+        return await asyncio.shield(response)
+    
+    async def _send_get(self, url: str, **kwargs) -> Tuple[int, CIMultiDictProxy, str]:
+        kwargs.setdefault("timeout", PROBE_TIMEOUT)
+        async with self._sem:
+            async with self.session.get(url, **kwargs) as response:
+                return response.status, response.headers, await response.text()
+    
+    async def _body_matches(
+        self,
+        url: Union[str, URL],
+        pattern: Union[re.Pattern, HyperscanMatcher, bytes]
+    ) -> bool:
+        """
+        GET a probe URL without following redirects and report whether the
+        bytes pattern, or literal bytes needle, occurs in its body.
+        
+        The body is streamed and never decoded or held whole; reading stops
+        at the first match or after BODY_SCAN_MAX_BYTES.
+        """
+        tail = b""
+        seen = 0
+        try:
+            async with self._sem:
+                async with self.session.get(url, allow_redirects=False, timeout=PROBE_TIMEOUT) as response:
+                    async for chunk in response.content.iter_chunked(BODY_SCAN_CHUNK_BYTES):
+                        window = tail + chunk
+                        if isinstance(pattern, bytes):
+                            found = pattern in window
+                        else:
+                            found = bool(pattern.search(window))
+                        if found:
+                            return True
+                        seen += len(chunk)
+                        if seen >= BODY_SCAN_MAX_BYTES:
+                            break
+                        tail = window[-BODY_SCAN_OVERLAP_BYTES:]
+        except Exception as e:
+            logger.debug(f"Error probing {url}: {str(e)}")
+        return False
+    
+    async def _fetch_status(self, url: str) -> Optional[int]:
+        """
+        Status of a probe URL without following redirects or downloading its
+        body; None on request errors.
+        
+        HEAD is tried first. Hosts that reject it get a single-byte ranged
+        GET instead, and are remembered so later probes skip the HEAD.
+        """
+        host = urlsplit(url).netloc
+        try:
+            async with self._sem:
+                if host not in self._head_unsupported:
+                    async with self.session.head(url, allow_redirects=False, timeout=PROBE_TIMEOUT) as response:
+                        if response.status not in (405, 501):
+                            return response.status
+                    self._head_unsupported.add(host)
+                
+                async with self.session.get(
+                    url, allow_redirects=False, timeout=PROBE_TIMEOUT, headers={"Range": "bytes=0-0"}
+                ) as response:
+                    return response.status
+        except Exception as e:
+            logger.debug(f"Error probing {url}: {str(e)}")
+            return None
+    
     async def _check_ssl_tls(self, target: str):
         """Check SSL/TLS configuration"""
         if not target.startswith("https://"):
@@ -109,155 +335,116 @@ class WebScanner(BaseScannerPlugin):
     async def _check_security_headers(self, target: str):
         """Check for security headers"""
         try:
-            async with self.session.get(target) as response:
-                headers = response.headers
-                
-                # Check for missing security headers
-                required_headers = {
-                    "X-Frame-Options": ("Clickjacking Protection Missing", SeverityLevel.MEDIUM),
-                    "X-Content-Type-Options": ("MIME Type Sniffing Prevention Missing", SeverityLevel.MEDIUM),
-                    "Strict-Transport-Security": ("HSTS Header Missing", SeverityLevel.MEDIUM),
-                    "Content-Security-Policy": ("Content Security Policy Missing", SeverityLevel.MEDIUM),
-                    "X-XSS-Protection": ("XSS Protection Header Missing", SeverityLevel.LOW),
-                }
-                
-                for header, (title, severity) in required_headers.items():
-                    if header.lower() not in [h.lower() for h in headers.keys()]:
-                        self.findings.append({
-                            "title": title,
-                            "description": f"Missing security header: {header}",
-                            "severity": severity,
-                            "url": target,
-                            "owasp_category": "A05:2021-Security Misconfiguration",
-                            "cwe_id": "CWE-16",
-                            "remediation": f"Add {header} header to HTTP responses",
-                            "references": ["https://owasp.org/www-project-secure-headers/"]
-                        })
+            _, headers, _ = await self._get(target)
+            
+            # Check for missing security headers
+            required_headers = {
+                "X-Frame-Options": ("Clickjacking Protection Missing", SeverityLevel.MEDIUM),
+                "X-Content-Type-Options": ("MIME Type Sniffing Prevention Missing", SeverityLevel.MEDIUM),
+                "Strict-Transport-Security": ("HSTS Header Missing", SeverityLevel.MEDIUM),
+                "Content-Security-Policy": ("Content Security Policy Missing", SeverityLevel.MEDIUM),
+                "X-XSS-Protection": ("XSS Protection Header Missing", SeverityLevel.LOW),
+            }
+            
+            for header, (title, severity) in required_headers.items():
+                # Response headers are a case-insensitive CIMultiDict
+                if header not in headers:
+                    self.findings.append({
+                        "title": title,
+                        "description": f"Missing security header: {header}",
+                        "severity": severity,
+                        "url": target,
+                        "owasp_category": "A05:2021-Security Misconfiguration",
+                        "cwe_id": "CWE-16",
+                        "remediation": f"Add {header} header to HTTP responses",
+                        "references": ["https://owasp.org/www-project-secure-headers/"]
+                    })
         
         except Exception as e:
             logger.error(f"Error checking security headers: {str(e)}")
     
     async def _check_xss_vulnerabilities(self, target: str):
         """Check for XSS vulnerabilities"""
-        xss_payloads = [
-            "<script>alert('XSS')</script>",
-            "<img src=x onerror=alert('XSS')>",
-            "javascript:alert('XSS')",
+        # yarl quotes the payloads and keeps any query the target already has
+        base_url = URL(target)
+        probes = [
+            (param, payload, base_url.update_query({param: payload}))
+            for param, payload in XSS_PROBES
         ]
+        # Check if payload is reflected without encoding
+        reflected = await asyncio.gather(*(
+            self._body_matches(test_url, XSS_PAYLOADS[payload])
+            for _, payload, test_url in probes
+        ))
         
-        # Parse URL for testing
-        parsed = urlparse(target)
-        
-        # Test common parameters
-        test_params = ["q", "search", "query", "id", "page"]
-        
-        for param in test_params:
-            for payload in xss_payloads:
-                test_url = f"{target}?{param}={payload}"
-                
-                try:
-                    async with self.session.get(test_url, allow_redirects=False) as response:
-                        text = await response.text()
-                        
-                        # Check if payload is reflected without encoding
-                        if payload in text:
-                            self.findings.append({
-                                "title": "Potential Cross-Site Scripting (XSS)",
-                                "description": f"XSS payload reflected in response without proper encoding",
-                                "severity": SeverityLevel.HIGH,
-                                "url": test_url,
-                                "parameter": param,
-                                "evidence": f"Payload: {payload}",
-                                "owasp_category": "A03:2021-Injection",
-                                "cwe_id": "CWE-79",
-                                "remediation": "Implement proper input validation and output encoding",
-                                "references": ["https://owasp.org/www-community/attacks/xss/"]
-                            })
-                            break  # Found XSS, move to next parameter
-                
-                except Exception as e:
-                    logger.debug(f"Error testing XSS: {str(e)}")
+        reported_params = set()
+        for (param, payload, test_url), is_reflected in zip(probes, reflected):
+            # Report only the first reflected payload per parameter
+            if is_reflected and param not in reported_params:
+                reported_params.add(param)
+                self.findings.append({
+                    "title": "Potential Cross-Site Scripting (XSS)",
+                    "description": f"XSS payload reflected in response without proper encoding",
+                    "severity": SeverityLevel.HIGH,
+                    "url": str(test_url),
+                    "parameter": param,
+                    "evidence": f"Payload: {payload}",
+                    "owasp_category": "A03:2021-Injection",
+                    "cwe_id": "CWE-79",
+                    "remediation": "Implement proper input validation and output encoding",
+                    "references": ["https://owasp.org/www-community/attacks/xss/"]
+                })
     
     async def _check_sql_injection(self, target: str):
         """Check for SQL injection vulnerabilities"""
-        sql_payloads = [
-            "' OR '1'='1",
-            "1' OR '1'='1",
-            "admin'--",
-            "1 UNION SELECT NULL--",
+        # yarl quotes the payloads and keeps any query the target already has
+        base_url = URL(target)
+        probes = [
+            (param, payload, base_url.update_query({param: payload}))
+            for param, payload in SQL_INJECTION_PROBES
         ]
+        # Check for SQL error messages
+        errored = await asyncio.gather(*(
+            self._body_matches(test_url, SQL_ERROR_RE) for _, _, test_url in probes
+        ))
         
-        test_params = ["id", "user", "page", "search"]
-        
-        sql_error_patterns = [
-            r"SQL syntax.*MySQL",
-            r"Warning.*mysql_.*",
-            r"valid MySQL result",
-            r"MySqlClient\.",
-            r"PostgreSQL.*ERROR",
-            r"Warning.*pg_.*",
-            r"valid PostgreSQL result",
-            r"Npgsql\.",
-            r"Driver.*SQL Server",
-            r"OLE DB.*SQL Server",
-            r"SQLServer JDBC Driver",
-            r"Microsoft SQL Native Client error",
-        ]
-        
-        for param in test_params:
-            for payload in sql_payloads:
-                test_url = f"{target}?{param}={payload}"
-                
-                try:
-                    async with self.session.get(test_url, allow_redirects=False) as response:
-                        text = await response.text()
-                        
-                        # Check for SQL error messages
-                        for pattern in sql_error_patterns:
-                            if re.search(pattern, text, re.IGNORECASE):
-                                self.findings.append({
-                                    "title": "Potential SQL Injection",
-                                    "description": "SQL error message detected, indicating possible SQL injection vulnerability",
-                                    "severity": SeverityLevel.CRITICAL,
-                                    "url": test_url,
-                                    "parameter": param,
-                                    "evidence": f"Payload: {payload}",
-                                    "owasp_category": "A03:2021-Injection",
-                                    "cwe_id": "CWE-89",
-                                    "remediation": "Use parameterized queries or prepared statements",
-                                    "references": ["https://owasp.org/www-community/attacks/SQL_Injection"]
-                                })
-                                break
-                
-                except Exception as e:
-                    logger.debug(f"Error testing SQL injection: {str(e)}")
+        for (param, payload, test_url), has_error in zip(probes, errored):
+            if has_error:
+                self.findings.append({
+                    "title": "Potential SQL Injection",
+                    "description": "SQL error message detected, indicating possible SQL injection vulnerability",
+                    "severity": SeverityLevel.CRITICAL,
+                    "url": str(test_url),
+                    "parameter": param,
+                    "evidence": f"Payload: {payload}",
+                    "owasp_category": "A03:2021-Injection",
+                    "cwe_id": "CWE-89",
+                    "remediation": "Use parameterized queries or prepared statements",
+                    "references": ["https://owasp.org/www-community/attacks/SQL_Injection"]
+                })
     
     async def _check_directory_listing(self, target: str):
         """Check for directory listing vulnerabilities"""
         common_dirs = ["/admin", "/backup", "/config", "/uploads", "/images", "/css", "/js"]
         
-        for directory in common_dirs:
-            test_url = urljoin(target, directory)
-            
-            try:
-                async with self.session.get(test_url, allow_redirects=False) as response:
-                    text = await response.text()
-                    
-                    # Look for directory listing indicators
-                    if any(indicator in text.lower() for indicator in ["index of", "parent directory", "[dir]"]):
-                        self.findings.append({
-                            "title": "Directory Listing Enabled",
-                            "description": f"Directory listing is enabled for {directory}",
-                            "severity": SeverityLevel.MEDIUM,
-                            "url": test_url,
-                            "owasp_category": "A05:2021-Security Misconfiguration",
-                            "cwe_id": "CWE-548",
-                            "remediation": "Disable directory listing in web server configuration",
-                            "references": ["https://owasp.org/www-community/vulnerabilities/Directory_Listing"]
-                        })
-            
-            except Exception as e:
-                logger.debug(f"Error checking directory listing: {str(e)}")
+        test_urls = [urljoin(target, directory) for directory in common_dirs]
+        # Look for directory listing indicators
+        listed = await asyncio.gather(*(
+            self._body_matches(test_url, DIRECTORY_LISTING_RE) for test_url in test_urls
+        ))
+        
+        for directory, test_url, is_listed in zip(common_dirs, test_urls, listed):
+            if is_listed:
+                self.findings.append({
+                    "title": "Directory Listing Enabled",
+                    "description": f"Directory listing is enabled for {directory}",
+                    "severity": SeverityLevel.MEDIUM,
+                    "url": test_url,
+                    "owasp_category": "A05:2021-Security Misconfiguration",
+                    "cwe_id": "CWE-548",
+                    "remediation": "Disable directory listing in web server configuration",
+                    "references": ["https://owasp.org/www-community/vulnerabilities/Directory_Listing"]
+                })
     
     async def _check_sensitive_files(self, target: str):
         """Check for exposed sensitive files"""
@@ -273,60 +460,58 @@ class WebScanner(BaseScannerPlugin):
             "/robots.txt",  # Not sensitive but informative
         ]
         
-        for file_path in sensitive_files:
-            test_url = urljoin(target, file_path)
-            
-            try:
-                async with self.session.get(test_url, allow_redirects=False) as response:
-                    if response.status == 200:
-                        severity = SeverityLevel.CRITICAL if file_path != "/robots.txt" else SeverityLevel.INFO
-                        
-                        self.findings.append({
-                            "title": f"Sensitive File Exposed: {file_path}",
-                            "description": f"Sensitive file is publicly accessible",
-                            "severity": severity,
-                            "url": test_url,
-                            "owasp_category": "A05:2021-Security Misconfiguration",
-                            "cwe_id": "CWE-538",
-                            "remediation": "Remove or restrict access to sensitive files",
-                            "references": ["https://owasp.org/www-project-web-security-testing-guide/"]
-                        })
-            
-            except Exception as e:
-                logger.debug(f"Error checking sensitive files: {str(e)}")
+        test_urls = [urljoin(target, file_path) for file_path in sensitive_files]
+        statuses = await asyncio.gather(*(
+            self._fetch_status(test_url) for test_url in test_urls
+        ))
+        
+        for file_path, test_url, status in zip(sensitive_files, test_urls, statuses):
+            if status in (200, 206):
+                severity = SeverityLevel.CRITICAL if file_path != "/robots.txt" else SeverityLevel.INFO
+                
+                self.findings.append({
+                    "title": f"Sensitive File Exposed: {file_path}",
+                    "description": f"Sensitive file is publicly accessible",
+                    "severity": severity,
+                    "url": test_url,
+                    "owasp_category": "A05:2021-Security Misconfiguration",
+                    "cwe_id": "CWE-538",
+                    "remediation": "Remove or restrict access to sensitive files",
+                    "references": ["https://owasp.org/www-project-web-security-testing-guide/"]
+                })
     
     async def _check_cors_misconfiguration(self, target: str):
         """Check for CORS misconfiguration"""
         try:
             headers = {"Origin": "https://evil.com"}
-            async with self.session.get(target, headers=headers) as response:
-                cors_header = response.headers.get("Access-Control-Allow-Origin", "")
-                
-                if cors_header == "*":
-                    self.findings.append({
-                        "title": "Overly Permissive CORS Policy",
-                        "description": "CORS policy allows any origin (*)",
-                        "severity": SeverityLevel.MEDIUM,
-                        "url": target,
-                        "evidence": f"Access-Control-Allow-Origin: {cors_header}",
-                        "owasp_category": "A05:2021-Security Misconfiguration",
-                        "cwe_id": "CWE-942",
-                        "remediation": "Restrict CORS to specific trusted origins",
-                        "references": ["https://owasp.org/www-community/attacks/CORS_OriginHeaderScrutiny"]
-                    })
-                
-                elif cors_header == "https://evil.com":
-                    self.findings.append({
-                        "title": "CORS Reflects Arbitrary Origins",
-                        "description": "CORS policy reflects the Origin header without validation",
-                        "severity": SeverityLevel.HIGH,
-                        "url": target,
-                        "evidence": f"Access-Control-Allow-Origin: {cors_header}",
-                        "owasp_category": "A05:2021-Security Misconfiguration",
-                        "cwe_id": "CWE-942",
-                        "remediation": "Implement proper origin validation for CORS",
-                        "references": ["https://owasp.org/www-community/attacks/CORS_OriginHeaderScrutiny"]
-                    })
+            _, response_headers, _ = await self._get(target, headers=headers)
+            cors_header = response_headers.get("Access-Control-Allow-Origin", "")
+            
+            if cors_header == "*":
+                self.findings.append({
+                    "title": "Overly Permissive CORS Policy",
+                    "description": "CORS policy allows any origin (*)",
+                    "severity": SeverityLevel.MEDIUM,
+                    "url": target,
+                    "evidence": f"Access-Control-Allow-Origin: {cors_header}",
+                    "owasp_category": "A05:2021-Security Misconfiguration",
+                    "cwe_id": "CWE-942",
+                    "remediation": "Restrict CORS to specific trusted origins",
+                    "references": ["https://owasp.org/www-community/attacks/CORS_OriginHeaderScrutiny"]
+                })
+            
+            elif cors_header == "https://evil.com":
+                self.findings.append({
+                    "title": "CORS Reflects Arbitrary Origins",
+                    "description": "CORS policy reflects the Origin header without validation",
+                    "severity": SeverityLevel.HIGH,
+                    "url": target,
+                    "evidence": f"Access-Control-Allow-Origin: {cors_header}",
+                    "owasp_category": "A05:2021-Security Misconfiguration",
+                    "cwe_id": "CWE-942",
+                    "remediation": "Implement proper origin validation for CORS",
+                    "references": ["https://owasp.org/www-community/attacks/CORS_OriginHeaderScrutiny"]
+                })
         
         except Exception as e:
             logger.debug(f"Error checking CORS: {str(e)}")
@@ -334,10 +519,12 @@ class WebScanner(BaseScannerPlugin):
     async def _crawl_and_test(self, target: str, max_depth: int = 2):
         """Crawl website and test discovered pages"""
         visited = set()
-        to_visit = [(target, 0)]
+        to_visit = deque([(target, 0)])
+        queued = {target}
+        target_netloc = urlsplit(target).netloc
         
         while to_visit and len(visited) < 50:  # Limit crawl
-            current_url, depth = to_visit.pop(0)
+            current_url, depth = to_visit.popleft()
             
             if current_url in visited or depth > max_depth:
                 continue
@@ -345,37 +532,25 @@ class WebScanner(BaseScannerPlugin):
             visited.add(current_url)
             
             try:
-                async with self.session.get(current_url) as response:
-                    if response.status == 200:
-                        text = await response.text()
-                        soup = BeautifulSoup(text, 'html.parser')
+                status, _, text = await self._get(current_url)
+                if status == 200:
+                    # Find all links
+                    for href in extract_links(text):
+                        absolute_url = urljoin(current_url, href)
+                        if absolute_url in queued:
+                            continue
                         
-                        # Find all links
-                        for link in soup.find_all('a', href=True):
-                            href = link['href']
-                            absolute_url = urljoin(current_url, href)
-                            
-                            # Only crawl same domain
-                            if urlparse(absolute_url).netloc == urlparse(target).netloc:
-                                to_visit.append((absolute_url, depth + 1))
+                        # Only crawl same domain; urlsplit memoizes its results
+                        if urlsplit(absolute_url).netloc == target_netloc:
+                            queued.add(absolute_url)
+                            to_visit.append((absolute_url, depth + 1))
             
             except Exception as e:
                 logger.debug(f"Error crawling {current_url}: {str(e)}")
     
     def _calculate_summary(self) -> Dict[str, Any]:
         """Calculate summary statistics"""
-        severity_counts = {
-            SeverityLevel.CRITICAL: 0,
-            SeverityLevel.HIGH: 0,
-            SeverityLevel.MEDIUM: 0,
-            SeverityLevel.LOW: 0,
-            SeverityLevel.INFO: 0,
-        }
-        
-        for finding in self.findings:
-            severity = finding.get("severity")
-            if severity in severity_counts:
-                severity_counts[severity] += 1
+        severity_counts = Counter(finding.get("severity") for finding in self.findings)
         
         # Calculate risk score (weighted by severity)
         risk_score = (
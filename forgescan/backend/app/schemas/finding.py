@@ -1,5 +1,5 @@
 # backend/app/schemas/finding.py
-from pydantic import BaseModel, UUID4
+from pydantic import BaseModel, UUID4, ConfigDict, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from app.core.constants import SeverityLevel
@@ -16,7 +16,7 @@ class FindingBase(BaseModel):
     owasp_category: Optional[str] = None
     evidence: Optional[str] = None
     remediation: Optional[str] = None
-    references: Optional[List[str]] = []
+    references: Optional[List[str]] = Field(default_factory=list)
 
 
 class FindingCreate(FindingBase):
@@ -37,8 +37,7 @@ class FindingInDB(FindingBase):
     false_positive: bool
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class Finding(FindingInDB):
@@ -1,5 +1,5 @@
 # backend/app/schemas/scan.py
-from pydantic import BaseModel, UUID4, HttpUrl
+from pydantic import BaseModel, UUID4, HttpUrl, ConfigDict, Field
 from typing import Optional, Dict, Any
 from datetime import datetime
 from app.core.constants import ScannerType, ScanStatus
@@ -8,7 +8,7 @@ from app.core.constants import ScannerType, ScanStatus
 class ScanBase(BaseModel):
     scanner_type: ScannerType
     target: str
-    options: Optional[Dict[str, Any]] = {}
+    options: Optional[Dict[str, Any]] = Field(default_factory=dict)
 
 
 class ScanCreate(ScanBase):
@@ -35,8 +35,7 @@ class ScanInDB(ScanBase):
     started_at: Optional[datetime]
     completed_at: Optional[datetime]
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class Scan(ScanInDB):
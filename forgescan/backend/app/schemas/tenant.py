@@ -1,5 +1,5 @@
 # backend/app/schemas/tenant.py
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, Dict, Any
 from datetime import datetime
 
@@ -26,8 +26,7 @@ class TenantInDB(TenantBase):
     is_active: bool
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class Tenant(TenantInDB):
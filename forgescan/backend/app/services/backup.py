@@ -4,10 +4,23 @@ Automated backup and disaster recovery system
 Implements 3-2-1 backup rule
 """
 
+import asyncio
+import functools
+import os
 import subprocess
 from datetime import datetime, timedelta
 import boto3
-import logging
+from celery.schedules import crontab
+
+from app.core.logging import logger
+from app.workers.celery_app import celery_app
+
+# Uploads land here first and are copied under database_backups/ only once
+# pg_dump and gpg have both exited cleanly, so a truncated dump is never
+# listed as a backup. Staging objects are deleted within minutes, so they
+# stay in STANDARD; only the final copy goes to STANDARD_IA, which bills a
+# 30-day minimum.
+BACKUP_STAGING_PREFIX = 'incomplete_backups/'
 
 class BackupService:
     """Automated backup system"""
@@ -16,52 +29,104 @@ class BackupService:
         self.s3 = boto3.client('s3')
         self.backup_bucket = os.environ['BACKUP_S3_BUCKET']
     
+    async def _run(self, *args: str) -> None:
+        """Run a command without blocking the event loop; raise on failure"""
+        proc = await asyncio.create_subprocess_exec(*args, stderr=asyncio.subprocess.PIPE)
+        _, stderr = await proc.communicate()
+        if proc.returncode:
+            raise subprocess.CalledProcessError(proc.returncode, args, stderr=stderr)
+    
+    async def _s3_call(self, method: str, *args, **kwargs):
+        """Call a blocking boto3 S3 client method in the default executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(getattr(self.s3, method), *args, **kwargs)
+        )
+    
     async def backup_database(self):
-        """Create encrypted database backup"""
+        """
+        Create encrypted database backup.
+        
+        pg_dump is piped through gpg straight into an S3 upload, so the dump
+        is never written to local disk. The upload goes to a staging key and
+        is copied into place only after both processes exit 0.
+        """
         
         timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
-        backup_file = f"/tmp/forgescan_backup_{timestamp}.sql.gz"
+        s3_key = f"database_backups/{timestamp}/backup.sql.gz.encrypted"
+        staging_key = f"{BACKUP_STAGING_PREFIX}{s3_key}"
         
-        # Dump database
-        subprocess.run([
+        # Dump database (pg_dump stdout -> gpg stdin)
+        dump_read, dump_write = os.pipe()
+        dump = await asyncio.create_subprocess_exec(
             'pg_dump',
             '-h', os.environ['DB_HOST'],
             '-U', os.environ['DB_USER'],
             '-d', os.environ['DB_NAME'],
             '-F', 'c',  # Custom format (compressed)
-            '-f', backup_file
-        ], check=True)
+            stdout=dump_write
+        )
+        os.close(dump_write)
         
-        # Encrypt backup
-        encrypted_file = await self._encrypt_file(backup_file)
+        # Encrypt backup (gpg stdout -> S3 upload)
+        encrypted_read, encrypted_write = os.pipe()
+        encrypt = await asyncio.create_subprocess_exec(
+            'gpg',
+            '--symmetric',
+            '--cipher-algo', 'AES256',
+            '--passphrase', os.environ['BACKUP_ENCRYPTION_KEY'],
+            '--batch', '--yes',
+            stdin=dump_read,
+            stdout=encrypted_write
+        )
+        os.close(dump_read)
+        os.close(encrypted_write)
         
-        # Upload to S3
-        s3_key = f"database_backups/{timestamp}/backup.sql.gz.encrypted"
+        extra_args = {'ServerSideEncryption': 'AES256'}
         
-        self.s3.upload_file(
-            encrypted_file,
-            self.backup_bucket,
-            s3_key,
-            ExtraArgs={
-                'ServerSideEncryption': 'AES256',
-                'StorageClass': 'STANDARD_IA'  # Infrequent access
-            }
-        )
+        try:
+            # Upload to S3; closing the read end on failure stops the pipeline
+            with open(encrypted_read, 'rb') as encrypted_stream:
+                await self._s3_call(
+                    'upload_fileobj',
+                    encrypted_stream,
+                    self.backup_bucket,
+                    staging_key,
+                    ExtraArgs=extra_args
+                )
+            
+            for proc, command in ((dump, 'pg_dump'), (encrypt, 'gpg')):
+                if await proc.wait():
+                    raise subprocess.CalledProcessError(proc.returncode, command)
+            
+            # Managed copy: multipart for dumps over the 5 GB CopyObject limit
+            await self._s3_call(
+                'copy',
+                {'Bucket': self.backup_bucket, 'Key': staging_key},
+                self.backup_bucket,
+                s3_key,
+                ExtraArgs={**extra_args, 'StorageClass': 'STANDARD_IA'}  # Infrequent access
+            )
+        except BaseException:
+            for proc in (dump, encrypt):
+                if proc.returncode is None:
+                    proc.kill()
+                await proc.wait()
+            raise
+        finally:
+            await self._s3_call('delete_object', Bucket=self.backup_bucket, Key=staging_key)
         
         # Also backup to secondary location (3-2-1 rule)
-        await self._backup_to_secondary_location(encrypted_file)
+        await self._backup_to_secondary_location(s3_key)
         
         # Record backup
+        uploaded = await self._s3_call('head_object', Bucket=self.backup_bucket, Key=s3_key)
         await self._record_backup(
             backup_type='database',
             s3_key=s3_key,
-            size_bytes=os.path.getsize(encrypted_file)
+            size_bytes=uploaded['ContentLength']
         )
         
-        # Cleanup local files
-        os.remove(backup_file)
-        os.remove(encrypted_file)
-        
         logger.info(f"Database backup completed: {s3_key}")
     
     async def backup_file_storage(self):
@@ -70,12 +135,12 @@ class BackupService:
         timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
         
         # Tar and compress files
-        subprocess.run([
+        await self._run(
             'tar',
             '-czf',
             f'/tmp/files_backup_{timestamp}.tar.gz',
             '/app/uploads'
-        ], check=True)
+        )
         
         # Encrypt and upload
         # Similar to database backup...
@@ -86,7 +151,8 @@ class BackupService:
         # Download from S3
         backup_file = f"/tmp/restore_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.sql.gz.encrypted"
         
-        self.s3.download_file(
+        await self._s3_call(
+            'download_file',
             self.backup_bucket,
             backup_key,
             backup_file
@@ -96,14 +162,14 @@ class BackupService:
         decrypted_file = await self._decrypt_file(backup_file)
         
         # Restore to database
-        subprocess.run([
+        await self._run(
             'pg_restore',
             '-h', os.environ['DB_HOST'],
             '-U', os.environ['DB_USER'],
             '-d', os.environ['DB_NAME'],
             '-c',  # Clean (drop) database objects before recreating
             decrypted_file
-        ], check=True)
+        )
         
         logger.info(f"Database restored from: {backup_key}")
     
@@ -113,26 +179,48 @@ class BackupService:
         retention_days = 90
         cutoff_date = datetime.utcnow() - timedelta(days=retention_days)
         
-        # List old backups
-        response = self.s3.list_objects_v2(
-            Bucket=self.backup_bucket,
-            Prefix='database_backups/'
+        # List old backups across every page, not just the first 1000 keys
+        loop = asyncio.get_running_loop()
+        old_keys = await loop.run_in_executor(
+            None, functools.partial(self._list_backups_before, 'database_backups/', cutoff_date)
         )
         
-        for obj in response.get('Contents', []):
-            if obj['LastModified'].replace(tzinfo=None) < cutoff_date:
-                self.s3.delete_object(
-                    Bucket=self.backup_bucket,
-                    Key=obj['Key']
-                )
-                logger.info(f"Deleted old backup: {obj['Key']}")
+        # delete_objects accepts up to 1000 keys per request
+        for start in range(0, len(old_keys), 1000):
+            batch = old_keys[start:start + 1000]
+            response = await self._s3_call(
+                'delete_objects',
+                Bucket=self.backup_bucket,
+                Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True}
+            )
+            
+            # Quiet mode lists only the keys that failed, under a 200
+            errors = {error['Key']: error for error in response.get('Errors', [])}
+            for key in batch:
+                if key in errors:
+                    logger.error(
+                        f"Failed to delete old backup {key}: "
+                        f"{errors[key].get('Code')} {errors[key].get('Message')}"
+                    )
+                else:
+                    logger.info(f"Deleted old backup: {key}")
+    
+    def _list_backups_before(self, prefix: str, cutoff_date: datetime) -> list:
+        """Keys under prefix last modified before cutoff_date (blocking)"""
+        paginator = self.s3.get_paginator('list_objects_v2')
+        return [
+            obj['Key']
+            for page in paginator.paginate(Bucket=self.backup_bucket, Prefix=prefix)
+            for obj in page.get('Contents', [])
+            if obj['LastModified'].replace(tzinfo=None) < cutoff_date
+        ]
     
     async def _encrypt_file(self, filepath: str) -> str:
         """Encrypt file using GPG"""
         
         encrypted_file = f"{filepath}.encrypted"
         
-        subprocess.run([
+        await self._run(
             'gpg',
             '--symmetric',
             '--cipher-algo', 'AES256',
@@ -140,7 +228,7 @@ class BackupService:
             '--batch', '--yes',
             '--output', encrypted_file,
             filepath
-        ], check=True)
+        )
         
         return encrypted_file
     
@@ -148,7 +236,8 @@ class BackupService:
         """Regularly test backup restoration"""
         
         # Get most recent backup
-        response = self.s3.list_objects_v2(
+        response = await self._s3_call(
+            'list_objects_v2',
             Bucket=self.backup_bucket,
             Prefix='database_backups/',
             MaxKeys=1
@@ -175,12 +264,11 @@ async def scheduled_backup():
     
     backup_service = BackupService()
     
-    # Daily database backup
-    await backup_service.backup_database()
-    
-    # Weekly file backup
+    # Daily database backup, alongside the weekly file backup
+    backups = [backup_service.backup_database()]
     if datetime.utcnow().weekday() == 0:  # Monday
-        await backup_service.backup_file_storage()
+        backups.append(backup_service.backup_file_storage())
+    await asyncio.gather(*backups)
     
     # Monthly backup test
     if datetime.utcnow().day == 1:
@@ -4,6 +4,14 @@ Disaster Recovery and Business Continuity
 RTO: 4 hours, RPO: 1 hour
 """
 
+import asyncio
+from datetime import datetime
+from typing import Any, Dict
+
+from app.core.logging import logger
+from app.services.backup import BackupService
+
+
 class DisasterRecoveryService:
     """Disaster recovery orchestration"""
     
@@ -51,14 +59,19 @@ class DisasterRecoveryService:
         
         logger.info("Starting DR plan test...")
         
-        # Test backup restoration
-        backup_test = await BackupService().test_backup_restoration()
-        
-        # Test failover process (in isolated environment)
-        failover_test = await self._test_failover_procedure()
-        
-        # Test data replication lag
-        replication_test = await self._test_replication_lag()
+        # The drills are independent, so run them concurrently: backup
+        # restoration, failover (in isolated environment) and replication
+        # lag. A failing drill is reported without cancelling the others.
+        results = await asyncio.gather(
+            BackupService().test_backup_restoration(),
+            self._test_failover_procedure(),
+            self._test_replication_lag(),
+            return_exceptions=True
+        )
+        backup_test, failover_test, replication_test = (
+            {"status": "failed", "error": str(result)} if isinstance(result, Exception) else result
+            for result in results
+        )
         
         # Generate DR test report
         report = {
@@ -66,8 +79,18 @@ class DisasterRecoveryService:
             "backup_restoration": backup_test,
             "failover_procedure": failover_test,
             "replication_lag": replication_test,
-            "rto_achieved": failover_test['duration'] < 14400,  # 4 hours
-            "rpo_achieved": replication_test['lag'] < 3600  # 1 hour
+            "rto_achieved": failover_test.get('duration', float('inf')) < 14400,  # 4 hours
+            "rpo_achieved": replication_test.get('lag', float('inf')) < 3600  # 1 hour
         }
         
         return report
+    
+    async def _test_failover_procedure(self) -> Dict[str, Any]:
+        """Fail over an isolated environment and time it; returns status and duration in seconds"""
+        # TODO: Implement against the isolated DR environment
+        raise NotImplementedError("Failover drill is not implemented")
+    
+    async def _test_replication_lag(self) -> Dict[str, Any]:
+        """Measure replica lag behind the primary; returns status and lag in seconds"""
+        # TODO: Implement against the secondary region's replica
+        raise NotImplementedError("Replication lag drill is not implemented")
@@ -5,7 +5,69 @@ Prevents sensitive data from leaving the system
 """
 
 import re
-from typing import List, Dict, Tuple
+import string
+from typing import AbstractSet, Any, Iterator, List, Dict, Tuple, Union
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+from app.core.logging import logger
+
+
+# Bytes of already-scanned response body carried into the next chunk's
+# scan; longer than any bounded DLP match. The tail can reach back as far
+# again to start on a token boundary.
+DLP_SCAN_OVERLAP_BYTES = 512
+
+# Bytes a DLP match can run through, word characters included. A carried
+# tail starts where a run of these does, so no match starts mid-token.
+DLP_TOKEN_BYTES = frozenset((string.ascii_letters + string.digits + "_.%+@-").encode())
+
+# Responses the middleware passes through unscanned: probe endpoints, empty
+# statuses, and bodies shorter than the shortest possible DLP match
+# ("a@b.cc"). Routes can also opt out by setting the X-DLP-Skip response
+# header, which is removed before the response goes out.
+DLP_SKIP_PATHS = frozenset({"/health", "/readiness", "/metrics"})
+DLP_SKIP_STATUS_CODES = frozenset({204, 304})
+DLP_MIN_SCAN_BYTES = 6
+
+
+def combine_patterns(patterns: Dict[str, re.Pattern], first: AbstractSet[str]) -> re.Pattern:
+    """Join patterns into one alternation of named groups, trying `first` types earliest"""
+    ordered = sorted(patterns.items(), key=lambda item: item[0] not in first)
+    if ordered and isinstance(ordered[0][1].pattern, bytes):
+        return re.compile(b'|'.join(b'(?P<%s>%s)' % (name.encode(), pattern.pattern) for name, pattern in ordered))
+    return re.compile('|'.join(f'(?P<{name}>{pattern.pattern})' for name, pattern in ordered))
+
+
+def redaction_for(match: re.Match) -> str:
+    """Replacement text for a match of a combined pattern"""
+    return f'[REDACTED_{match.lastgroup.upper()}]'
+
+
+# Export fields whose values are generated identifiers or timestamps and are
+# never scanned
+SAFE_EXPORT_KEYS = frozenset({'id', 'created_at', 'updated_at', 'timestamp'})
+
+
+def iter_export_strings(data: Any, skip_keys: AbstractSet[str] = SAFE_EXPORT_KEYS) -> Iterator[str]:
+    """Yield the keys and scalar leaves of exported data as strings"""
+    stack = [data]
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, str):
+            yield obj
+        elif isinstance(obj, dict):
+            for key, value in obj.items():
+                yield str(key)
+                if key not in skip_keys:
+                    stack.append(value)
+        elif isinstance(obj, (list, tuple)):
+            stack.extend(reversed(obj))
+        elif isinstance(obj, int) and not isinstance(obj, bool):
+            # Card numbers and the like can be exported as plain integers
+            yield str(obj)
+
 
 class DLPService:
     """Detect and prevent data leaks"""
@@ -14,54 +76,135 @@ class DLPService:
     PATTERNS = {
         'credit_card': re.compile(r'\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b'),
         'ssn': re.compile(r'\b\d{3}-\d{2}-\d{4}\b'),
-        'api_key': re.compile(r'\b[A-Za-z0-9_-]{32,}\b'),
-        'private_key': re.compile(r'-----BEGIN (RSA |)PRIVATE KEY-----'),
+        'api_key': re.compile(r'\b[A-Za-z0-9_-]{32,512}\b'),
+        'private_key': re.compile(r'-----BEGIN (?:RSA |)PRIVATE KEY-----'),
         'aws_key': re.compile(r'AKIA[0-9A-Z]{16}'),
         'email': re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
         'ip_address': re.compile(r'\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b'),
     }
     
-    async def scan_content(self, content: str) -> List[Dict]:
-        """Scan content for sensitive data"""
+    HIGH_SEVERITY_TYPES = frozenset({'credit_card', 'ssn', 'private_key', 'aws_key'})
+    SEVERITY_BY_TYPE = dict.fromkeys(PATTERNS, 'medium') | dict.fromkeys(HIGH_SEVERITY_TYPES, 'critical')
+    
+    # Types scanned together in one alternation, where match.lastgroup names
+    # the type. An alternation reports one match per position, so types whose
+    # matches can overlap (an AWS key inside a longer token, a card number in
+    # an email's local part or starting inside an SSN) must not share a pass.
+    # The other high-severity types never overlap one another and share the
+    # first pass; credit_card and the rest run alone, critical types first.
+    SCAN_PASSES = (
+        HIGH_SEVERITY_TYPES - {'credit_card'},
+        frozenset({'credit_card'}),
+        frozenset({'api_key'}),
+        frozenset({'email'}),
+        frozenset({'ip_address'}),
+    )
+    
+    # Literals that must occur in content for a type to be able to match;
+    # types without gates always run
+    LITERAL_GATES = {
+        'private_key': ('-----BEGIN',),
+        'aws_key': ('AKIA',),
+        'email': ('@',),
+        'ssn': ('-',),
+        'ip_address': ('.',),
+    }
+    DIGIT_GATED_TYPES = frozenset({'credit_card', 'ssn', 'ip_address'})
+    DIGIT_RE = re.compile(r'\d')
+    # api_key only runs when content has a run of key characters long enough
+    API_KEY_GATE_RE = re.compile(r'[A-Za-z0-9_-]{32}')
+    
+    # The same patterns and gates for scanning raw bytes, such as response
+    # bodies, without decoding them first. Every pattern is ASCII-only, so
+    # they match the same data in UTF-8 bytes as in text.
+    BYTES_PATTERNS = {data_type: re.compile(pattern.pattern.encode()) for data_type, pattern in PATTERNS.items()}
+    BYTES_LITERAL_GATES = {
+        data_type: tuple(literal.encode() for literal in literals)
+        for data_type, literals in LITERAL_GATES.items()
+    }
+    DIGIT_BYTES_RE = re.compile(DIGIT_RE.pattern.encode())
+    API_KEY_GATE_BYTES_RE = re.compile(API_KEY_GATE_RE.pattern.encode())
+    
+    # Combined patterns for each gated subset of a pass's types, and whether
+    # they are the bytes patterns, built on first use
+    _combined_by_types: Dict[Tuple[frozenset, bool], re.Pattern] = {}
+    
+    def _patterns_for(self, content: Union[str, bytes]) -> List[re.Pattern]:
+        """Combined pattern for each scan pass with types whose gates content passes"""
+        is_bytes = isinstance(content, bytes)
+        if is_bytes:
+            patterns, literal_gates = self.BYTES_PATTERNS, self.BYTES_LITERAL_GATES
+            digit_re, key_run_re = self.DIGIT_BYTES_RE, self.API_KEY_GATE_BYTES_RE
+        else:
+            patterns, literal_gates = self.PATTERNS, self.LITERAL_GATES
+            digit_re, key_run_re = self.DIGIT_RE, self.API_KEY_GATE_RE
         
-        findings = []
+        has_digit = digit_re.search(content) is not None
+        has_key_run = key_run_re.search(content) is not None
+        active = frozenset(
+            data_type for data_type in patterns
+            if (has_digit or data_type not in self.DIGIT_GATED_TYPES)
+            and (has_key_run or data_type != 'api_key')
+            and all(literal in content for literal in literal_gates.get(data_type, ()))
+        )
         
-        for data_type, pattern in self.PATTERNS.items():
-            matches = pattern.finditer(content)
-            
-            for match in matches:
-                findings.append({
+        pass_patterns = []
+        for pass_types in self.SCAN_PASSES:
+            types = pass_types & active
+            if not types:
+                continue
+            pattern = self._combined_by_types.get((types, is_bytes))
+            if pattern is None:
+                pattern = self._combined_by_types[(types, is_bytes)] = combine_patterns(
+                    {data_type: compiled for data_type, compiled in patterns.items() if data_type in types},
+                    first=self.HIGH_SEVERITY_TYPES
+                )
+            pass_patterns.append(pattern)
+        return pass_patterns
+    
+    def iter_findings(self, content: Union[str, bytes]) -> Iterator[Dict]:
+        """
+        Yield findings in text or UTF-8 bytes as they are matched; positions
+        index into content. Critical findings come first.
+        """
+        
+        severity_by_type = self.SEVERITY_BY_TYPE
+        for pattern in self._patterns_for(content):
+            for match in pattern.finditer(content):
+                data_type = match.lastgroup
+                yield {
                     "type": data_type,
-                    "value": match.group(),
+                    "value": match.group() if isinstance(content, str) else match.group().decode(),
                     "position": match.span(),
-                    "severity": self._get_severity(data_type)
-                })
+                    "severity": severity_by_type[data_type]
+                }
+    
+    async def scan_content(self, content: Union[str, bytes]) -> List[Dict]:
+        """Scan text or UTF-8 bytes for sensitive data; positions index into content"""
         
-        return findings
+        return list(self.iter_findings(content))
     
-    async def sanitize_logs(self, log_message: str) -> str:
+    def sanitize_logs(self, log_message: str) -> str:
         """Remove sensitive data from logs"""
         
-        sanitized = log_message
-        
-        for data_type, pattern in self.PATTERNS.items():
-            sanitized = pattern.sub(f'[REDACTED_{data_type.upper()}]', sanitized)
-        
-        return sanitized
+        # Synchronous: it does no I/O and runs for every log line
+        for pattern in self._patterns_for(log_message):
+            log_message = pattern.sub(redaction_for, log_message)
+        return log_message
     
     async def check_export(self, data: Dict) -> Tuple[bool, List[str]]:
         """Check if data export contains sensitive information"""
         
         violations = []
-        content = json.dumps(data)
         
-        findings = await self.scan_content(content)
-        
-        for finding in findings:
-            if finding['severity'] in ['high', 'critical']:
-                violations.append(
-                    f"Attempted export of {finding['type']}: {finding['value'][:10]}..."
-                )
+        # Scan each string leaf on its own instead of serialising the
+        # whole export, so numeric sections and safe fields are never scanned
+        for content in iter_export_strings(data):
+            for finding in await self.scan_content(content):
+                if finding['severity'] in ['high', 'critical']:
+                    violations.append(
+                        f"Attempted export of {finding['type']}: {finding['value'][:10]}..."
+                    )
         
         if violations:
             # Log security incident
@@ -73,40 +216,100 @@ class DLPService:
     def _get_severity(self, data_type: str) -> str:
         """Determine severity of data type"""
         
-        high_severity = ['credit_card', 'ssn', 'private_key', 'aws_key']
-        
-        return 'critical' if data_type in high_severity else 'medium'
+        return self.SEVERITY_BY_TYPE.get(data_type, 'medium')
 
-# Middleware to prevent sensitive data in responses
-@app.middleware("http")
+
+def token_start(content: bytes, end: int, floor: int = 0) -> int:
+    """Start of the run of DLP_TOKEN_BYTES ending at end, looking back no further than floor"""
+    start = end
+    while start > floor and content[start - 1] in DLP_TOKEN_BYTES:
+        start -= 1
+    return start
+
+
+# Shared instance; DLPService holds no per-request state
+dlp_service = DLPService()
+
+# Middleware to prevent sensitive data in responses; install it with
+# app.middleware("http")(dlp_middleware)
 async def dlp_middleware(request: Request, call_next):
     """Scan responses for sensitive data"""
     
     response = await call_next(request)
     
+    if response.headers.get("x-dlp-skip") == "1":
+        del response.headers["x-dlp-skip"]
+        return response
+    
+    if (
+        request.url.path in DLP_SKIP_PATHS
+        or response.status_code in DLP_SKIP_STATUS_CODES
+        or int(response.headers.get("content-length", DLP_MIN_SCAN_BYTES)) < DLP_MIN_SCAN_BYTES
+    ):
+        return response
+    
     # Only scan text responses
     if response.headers.get("content-type", "").startswith("application/json"):
-        body = b""
-        async for chunk in response.body_iterator:
-            body += chunk
-        
-        content = body.decode()
+        # Scan each chunk's bytes as they arrive, together with the tail of
+        # the body before them so matches spanning chunks are still found
+        chunks = []
+        findings = []
+        blocked = False
+        tail = b""
+        body_size = 0
+        # Body offset before which every match has been reported
+        settled = 0
+        body_iterator = response.body_iterator.__aiter__()
         
-        # Scan for sensitive data
-        dlp = DLPService()
-        findings = await dlp.scan_content(content)
+        while True:
+            chunk = await anext(body_iterator, None)
+            final = chunk is None
+            if not final:
+                chunks.append(chunk)
+            window = tail + (chunk or b"")
+            window_start = body_size - len(tail)
+            body_size += len(chunk or b"")
+            
+            # Scan for sensitive data. A match ending in the run of token
+            # bytes at the end of the window may still grow or change with
+            # the next chunk, so it is left for then; it is reported with the
+            # next window even if that chunk does not extend it.
+            open_from = len(window) if final else token_start(window, len(window))
+            next_start = max(len(window) - DLP_SCAN_OVERLAP_BYTES, 0)
+            for finding in dlp_service.iter_findings(window):
+                start, end = finding["position"]
+                if end < settled - window_start:
+                    continue  # Reported with an earlier chunk
+                if end >= open_from and not final:
+                    next_start = min(next_start, start)
+                    continue
+                finding["position"] = (window_start + start, window_start + end)
+                findings.append(finding)
+                
+                # Block as soon as a critical finding appears
+                if finding['severity'] == 'critical':
+                    blocked = True
+                    break
+            
+            if final or blocked:
+                break
+            
+            # Start the tail on a token boundary so it sees the same word
+            # boundaries as the whole body
+            settled = window_start + open_from
+            tail = window[token_start(window, next_start, max(next_start - DLP_SCAN_OVERLAP_BYTES, 0)):]
         
         if findings:
             # Log incident
             logger.warning(f"DLP: Sensitive data detected in response: {findings}")
             
             # Optionally block response
-            if any(f['severity'] == 'critical' for f in findings):
+            if blocked:
                 return JSONResponse(
                     status_code=451,
                     content={"error": "Response blocked by DLP policy"}
                 )
         
-        return Response(content=body, headers=dict(response.headers))
+        return Response(content=b"".join(chunks), headers=dict(response.headers))
     
     return response
\ No newline at end of file
@@ -1,5 +1,9 @@
 # backend/app/services/email_service.py
+import asyncio
+import functools
+import re
 from typing import List, Dict, Any
+from email.charset import Charset, QP
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import aiosmtplib
@@ -9,6 +13,133 @@ from app.core.config import settings
 from app.core.logging import logger
 
 
+# Messages sent over one SMTP connection before it is replaced
+SMTP_MAX_MESSAGES_PER_CONNECTION = 100
+
+# HTML bodies are mostly ASCII, which quoted-printable leaves as is where
+# the default base64 would grow every byte by a third
+HTML_CHARSET = Charset('utf-8')
+HTML_CHARSET.body_encoding = QP
+
+CSS_WHITESPACE_RE = re.compile(r'\s*([{};:,])\s*|\s+')
+
+
+def email_head(css: str) -> str:
+    """Static document head for an email, with its stylesheet minified"""
+    css = CSS_WHITESPACE_RE.sub(lambda match: match.group(1) or ' ', css).strip()
+    return f'<!DOCTYPE html><html><head><style>{css}</style></head>'
+
+
+# Heads are built once; only the body templates are rendered per email,
+# and the templates are parsed once at import rather than per email
+WELCOME_EMAIL_HEAD = email_head("""
+body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+.container { max-width: 600px; margin: 0 auto; padding: 20px; }
+.header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
+          color: white; padding: 30px; text-align: center; border-radius: 8px 8px 0 0; }
+.content { background: #f9f9f9; padding: 30px; border-radius: 0 0 8px 8px; }
+.button { display: inline-block; padding: 12px 24px; background: #667eea; 
+         color: white; text-decoration: none; border-radius: 4px; margin: 20px 0; }
+.footer { text-align: center; padding: 20px; color: #666; font-size: 12px; }
+""")
+WELCOME_EMAIL_TEMPLATE = Template("""<body>
+    <div class="container">
+        <div class="header">
+            <h1>Welcome to ForgeScan!</h1>
+        </div>
+        <div class="content">
+            <h2>Hi {{ name }},</h2>
+            <p>Thank you for signing up! We're excited to help you secure your applications.</p>
+            
+            <h3>Get Started:</h3>
+            <ol>
+                <li>Run your first security scan</li>
+                <li>Review the findings</li>
+                <li>Follow remediation steps</li>
+            </ol>
+            
+            <a href="{{ dashboard_url }}" class="button">Go to Dashboard</a>
+            
+            <h3>Resources:</h3>
+            <ul>
+                <li><a href="{{ docs_url }}">Documentation</a></li>
+                <li><a href="{{ api_docs_url }}">API Reference</a></li>
+                <li><a href="{{ support_url }}">Support</a></li>
+            </ul>
+            
+            <p>If you have any questions, just reply to this email!</p>
+            
+            <p>Happy scanning!<br>The ForgeScan Team</p>
+        </div>
+        <div class="footer">
+            <p>© 2025 ForgeScan. All rights reserved.</p>
+            <p><a href="{{ unsubscribe_url }}">Unsubscribe</a></p>
+        </div>
+    </div>
+</body>
+</html>
+""")
+
+SCAN_COMPLETE_EMAIL_HEAD = email_head("""
+body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+.container { max-width: 600px; margin: 0 auto; padding: 20px; }
+.header { background: #667eea; color: white; padding: 20px; text-align: center; }
+.content { background: #f9f9f9; padding: 30px; }
+.findings { display: flex; gap: 10px; justify-content: space-around; margin: 20px 0; }
+.finding-box { text-align: center; padding: 15px; border-radius: 8px; }
+.critical { background: #ffebee; color: #c62828; }
+.high { background: #fff3e0; color: #e65100; }
+.medium { background: #e3f2fd; color: #1565c0; }
+.low { background: #e8f5e9; color: #2e7d32; }
+.button { display: inline-block; padding: 12px 24px; background: #667eea; 
+         color: white; text-decoration: none; border-radius: 4px; margin: 20px 0; }
+""")
+SCAN_COMPLETE_EMAIL_TEMPLATE = Template("""<body>
+    <div class="container">
+        <div class="header">
+            <h1>Security Scan Complete</h1>
+        </div>
+        <div class="content">
+            <h2>{{ target }}</h2>
+            <p>Your security scan has completed. Here's what we found:</p>
+            
+            <div class="findings">
+                <div class="finding-box critical">
+                    <h3>{{ critical_count }}</h3>
+                    <p>Critical</p>
+                </div>
+                <div class="finding-box high">
+                    <h3>{{ high_count }}</h3>
+                    <p>High</p>
+                </div>
+                <div class="finding-box medium">
+                    <h3>{{ medium_count }}</h3>
+                    <p>Medium</p>
+                </div>
+                <div class="finding-box low">
+                    <h3>{{ low_count }}</h3>
+                    <p>Low</p>
+                </div>
+            </div>
+            
+            {% if critical_count > 0 %}
+            <p style="color: #c62828; font-weight: bold;">
+                ⚠️ {{ critical_count }} critical issue(s) require immediate attention!
+            </p>
+            {% endif %}
+            
+            <a href="{{ scan_url }}" class="button">View Full Report</a>
+            
+            <p style="margin-top: 30px;">
+                <small>Risk Score: {{ risk_score }}/100</small>
+            </p>
+        </div>
+    </div>
+</body>
+</html>
+""")
+
+
 class EmailService:
     """Service for sending emails"""
     
@@ -18,6 +149,82 @@ class EmailService:
         self.smtp_user = settings.SMTP_USER
         self.smtp_password = settings.SMTP_PASSWORD
         self.from_email = settings.FROM_EMAIL
+        
+        # Connection reused across sends on the same event loop
+        self._smtp = None
+        self._smtp_loop = None
+        self._smtp_lock = asyncio.Lock()
+        self._smtp_sent = 0
+    
+    async def _connect(self) -> aiosmtplib.SMTP:
+        """Open an SMTP connection, with STARTTLS and login"""
+        smtp = aiosmtplib.SMTP(
+            hostname=self.smtp_host,
+            port=self.smtp_port,
+            username=self.smtp_user,
+            password=self.smtp_password,
+            start_tls=True,
+        )
+        await smtp.connect()
+        self._smtp_sent = 0
+        return smtp
+    
+    async def _send_message(self, message: MIMEMultipart):
+        """Send a message over the shared connection, reconnecting if needed"""
+        # Connections and locks belong to one event loop, and callers such
+        # as Celery tasks run each job in a new one
+        loop = asyncio.get_running_loop()
+        if self._smtp_loop is not loop:
+            self._smtp = None
+            self._smtp_loop = loop
+            self._smtp_lock = asyncio.Lock()
+        
+        async with self._smtp_lock:
+            if self._smtp is not None and self._smtp_sent >= SMTP_MAX_MESSAGES_PER_CONNECTION:
+                await self._close_connection()
+            
+            if self._smtp is None or not self._smtp.is_connected:
+                self._smtp = await self._connect()
+            
+            try:
+                await self._smtp.send_message(message)
+            except aiosmtplib.SMTPServerDisconnected:
+                self._smtp = await self._connect()
+                await self._smtp.send_message(message)
+            
+            self._smtp_sent += 1
+    
+    async def _close_connection(self):
+        smtp, self._smtp = self._smtp, None
+        try:
+            await smtp.quit()
+        except aiosmtplib.SMTPException:
+            smtp.close()
+    
+    async def close(self):
+        """Close the shared SMTP connection"""
+        if self._smtp is not None and self._smtp_loop is asyncio.get_running_loop():
+            async with self._smtp_lock:
+                if self._smtp is not None:
+                    await self._close_connection()
+    
+    def _build_message(
+        self,
+        to: List[str],
+        subject: str,
+        html_content: str,
+        text_content: str = None
+    ) -> MIMEMultipart:
+        message = MIMEMultipart('alternative')
+        message['Subject'] = subject
+        message['From'] = self.from_email
+        message['To'] = ', '.join(to)
+        
+        if text_content:
+            message.attach(MIMEText(text_content, 'plain'))
+        
+        message.attach(MIMEText(html_content, 'html', HTML_CHARSET))
+        return message
     
     async def send_email(
         self,
@@ -32,89 +239,51 @@ class EmailService:
             return
         
         try:
-            message = MIMEMultipart('alternative')
-            message['Subject'] = subject
-            message['From'] = self.from_email
-            message['To'] = ', '.join(to)
-            
-            if text_content:
-                message.attach(MIMEText(text_content, 'plain'))
-            
-            message.attach(MIMEText(html_content, 'html'))
-            
-            await aiosmtplib.send(
-                message,
-                hostname=self.smtp_host,
-                port=self.smtp_port,
-                username=self.smtp_user,
-                password=self.smtp_password,
-                start_tls=True,
-            )
+            message = self._build_message(to, subject, html_content, text_content)
+            await self._send_message(message)
             
             logger.info(f"Email sent to {to}: {subject}")
             
         except Exception as e:
             logger.error(f"Failed to send email: {str(e)}")
     
+    async def send_bulk(
+        self,
+        recipients: List[str],
+        subject: str,
+        html_content: str,
+        text_content: str = None
+    ):
+        """Send the same email to each recipient separately over one connection"""
+        if not self.smtp_host:
+            logger.warning("SMTP not configured, skipping email")
+            return
+        
+        # Build the MIME parts once; only the To header changes per recipient
+        message = self._build_message([], subject, html_content, text_content)
+        sent = 0
+        
+        for recipient in recipients:
+            message.replace_header('To', recipient)
+            try:
+                await self._send_message(message)
+                sent += 1
+            except Exception as e:
+                logger.error(f"Failed to send email to {recipient}: {str(e)}")
+        
+        logger.info(f"Email sent to {sent}/{len(recipients)} recipients: {subject}")
+    
+    async def _render(self, template: Template, **context) -> str:
+        """Render a template in the default executor, off the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(template.render, **context))
+    
     async def send_welcome_email(self, email: str, name: str):
         """Send welcome email to new users"""
         subject = "Welcome to ForgeScan!"
         
-        html_template = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
-                .container { max-width: 600px; margin: 0 auto; padding: 20px; }
-                .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                          color: white; padding: 30px; text-align: center; border-radius: 8px 8px 0 0; }
-                .content { background: #f9f9f9; padding: 30px; border-radius: 0 0 8px 8px; }
-                .button { display: inline-block; padding: 12px 24px; background: #667eea; 
-                         color: white; text-decoration: none; border-radius: 4px; margin: 20px 0; }
-                .footer { text-align: center; padding: 20px; color: #666; font-size: 12px; }
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>Welcome to ForgeScan!</h1>
-                </div>
-                <div class="content">
-                    <h2>Hi {{ name }},</h2>
-                    <p>Thank you for signing up! We're excited to help you secure your applications.</p>
-                    
-                    <h3>Get Started:</h3>
-                    <ol>
-                        <li>Run your first security scan</li>
-                        <li>Review the findings</li>
-                        <li>Follow remediation steps</li>
-                    </ol>
-                    
-                    <a href="{{ dashboard_url }}" class="button">Go to Dashboard</a>
-                    
-                    <h3>Resources:</h3>
-                    <ul>
-                        <li><a href="{{ docs_url }}">Documentation</a></li>
-                        <li><a href="{{ api_docs_url }}">API Reference</a></li>
-                        <li><a href="{{ support_url }}">Support</a></li>
-                    </ul>
-                    
-                    <p>If you have any questions, just reply to this email!</p>
-                    
-                    <p>Happy scanning!<br>The ForgeScan Team</p>
-                </div>
-                <div class="footer">
-                    <p>© 2025 ForgeScan. All rights reserved.</p>
-                    <p><a href="{{ unsubscribe_url }}">Unsubscribe</a></p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        
-        template = Template(html_template)
-        html_content = template.render(
+        html_content = WELCOME_EMAIL_HEAD + await self._render(
+            WELCOME_EMAIL_TEMPLATE,
             name=name or 'there',
             dashboard_url=f"{settings.FRONTEND_URL}/dashboard",
             docs_url="https://docs.forgescan.io",
@@ -140,72 +309,8 @@ class EmailService:
         if critical_count > 0:
             subject = f"🚨 {critical_count} Critical Issues - " + subject
         
-        html_template = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
-                .container { max-width: 600px; margin: 0 auto; padding: 20px; }
-                .header { background: #667eea; color: white; padding: 20px; text-align: center; }
-                .content { background: #f9f9f9; padding: 30px; }
-                .findings { display: flex; gap: 10px; justify-content: space-around; margin: 20px 0; }
-                .finding-box { text-align: center; padding: 15px; border-radius: 8px; }
-                .critical { background: #ffebee; color: #c62828; }
-                .high { background: #fff3e0; color: #e65100; }
-                .medium { background: #e3f2fd; color: #1565c0; }
-                .low { background: #e8f5e9; color: #2e7d32; }
-                .button { display: inline-block; padding: 12px 24px; background: #667eea; 
-                         color: white; text-decoration: none; border-radius: 4px; margin: 20px 0; }
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>Security Scan Complete</h1>
-                </div>
-                <div class="content">
-                    <h2>{{ target }}</h2>
-                    <p>Your security scan has completed. Here's what we found:</p>
-                    
-                    <div class="findings">
-                        <div class="finding-box critical">
-                            <h3>{{ critical_count }}</h3>
-                            <p>Critical</p>
-                        </div>
-                        <div class="finding-box high">
-                            <h3>{{ high_count }}</h3>
-                            <p>High</p>
-                        </div>
-                        <div class="finding-box medium">
-                            <h3>{{ medium_count }}</h3>
-                            <p>Medium</p>
-                        </div>
-                        <div class="finding-box low">
-                            <h3>{{ low_count }}</h3>
-                            <p>Low</p>
-                        </div>
-                    </div>
-                    
-                    {% if critical_count > 0 %}
-                    <p style="color: #c62828; font-weight: bold;">
-                        ⚠️ {{ critical_count }} critical issue(s) require immediate attention!
-                    </p>
-                    {% endif %}
-                    
-                    <a href="{{ scan_url }}" class="button">View Full Report</a>
-                    
-                    <p style="margin-top: 30px;">
-                        <small>Risk Score: {{ risk_score }}/100</small>
-                    </p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        
-        template = Template(html_template)
-        html_content = template.render(
+        html_content = SCAN_COMPLETE_EMAIL_HEAD + await self._render(
+            SCAN_COMPLETE_EMAIL_TEMPLATE,
             target=scan_target,
             critical_count=critical_count,
             high_count=findings_summary.get('high_count', 0),
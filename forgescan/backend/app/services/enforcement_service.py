@@ -4,7 +4,9 @@ Phase 7: Enforcement Service
 Bridges database-level enforcement gates to API layer.
 All decisions are deterministic and auditable.
 """
-from typing import Dict, Any, Optional
+import time
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
@@ -12,6 +14,79 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Quota check results: tenant_id -> (checked at, result). Quotas only change
+# when a hard fail is recorded or the month rolls over, so CI runs in quick
+# succession can share one lookup; BLOCK decisions drop the tenant's entry
+_QUOTA_CACHE: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+QUOTA_CACHE_TTL = 30.0
+
+# Statements are built once and shared by every call
+ENFORCE_AND_LOG_QUERY = text("""
+    SELECT decision, max_priority, enforcement_level, reason, decision_id
+    FROM forgescan_security.enforce_and_log(:tenant_id, :pipeline_id)
+""")
+
+LOG_ENFORCEMENT_DECISION_QUERY = text("""
+    SELECT forgescan_security.log_enforcement_decision(
+        :tenant_id,
+        :pipeline_id,
+        :decision,
+        :max_priority,
+        :enforcement_level,
+        :reason,
+        :asset_at_risk,
+        :financial_risk_usd,
+        :required_action
+    )
+""")
+
+CHECK_ENFORCEMENT_QUOTA_QUERY = text("""
+    SELECT allowed, reason
+    FROM forgescan_security.check_enforcement_quota(:tenant_id)
+""")
+
+# IDs and amounts are cast in SQL so rows map straight onto the response
+_ENFORCEMENT_HISTORY_SQL = """
+    SELECT 
+        decision_id::TEXT AS decision_id,
+        pipeline_id,
+        max_priority,
+        enforcement_level,
+        decision,
+        reason,
+        asset_at_risk,
+        financial_risk_usd::FLOAT8 AS financial_risk_usd,
+        required_action,
+        decided_at,
+        acked_by::TEXT AS acked_by,
+        acked_at
+    FROM forgescan_security.enforcement_decisions
+    WHERE tenant_id = :tenant_id{before_clause}
+    ORDER BY decided_at DESC, enforcement_decisions.decision_id DESC
+    LIMIT :limit
+"""
+ENFORCEMENT_HISTORY_QUERY = text(_ENFORCEMENT_HISTORY_SQL.format(before_clause=""))
+# Decisions made before a point in time
+ENFORCEMENT_HISTORY_BEFORE_QUERY = text(
+    _ENFORCEMENT_HISTORY_SQL.format(before_clause="\n      AND decided_at < :before")
+)
+# Keyset page: decisions after the last one the caller has seen, in sort
+# order; decision_id breaks ties between decisions with the same timestamp
+ENFORCEMENT_HISTORY_PAGE_QUERY = text(
+    _ENFORCEMENT_HISTORY_SQL.format(
+        before_clause="\n      AND (decided_at, enforcement_decisions.decision_id) < (:before, :before_id)"
+    )
+)
+ENFORCEMENT_HISTORY_TIMESTAMPS = ("decided_at", "acked_at")
+
+ACKNOWLEDGE_DECISION_QUERY = text("""
+    UPDATE forgescan_security.enforcement_decisions
+    SET acked_by = :acked_by,
+        acked_at = NOW()
+    WHERE decision_id = :decision_id
+    RETURNING TRUE
+""")
+
 
 class EnforcementService:
     """
@@ -29,7 +104,7 @@ class EnforcementService:
     
     async def enforce_release_gate(
         self,
-        tenant_id: str,
+        tenant_id: UUID,
         pipeline_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
@@ -46,13 +121,9 @@ class EnforcementService:
         }
         """
         try:
-            query = text("""
-                SELECT decision, max_priority, enforcement_level, reason
-                FROM forgescan_security.enforce_release_gate(:tenant_id, :pipeline_id)
-            """)
-            
-            result = await self.session.execute(query, {
-                "tenant_id": str(tenant_id),
+            # Gate evaluation and audit logging happen in one round trip
+            result = await self.session.execute(ENFORCE_AND_LOG_QUERY, {
+                "tenant_id": tenant_id,
                 "pipeline_id": pipeline_id
             })
             row = result.fetchone()
@@ -65,17 +136,10 @@ class EnforcementService:
                     "reason": "Failed to evaluate enforcement gate"
                 }
             
-            decision, max_priority, enforcement_level, reason = row
+            decision, max_priority, enforcement_level, reason, decision_id = row
             
-            # Log this decision
-            decision_id = await self.log_enforcement_decision(
-                tenant_id=tenant_id,
-                pipeline_id=pipeline_id,
-                decision=decision,
-                max_priority=max_priority,
-                enforcement_level=enforcement_level,
-                reason=reason
-            )
+            if decision == "BLOCK":
+                _QUOTA_CACHE.pop(str(tenant_id), None)
             
             logger.info(f"Enforcement gate: tenant={tenant_id}, decision={decision}, priority={max_priority}")
             
@@ -93,7 +157,7 @@ class EnforcementService:
     
     async def log_enforcement_decision(
         self,
-        tenant_id: str,
+        tenant_id: UUID,
         pipeline_id: Optional[str],
         decision: str,
         max_priority: int,
@@ -107,22 +171,8 @@ class EnforcementService:
         Audit log the enforcement decision to immutable trail.
         """
         try:
-            query = text("""
-                SELECT forgescan_security.log_enforcement_decision(
-                    :tenant_id::UUID,
-                    :pipeline_id,
-                    :decision,
-                    :max_priority,
-                    :enforcement_level,
-                    :reason,
-                    :asset_at_risk,
-                    :financial_risk_usd,
-                    :required_action
-                )
-            """)
-            
-            result = await self.session.execute(query, {
-                "tenant_id": str(tenant_id),
+            result = await self.session.execute(LOG_ENFORCEMENT_DECISION_QUERY, {
+                "tenant_id": tenant_id,
                 "pipeline_id": pipeline_id,
                 "decision": decision,
                 "max_priority": max_priority,
@@ -140,7 +190,7 @@ class EnforcementService:
             logger.error(f"Error logging enforcement decision: {e}")
             raise
     
-    async def check_enforcement_quota(self, tenant_id: str) -> Dict[str, Any]:
+    async def check_enforcement_quota(self, tenant_id: UUID) -> Dict[str, Any]:
         """
         Check if tenant has enforcement quota remaining for this month.
         
@@ -152,14 +202,14 @@ class EnforcementService:
             "reason": "Quota check passed."
         }
         """
+        now = time.monotonic()
+        cached = _QUOTA_CACHE.get(str(tenant_id))
+        if cached is not None and now - cached[0] < QUOTA_CACHE_TTL:
+            return dict(cached[1])
+        
         try:
-            query = text("""
-                SELECT allowed, reason
-                FROM forgescan_security.check_enforcement_quota(:tenant_id::UUID)
-            """)
-            
-            result = await self.session.execute(query, {
-                "tenant_id": str(tenant_id)
+            result = await self.session.execute(CHECK_ENFORCEMENT_QUOTA_QUERY, {
+                "tenant_id": tenant_id
             })
             row = result.fetchone()
             
@@ -170,10 +220,12 @@ class EnforcementService:
             
             logger.info(f"Quota check: tenant={tenant_id}, allowed={allowed}")
             
-            return {
+            quota = {
                 "allowed": bool(allowed),
                 "reason": reason
             }
+            _QUOTA_CACHE[str(tenant_id)] = (now, quota)
+            return dict(quota)
             
         except Exception as e:
             logger.error(f"Error checking enforcement quota: {e}")
@@ -181,59 +233,46 @@ class EnforcementService:
     
     async def get_enforcement_history(
         self,
-        tenant_id: str,
-        limit: int = 100
+        tenant_id: UUID,
+        limit: int = 100,
+        before: Optional[datetime] = None,
+        before_id: Optional[UUID] = None
     ) -> list:
         """
         Retrieve enforcement decision history for audit/compliance.
         
-        Returns recent enforcement decisions in DESC order by timestamp.
+        Returns recent enforcement decisions in DESC order by timestamp,
+        then decision_id. Pass the decided_at and decision_id of the last
+        decision seen as `before` and `before_id` to fetch the next page;
+        `before` alone only filters by time.
         """
         try:
-            query = text("""
-                SELECT 
-                    decision_id,
-                    pipeline_id,
-                    max_priority,
-                    enforcement_level,
-                    decision,
-                    reason,
-                    asset_at_risk,
-                    financial_risk_usd,
-                    required_action,
-                    decided_at,
-                    acked_by,
-                    acked_at
-                FROM forgescan_security.enforcement_decisions
-                WHERE tenant_id = :tenant_id::UUID
-                ORDER BY decided_at DESC
-                LIMIT :limit
-            """)
-            
-            result = await self.session.execute(query, {
-                "tenant_id": str(tenant_id),
-                "limit": limit
-            })
-            
-            rows = result.fetchall()
+            if before is None:
+                result = await self.session.execute(ENFORCEMENT_HISTORY_QUERY, {
+                    "tenant_id": tenant_id,
+                    "limit": limit
+                })
+            elif before_id is None:
+                result = await self.session.execute(ENFORCEMENT_HISTORY_BEFORE_QUERY, {
+                    "tenant_id": tenant_id,
+                    "limit": limit,
+                    "before": before
+                })
+            else:
+                result = await self.session.execute(ENFORCEMENT_HISTORY_PAGE_QUERY, {
+                    "tenant_id": tenant_id,
+                    "limit": limit,
+                    "before": before,
+                    "before_id": before_id
+                })
             
-            history = [
-                {
-                    "decision_id": str(row[0]),
-                    "pipeline_id": row[1],
-                    "max_priority": row[2],
-                    "enforcement_level": row[3],
-                    "decision": row[4],
-                    "reason": row[5],
-                    "asset_at_risk": row[6],
-                    "financial_risk_usd": float(row[7]) if row[7] else None,
-                    "required_action": row[8],
-                    "decided_at": row[9].isoformat() if row[9] else None,
-                    "acked_by": str(row[10]) if row[10] else None,
-                    "acked_at": row[11].isoformat() if row[11] else None,
-                }
-                for row in rows
-            ]
+            history = []
+            for row in result.mappings():
+                decision = dict(row)
+                for key in ENFORCEMENT_HISTORY_TIMESTAMPS:
+                    if decision[key] is not None:
+                        decision[key] = decision[key].isoformat()
+                history.append(decision)
             
             return history
             
@@ -243,8 +282,8 @@ class EnforcementService:
     
     async def acknowledge_enforcement_decision(
         self,
-        decision_id: str,
-        acked_by: str
+        decision_id: UUID,
+        acked_by: UUID
     ) -> bool:
         """
         Record acknowledgement of a SOFT_FAIL enforcement decision.
@@ -252,17 +291,9 @@ class EnforcementService:
         Used when deploying with high-priority findings requires explicit approval.
         """
         try:
-            query = text("""
-                UPDATE forgescan_security.enforcement_decisions
-                SET acked_by = :acked_by::UUID,
-                    acked_at = NOW()
-                WHERE decision_id = :decision_id::UUID
-                RETURNING TRUE
-            """)
-            
-            result = await self.session.execute(query, {
-                "decision_id": str(decision_id),
-                "acked_by": str(acked_by)
+            result = await self.session.execute(ACKNOWLEDGE_DECISION_QUERY, {
+                "decision_id": decision_id,
+                "acked_by": acked_by
             })
             
             success = result.scalar()
@@ -13,6 +13,7 @@ from typing import Dict, Any, Optional, List
 from uuid import UUID
 import json
 import hashlib
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 import logging
@@ -37,6 +38,8 @@ class EvidenceService:
     @staticmethod
     def compute_hash(payload: Dict[str, Any]) -> str:
         """Compute SHA256 hash of payload for immutability proof."""
+        # Stays on json.dumps: the exact bytes hashed define every stored
+        # hash, and orjson's compact separators would change them
         payload_json = json.dumps(payload, sort_keys=True)
         return hashlib.sha256(payload_json.encode()).hexdigest()
     
@@ -76,7 +79,7 @@ class EvidenceService:
                 "tenant_id": str(tenant_id),
                 "evidence_type": evidence_type,
                 "related_entity": related_entity,
-                "payload": json.dumps(payload)
+                "payload": orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS).decode()
             })
             
             evidence_id = result.scalar()
@@ -188,6 +191,51 @@ class EvidenceService:
             logger.error(f"Error verifying evidence integrity: {e}")
             raise
     
+    async def verify_batch(
+        self,
+        expected_payloads: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, bool]:
+        """
+        Verify many evidence records at once.
+        
+        Takes evidence_id -> expected payload and fetches every stored hash
+        in one query, instead of one round trip per record as with
+        verify_evidence_integrity.
+        
+        Returns: evidence_id -> True if hashes match, False otherwise
+        (including evidence that was not found)
+        """
+        if not expected_payloads:
+            return {}
+        
+        try:
+            query = text("""
+                SELECT evidence_id, hash FROM forgescan_security.evidence_ledger
+                WHERE evidence_id = ANY(CAST(:evidence_ids AS UUID[]))
+            """)
+            
+            result = await self.session.execute(query, {
+                "evidence_ids": [str(evidence_id) for evidence_id in expected_payloads]
+            })
+            stored_hashes = {str(row[0]): row[1] for row in result.fetchall()}
+            
+            verified = {
+                evidence_id: stored_hashes.get(str(evidence_id)) == self.compute_hash(payload)
+                for evidence_id, payload in expected_payloads.items()
+            }
+            
+            failed = [evidence_id for evidence_id, is_valid in verified.items() if not is_valid]
+            if failed:
+                logger.warning(f"Evidence integrity FAILED for {len(failed)}/{len(verified)}: {failed}")
+            else:
+                logger.info(f"Evidence integrity verified for {len(verified)} records")
+            
+            return verified
+            
+        except Exception as e:
+            logger.error(f"Error verifying evidence integrity: {e}")
+            raise
+    
     async def get_evidence_by_entity(
         self,
         tenant_id: str,
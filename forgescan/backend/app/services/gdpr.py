@@ -6,7 +6,7 @@ Handles: Right to access, erasure, portability, rectification
 
 from datetime import datetime, timedelta
 from typing import Dict, List
-import json
+import orjson
 
 class GDPRService:
     """GDPR compliance service"""
@@ -39,7 +39,7 @@ class GDPRService:
                 event_type=AuditEventType.DATA_EXPORTED,
                 user_id=user_id,
                 tenant_id=user.tenant_id,
-                details={"export_size_bytes": len(json.dumps(user_data))}
+                details={"export_size_bytes": len(orjson.dumps(user_data, option=orjson.OPT_INDENT_2))}
             )
             
             return user_data
@@ -220,7 +220,7 @@ async def export_my_data(current_user: User = Depends(get_current_user)):
     data = await gdpr.export_user_data(current_user.id)
     
     return Response(
-        content=json.dumps(data, indent=2),
+        content=orjson.dumps(data, option=orjson.OPT_INDENT_2),
         media_type="application/json",
         headers={
             "Content-Disposition": f"attachment; filename=my_data_{datetime.utcnow().strftime('%Y%m%d')}.json"
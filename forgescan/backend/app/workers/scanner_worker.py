@@ -63,7 +63,7 @@ async def _execute_scan_async(
         
         # Initialize plugin manager
         plugin_manager = PluginManager()
-        await plugin_manager.initialize()
+        await plugin_manager.initialize([scanner_type])
         
         try:
             # Update scan status to running
@@ -144,15 +144,19 @@ async def _execute_scan_async(
         email_service = EmailService()
         scan_url = f"{settings.FRONTEND_URL}/scans/{scan_id}"
         
-        # Get user email
-        user = await user_repo.get(scan.user_id)
-        if user and user.email:
-            await email_service.send_scan_complete_email(
-                email=user.email,
-                scan_target=target,
-                findings_summary=result.summary,
-                scan_url=scan_url
-            )
+        # Get user email; the SMTP connection dies with this task's event
+        # loop, so QUIT it here rather than leaving it to the server
+        try:
+            user = await user_repo.get(scan.user_id)
+            if user and user.email:
+                await email_service.send_scan_complete_email(
+                    email=user.email,
+                    scan_target=target,
+                    findings_summary=result.summary,
+                    scan_url=scan_url
+                )
+        finally:
+            await email_service.close()
 
 
 
@@ -42,6 +42,7 @@ CREATE TABLE IF NOT EXISTS forgescan_security.enforcement_decisions (
 
 CREATE INDEX IF NOT EXISTS idx_enforcement_decisions_tenant ON forgescan_security.enforcement_decisions(tenant_id);
 CREATE INDEX IF NOT EXISTS idx_enforcement_decisions_decided_at ON forgescan_security.enforcement_decisions(decided_at DESC);
+CREATE INDEX IF NOT EXISTS idx_enforcement_decisions_tenant_decided_at ON forgescan_security.enforcement_decisions(tenant_id, decided_at DESC, decision_id DESC);
 
 -- 3) Enforcement quota tracking (per-tenant, per-month)
 CREATE TABLE IF NOT EXISTS forgescan_security.enforcement_quota (
@@ -230,8 +231,46 @@ BEGIN
 END;
 $$;
 
--- 7) Grant minimal execute rights for CI role
+-- 7) Evaluate the gate and log the decision in one call (one round trip per CI gate)
+CREATE OR REPLACE FUNCTION forgescan_security.enforce_and_log(
+    p_tenant_id UUID,
+    p_pipeline_id TEXT DEFAULT NULL
+)
+RETURNS TABLE (
+    decision TEXT,
+    max_priority INTEGER,
+    enforcement_level TEXT,
+    reason TEXT,
+    decision_id UUID
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+    v_gate RECORD;
+BEGIN
+    SELECT * INTO v_gate
+    FROM forgescan_security.enforce_release_gate(p_tenant_id, p_pipeline_id);
+
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+
+    RETURN QUERY SELECT
+        v_gate.decision,
+        v_gate.max_priority,
+        v_gate.enforcement_level,
+        v_gate.reason,
+        forgescan_security.log_enforcement_decision(
+            p_tenant_id, p_pipeline_id, v_gate.decision, v_gate.max_priority,
+            v_gate.enforcement_level, v_gate.reason
+        );
+END;
+$$;
+
+-- 8) Grant minimal execute rights for CI role
 -- GRANT EXECUTE ON FUNCTION forgescan_security.enforce_release_gate(UUID, TEXT) TO forgescan_ci;
 -- GRANT EXECUTE ON FUNCTION forgescan_security.log_enforcement_decision(UUID, TEXT, TEXT, INTEGER, TEXT, TEXT, TEXT, DECIMAL, TEXT) TO forgescan_ci;
+-- GRANT EXECUTE ON FUNCTION forgescan_security.enforce_and_log(UUID, TEXT) TO forgescan_ci;
 
 -- End of Phase 7 SQL
@@ -0,0 +1,234 @@
+# tests/test_api_scanner.py
+"""
+API scanner tests
+Tests: Per-host limiter, cancellation handling, finding deduplication,
+streamed reflection and data-exposure checks
+"""
+
+import asyncio
+
+import httpx
+import orjson
+import pytest
+
+from app.core.constants import SeverityLevel
+from app.scanners.api_scanner import (
+    APIScanner,
+    HAVE_IJSON,
+    HOST_INITIAL_CONCURRENCY,
+    REFLECTION_CHUNK_BYTES,
+    HostLimiter,
+    get_host_limiter,
+)
+
+
+TARGET = "http://api.test/items"
+
+
+def make_scanner(handler):
+    scanner = APIScanner()
+    scanner.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return scanner
+
+
+def chunked(body, size):
+    """Async byte stream yielding body in pieces of size bytes"""
+    async def stream():
+        for start in range(0, len(body), size):
+            yield body[start:start + size]
+    return stream()
+
+
+EXPOSED_DOCUMENT = {
+    "user": {"name": "bob", "password": "x", "profile": {"api_key": 1}},
+    "items": [{"token": "a"}, {"id": 2, "secret_note": [1, {"ssn": "b"}]}],
+}
+
+
+class TestHostLimiter:
+    """Test per-host AIMD limiting"""
+    
+    async def test_cancelled_retry_after_wait_frees_slot(self):
+        limiter = HostLimiter()
+        await limiter.acquire()
+        await limiter.release(429, "30")
+        
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter._in_flight == 1
+        
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert limiter._in_flight == 0
+    
+    async def test_cancelled_release_keeps_limit(self):
+        limiter = HostLimiter()
+        await limiter.acquire()
+        await limiter.release(None, cancelled=True)
+        
+        assert limiter.limit == HOST_INITIAL_CONCURRENCY
+        assert limiter._in_flight == 0
+    
+    async def test_failed_release_halves_limit(self):
+        limiter = HostLimiter()
+        await limiter.acquire()
+        await limiter.release(None)
+        
+        assert limiter.limit == HOST_INITIAL_CONCURRENCY / 2
+    
+    async def test_cancelled_requests_do_not_shrink_limit(self):
+        started = asyncio.Event()
+        
+        async def handler(request):
+            started.set()
+            await asyncio.sleep(10)
+            return httpx.Response(200)
+        
+        scanner = make_scanner(handler)
+        probes = [
+            asyncio.create_task(scanner._probe_rate_limit(TARGET))
+            for _ in range(4)
+        ]
+        await started.wait()
+        for probe in probes:
+            probe.cancel()
+        await asyncio.gather(*probes, return_exceptions=True)
+        await scanner.cleanup()
+        
+        limiter = get_host_limiter(TARGET)
+        assert limiter.limit == HOST_INITIAL_CONCURRENCY
+        assert limiter._in_flight == 0
+    
+    async def test_retry_after_halves_limit_and_delays(self):
+        limiter = HostLimiter()
+        await limiter.acquire()
+        await limiter.release(429, "5")
+        
+        assert limiter.limit == HOST_INITIAL_CONCURRENCY / 2
+        assert limiter._resume_at > asyncio.get_running_loop().time() + 4
+    
+    async def test_successes_grow_limit(self):
+        limiter = HostLimiter()
+        for _ in range(HOST_INITIAL_CONCURRENCY):
+            await limiter.acquire()
+            await limiter.release(200)
+        
+        assert HOST_INITIAL_CONCURRENCY + 0.9 < limiter.limit < HOST_INITIAL_CONCURRENCY + 1
+    
+    async def test_requests_stay_within_limit(self):
+        in_flight = 0
+        over_limit = []
+        
+        async def handler(request):
+            nonlocal in_flight
+            in_flight += 1
+            if in_flight > int(get_host_limiter(TARGET).limit):
+                over_limit.append(in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200)
+        
+        scanner = make_scanner(handler)
+        statuses = await asyncio.gather(*(
+            scanner._fetch_status("GET", TARGET) for _ in range(3 * HOST_INITIAL_CONCURRENCY)
+        ))
+        await scanner.cleanup()
+        
+        assert statuses == [200] * (3 * HOST_INITIAL_CONCURRENCY)
+        assert over_limit == []
+
+
+class TestFindingDeduplication:
+    """Test findings reported more than once"""
+    
+    def test_duplicate_findings_are_dropped(self):
+        scanner = APIScanner()
+        finding = {
+            "title": "Dangerous HTTP Method Enabled: TRACE",
+            "url": TARGET,
+            "method": "TRACE",
+            "cwe_id": "CWE-650",
+            "severity": SeverityLevel.MEDIUM,
+        }
+        
+        scanner._add_finding(finding)
+        scanner._add_finding({**finding, "evidence": "seen again"})
+        scanner._add_finding({**finding, "method": "PUT"})
+        
+        assert len(scanner.findings) == 2
+        assert scanner._calculate_summary()["medium_count"] == 2
+    
+    async def test_scan_reports_each_finding_once(self):
+        async def handler(request):
+            return httpx.Response(200, json={"id": 1, "password": "x"})
+        
+        scanner = make_scanner(handler)
+        result = await scanner.scan(TARGET, "scan-1", "tenant-1")
+        await scanner.cleanup()
+        
+        keys = [APIScanner._finding_key(finding) for finding in result.findings]
+        assert len(keys) == len(set(keys))
+        assert "Excessive Data Exposure" in {finding["title"] for finding in result.findings}
+
+
+class TestResponseStreaming:
+    """Test checks that read response bodies as streams"""
+    
+    async def test_reflection_straddling_chunk_boundary(self):
+        needle = b"<script>alert('XSS')</script>"
+        body = b"x" * (REFLECTION_CHUNK_BYTES - 10) + needle + b"y" * 100
+        
+        scanner = make_scanner(
+            lambda request: httpx.Response(200, content=chunked(body, REFLECTION_CHUNK_BYTES))
+        )
+        
+        assert await scanner._is_reflected(TARGET, needle)
+        assert not await scanner._is_reflected(TARGET, b"' OR '1'='1")
+        await scanner.cleanup()
+    
+    async def test_reflection_across_small_chunks(self):
+        needle = b"<script>alert('XSS')</script>"
+        body = b"prefix " + needle + b" suffix"
+        
+        scanner = make_scanner(lambda request: httpx.Response(200, content=chunked(body, 3)))
+        
+        assert await scanner._is_reflected(TARGET, needle)
+        await scanner.cleanup()
+    
+    @pytest.mark.skipif(not HAVE_IJSON, reason="ijson not installed")
+    async def test_streamed_fields_match_decoded_walk(self):
+        body = orjson.dumps(EXPOSED_DOCUMENT)
+        scanner = make_scanner(lambda request: httpx.Response(200, content=chunked(body, 7)))
+        
+        async with scanner._request("GET", TARGET) as response:
+            streamed = await APIScanner._stream_sensitive_fields(response)
+        await scanner.cleanup()
+        
+        assert streamed == APIScanner._find_sensitive_fields(EXPOSED_DOCUMENT)
+        assert streamed == [
+            "user.password", "user.profile.api_key", "items[0].token",
+            "items[1].secret_note", "items[1].secret_note[1].ssn",
+        ]
+    
+    async def test_data_exposure_reports_fields(self):
+        body = orjson.dumps(EXPOSED_DOCUMENT)
+        scanner = make_scanner(lambda request: httpx.Response(200, content=chunked(body, 7)))
+        scanner._finding_queue = asyncio.Queue()
+        
+        await scanner._check_data_exposure(TARGET)
+        await scanner.cleanup()
+        
+        finding = scanner._finding_queue.get_nowait()
+        assert finding["title"] == "Excessive Data Exposure"
+        assert finding["evidence"].startswith("Exposed fields: user.password, ")
+    
+    async def test_data_exposure_ignores_invalid_json(self):
+        scanner = make_scanner(lambda request: httpx.Response(200, content=b"<html>not json"))
+        scanner._finding_queue = asyncio.Queue()
+        
+        await scanner._check_data_exposure(TARGET)
+        await scanner.cleanup()
+        
+        assert scanner._finding_queue.empty()
+
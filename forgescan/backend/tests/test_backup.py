@@ -0,0 +1,197 @@
+# tests/test_backup.py
+"""
+Backup service tests
+Tests: pg_dump -> gpg -> S3 pipeline, staging and storage classes,
+failed dumps and uploads, old backup cleanup
+"""
+
+import asyncio
+import subprocess
+import sys
+
+import pytest
+
+from app.services import backup as backup_module
+from app.services.backup import BACKUP_STAGING_PREFIX, BackupService
+
+
+def python_command(source):
+    return [sys.executable, "-c", source]
+
+
+# Stand-ins for the real binaries, run through real pipes
+DUMP_OK = python_command("import sys; sys.stdout.write('dump-data')")
+DUMP_FAILS = python_command("import sys; sys.stdout.write('partial'); sys.exit(1)")
+ENCRYPT = python_command("import sys; sys.stdout.write(sys.stdin.read().upper())")
+
+
+class FakeS3:
+    """In-memory stand-in for the boto3 S3 client that records its calls"""
+    
+    def __init__(self, fail_upload=False, undeletable=()):
+        self.fail_upload = fail_upload
+        self.undeletable = set(undeletable)
+        self.objects = {}
+        self.calls = []
+    
+    def upload_fileobj(self, stream, bucket, key, ExtraArgs=None):
+        self.calls.append(("upload", key, ExtraArgs))
+        if self.fail_upload:
+            stream.read(1)
+            raise ConnectionError("Upload interrupted")
+        self.objects[key] = stream.read()
+    
+    def copy(self, source, bucket, key, ExtraArgs=None):
+        self.calls.append(("copy", key, ExtraArgs))
+        self.objects[key] = self.objects[source["Key"]]
+    
+    def delete_object(self, Bucket, Key):
+        self.calls.append(("delete", Key))
+        self.objects.pop(Key, None)
+    
+    def head_object(self, Bucket, Key):
+        return {"ContentLength": len(self.objects[Key])}
+    
+    def delete_objects(self, Bucket, Delete):
+        keys = [obj["Key"] for obj in Delete["Objects"]]
+        self.calls.append(("delete_objects", keys))
+        errors = [
+            {"Key": key, "Code": "AccessDenied", "Message": "Access Denied"}
+            for key in keys if key in self.undeletable
+        ]
+        for key in keys:
+            if key not in self.undeletable:
+                self.objects.pop(key, None)
+        return {"Errors": errors} if errors else {}
+
+
+class LogCapture:
+    """Collects the messages the backup service logs, by level"""
+    
+    def __init__(self):
+        self.messages = []
+    
+    def info(self, message):
+        self.messages.append(("info", message))
+    
+    def error(self, message):
+        self.messages.append(("error", message))
+
+
+@pytest.fixture
+def backup_env(monkeypatch):
+    for name in ("BACKUP_S3_BUCKET", "DB_HOST", "DB_USER", "DB_NAME", "BACKUP_ENCRYPTION_KEY"):
+        monkeypatch.setenv(name, "test")
+
+
+def make_service(monkeypatch, s3, dump_command):
+    """BackupService on s3 whose pg_dump and gpg run the given stand-ins"""
+    commands = {"pg_dump": dump_command, "gpg": ENCRYPT}
+    create_subprocess_exec = asyncio.create_subprocess_exec
+    
+    async def run_stand_in(program, *args, **kwargs):
+        return await create_subprocess_exec(*commands[program], **kwargs)
+    
+    monkeypatch.setattr(backup_module.asyncio, "create_subprocess_exec", run_stand_in)
+    monkeypatch.setattr(backup_module.boto3, "client", lambda service_name: s3)
+    
+    service = BackupService()
+    service.recorded = []
+    
+    async def backup_to_secondary_location(s3_key):
+        pass
+    
+    async def record_backup(**record):
+        service.recorded.append(record)
+    
+    service._backup_to_secondary_location = backup_to_secondary_location
+    service._record_backup = record_backup
+    return service
+
+
+@pytest.mark.usefixtures("backup_env")
+class TestBackupDatabase:
+    """Test the streamed database backup"""
+    
+    async def test_backup_is_encrypted_and_copied_into_place(self, monkeypatch):
+        s3 = FakeS3()
+        service = make_service(monkeypatch, s3, DUMP_OK)
+        
+        await service.backup_database()
+        
+        (s3_key, data), = s3.objects.items()
+        assert s3_key.startswith("database_backups/")
+        assert data == b"DUMP-DATA"
+        assert service.recorded == [
+            {"backup_type": "database", "s3_key": s3_key, "size_bytes": len(data)}
+        ]
+    
+    async def test_only_the_final_copy_is_infrequent_access(self, monkeypatch):
+        s3 = FakeS3()
+        service = make_service(monkeypatch, s3, DUMP_OK)
+        
+        await service.backup_database()
+        
+        (_, staging_key, upload_args), (_, s3_key, copy_args), delete = s3.calls
+        assert staging_key == BACKUP_STAGING_PREFIX + s3_key
+        assert "StorageClass" not in upload_args
+        assert copy_args["StorageClass"] == "STANDARD_IA"
+        assert delete == ("delete", staging_key)
+    
+    async def test_failed_dump_is_not_published(self, monkeypatch):
+        s3 = FakeS3()
+        service = make_service(monkeypatch, s3, DUMP_FAILS)
+        
+        with pytest.raises(subprocess.CalledProcessError) as error:
+            await service.backup_database()
+        
+        assert error.value.cmd == "pg_dump"
+        assert s3.objects == {}
+        assert [call[0] for call in s3.calls] == ["upload", "delete"]
+        assert service.recorded == []
+    
+    async def test_failed_upload_stops_the_pipeline(self, monkeypatch):
+        s3 = FakeS3(fail_upload=True)
+        service = make_service(monkeypatch, s3, DUMP_OK)
+        
+        with pytest.raises(ConnectionError):
+            await service.backup_database()
+        
+        assert s3.objects == {}
+        assert [call[0] for call in s3.calls] == ["upload", "delete"]
+        assert service.recorded == []
+
+
+
+@pytest.mark.usefixtures("backup_env")
+class TestCleanupOldBackups:
+    """Test batched deletion of expired backups"""
+    
+    async def test_failed_deletions_are_not_logged_as_deleted(self, monkeypatch):
+        keys = [f"database_backups/2024010{day}_020000/backup.sql.gz.encrypted" for day in range(1, 4)]
+        s3 = FakeS3(undeletable={keys[1]})
+        s3.objects = dict.fromkeys(keys, b"old")
+        service = make_service(monkeypatch, s3, DUMP_OK)
+        service._list_backups_before = lambda prefix, cutoff_date: keys
+        log = LogCapture()
+        monkeypatch.setattr(backup_module, "logger", log)
+        
+        await service.cleanup_old_backups()
+        
+        assert log.messages == [
+            ("info", f"Deleted old backup: {keys[0]}"),
+            ("error", f"Failed to delete old backup {keys[1]}: AccessDenied Access Denied"),
+            ("info", f"Deleted old backup: {keys[2]}"),
+        ]
+        assert list(s3.objects) == [keys[1]]
+    
+    async def test_keys_are_deleted_in_batches_of_1000(self, monkeypatch):
+        keys = [f"database_backups/old/{index}" for index in range(2500)]
+        s3 = FakeS3()
+        service = make_service(monkeypatch, s3, DUMP_OK)
+        service._list_backups_before = lambda prefix, cutoff_date: keys
+        monkeypatch.setattr(backup_module, "logger", LogCapture())
+        
+        await service.cleanup_old_backups()
+        
+        assert [len(call[1]) for call in s3.calls] == [1000, 1000, 500]
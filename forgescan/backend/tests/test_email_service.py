@@ -0,0 +1,94 @@
+# tests/test_email_service.py
+"""
+Email service tests
+Tests: SMTP connection reuse, reconnect, recycling, close
+"""
+
+import pytest
+
+aiosmtplib = pytest.importorskip("aiosmtplib")
+pytest.importorskip("jinja2")
+
+from app.services import email_service as email_module
+from app.services.email_service import EmailService
+
+
+class FakeSMTP:
+    """In-memory stand-in for aiosmtplib.SMTP that records its calls"""
+    
+    def __init__(self, log, **kwargs):
+        self.id = len([entry for entry in log if entry[0] == "connect"]) + 1
+        self.log = log
+        self.is_connected = False
+        self.drop_next = False
+    
+    async def connect(self):
+        self.is_connected = True
+        self.log.append(("connect", self.id))
+    
+    async def send_message(self, message):
+        if self.drop_next:
+            self.drop_next = False
+            self.is_connected = False
+            raise aiosmtplib.SMTPServerDisconnected("Connection lost")
+        self.log.append(("send", self.id))
+    
+    async def quit(self):
+        self.is_connected = False
+        self.log.append(("quit", self.id))
+    
+    def close(self):
+        self.is_connected = False
+
+
+@pytest.fixture
+def smtp_log(monkeypatch):
+    log = []
+    monkeypatch.setattr(
+        email_module.aiosmtplib, "SMTP", lambda **kwargs: FakeSMTP(log, **kwargs)
+    )
+    return log
+
+
+@pytest.fixture
+def service(smtp_log):
+    service = EmailService()
+    service.smtp_host = "smtp.example.com"
+    return service
+
+
+class TestSMTPConnection:
+    """Test the shared SMTP connection"""
+    
+    async def test_sends_reuse_one_connection(self, service, smtp_log):
+        for _ in range(3):
+            await service.send_email(["a@example.com"], "Hi", "<p>Hi</p>")
+        await service.close()
+        
+        assert smtp_log == [
+            ("connect", 1), ("send", 1), ("send", 1), ("send", 1), ("quit", 1),
+        ]
+    
+    async def test_reconnects_after_server_disconnect(self, service, smtp_log):
+        await service.send_email(["a@example.com"], "Hi", "<p>Hi</p>")
+        service._smtp.drop_next = True
+        await service.send_email(["a@example.com"], "Hi", "<p>Hi</p>")
+        
+        assert smtp_log == [("connect", 1), ("send", 1), ("connect", 2), ("send", 2)]
+    
+    async def test_recycles_connection_after_message_limit(self, service, smtp_log, monkeypatch):
+        monkeypatch.setattr(email_module, "SMTP_MAX_MESSAGES_PER_CONNECTION", 2)
+        
+        await service.send_bulk(
+            ["a@example.com", "b@example.com", "c@example.com"], "Hi", "<p>Hi</p>"
+        )
+        
+        assert smtp_log == [
+            ("connect", 1), ("send", 1), ("send", 1), ("quit", 1),
+            ("connect", 2), ("send", 2),
+        ]
+    
+    async def test_close_without_connection_is_noop(self, service, smtp_log):
+        await service.close()
+        
+        assert smtp_log == []
@@ -8,7 +8,7 @@ Tests the complete enforcement pipeline:
 4. Quota enforcement
 """
 import pytest
-from uuid import uuid4
+from uuid import UUID, uuid4
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
@@ -169,6 +169,44 @@ class TestEnforcementGate:
                 assert history[i]["decided_at"] >= history[i + 1]["decided_at"]
     
     
+    async def test_enforcement_history_pages_through_ties(
+        self,
+        enforcement_service: EnforcementService,
+        db_session: AsyncSession,
+        test_tenant_id: str,
+    ):
+        """
+        Test: Keyset pages cover every decision exactly once
+        
+        Expected: decisions sharing a decided_at (NOW() within one
+        transaction) are neither skipped nor repeated across pages
+        """
+        for _ in range(3):
+            await enforcement_service.enforce_release_gate(
+                tenant_id=test_tenant_id,
+                pipeline_id="test-pipeline-" + str(uuid4())
+            )
+        
+        history = await enforcement_service.get_enforcement_history(test_tenant_id)
+        
+        paged = []
+        before = before_id = None
+        while True:
+            page = await enforcement_service.get_enforcement_history(
+                test_tenant_id,
+                limit=1,
+                before=before,
+                before_id=before_id
+            )
+            if not page:
+                break
+            paged.extend(d["decision_id"] for d in page)
+            before = datetime.fromisoformat(page[-1]["decided_at"])
+            before_id = UUID(page[-1]["decision_id"])
+        
+        assert paged == [d["decision_id"] for d in history]
+    
+    
     # ==================== Tier-Based Enforcement Tests ====================
     
     async def test_quota_check_passes_for_startup(
@@ -198,6 +198,38 @@ class TestEvidenceService:
         
         assert is_valid is False
     
+    async def test_verify_batch(
+        self,
+        evidence_service: EvidenceService,
+        tenant_id: str,
+        evidence_payload: dict
+    ):
+        """Test verifying several evidence records in one call."""
+        valid_id = await evidence_service.log_evidence(
+            tenant_id=tenant_id,
+            evidence_type="ENFORCEMENT",
+            related_entity="vuln:RLS_BYPASS:orders",
+            payload=evidence_payload
+        )
+        tampered_id = await evidence_service.log_evidence(
+            tenant_id=tenant_id,
+            evidence_type="ENFORCEMENT",
+            related_entity="vuln:RLS_BYPASS:orders",
+            payload=evidence_payload
+        )
+        missing_id = str(uuid4())
+        
+        tampered_payload = evidence_payload.copy()
+        tampered_payload["priority_score"] = 100
+        
+        results = await evidence_service.verify_batch({
+            valid_id: evidence_payload,
+            tampered_id: tampered_payload,
+            missing_id: evidence_payload,
+        })
+        
+        assert results == {valid_id: True, tampered_id: False, missing_id: False}
+    
     async def test_get_evidence_by_entity_timeline(
         self,
         evidence_service: EvidenceService,
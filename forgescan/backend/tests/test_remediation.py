@@ -0,0 +1,92 @@
+# tests/test_remediation.py
+"""
+Remediation engine tests
+Tests: Rule matching, priority calculation, JSON serialization
+"""
+
+from app.remediation import evaluate_scan, evaluate_scan_json
+from app.remediation.evaluator import find_matching_rule
+from app.remediation.rules import RULES_BY_PRIORITY, match_highest_priority_rule, match_rules
+
+
+FINDINGS = [
+    {
+        "title": "SQL Injection",
+        "description": "SQL injection in id parameter",
+        "severity": "high",
+    },
+    {
+        "title": "Missing header",
+        "description": "Security header X-Frame-Options not set",
+        "severity": "low",
+    },
+    {
+        "title": "Unknown",
+        "description": "Nothing any rule recognises",
+        "severity": "critical",
+    },
+]
+
+
+class TestRemediationEvaluator:
+    """Test finding → remediation evaluation"""
+
+    def test_first_matching_rule_wins(self):
+        """Test a finding matching several rules resolves to the earliest one"""
+
+        rule = find_matching_rule({
+            "title": "Token endpoint",
+            "description": "No rate limit on token endpoint",
+        })
+
+        assert rule["id"] == "R001"
+
+    def test_matcher_does_not_span_description_and_title(self):
+        """Test multi-token matchers only match within a single field"""
+
+        rule = find_matching_rule({
+            "title": "script",
+            "description": "cross-site",
+        })
+
+        assert rule is None
+
+    def test_match_rules_returns_all_hits_in_rule_order(self):
+        """Test literal and wildcard matchers are both reported"""
+
+        rules = match_rules("Cross-site scripting leaks API key via TLS downgrade")
+
+        assert [r["id"] for r in rules] == ["R002", "R005", "R007"]
+
+    def test_highest_priority_rule_prefers_business_impact(self):
+        """Test priority order ranks business impact, then technical severity"""
+
+        rule = match_highest_priority_rule("Cross-site scripting leaks API key via TLS downgrade")
+
+        assert rule["id"] == "R005"
+        assert [r["id"] for r in RULES_BY_PRIORITY[:3]] == ["R005", "R006", "R001"]
+        assert match_highest_priority_rule("nothing relevant here") is None
+
+    def test_unmatched_findings_are_dropped(self):
+        """Test findings without a matching rule produce no remediation"""
+
+        remediations = evaluate_scan(FINDINGS)
+
+        assert len(remediations) == 2
+
+    def test_remediations_sorted_by_priority(self):
+        """Test P0 items come first"""
+
+        remediations = evaluate_scan(FINDINGS)
+
+        assert [r.priority for r in remediations] == ["P0", "P3"]
+
+    def test_evaluate_scan_json_returns_plain_dicts(self):
+        """Test JSON helper matches per-item model serialization"""
+
+        expected = [r.model_dump(mode="json") for r in evaluate_scan(FINDINGS)]
+        result = evaluate_scan_json(FINDINGS)
+
+        assert result == expected
+        assert all(isinstance(item, dict) for item in result)
+        assert result[0]["priority"] == "P0"
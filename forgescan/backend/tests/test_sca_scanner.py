@@ -0,0 +1,208 @@
+# tests/test_sca_scanner.py
+"""
+SCA scanner tests
+Tests: OSV advisory normalization, CVSS scoring, alias deduplication,
+OSV result caching, manifest detection
+"""
+
+import httpx
+import orjson
+import pytest
+
+from app.core.constants import SeverityLevel
+from app.scanners import sca_scanner as sca_module
+from app.scanners.sca_scanner import SCAScanner, cvss3_base_score
+
+
+CRITICAL_VECTOR = "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H"
+
+GHSA_ADVISORY = {
+    "id": "GHSA-aaaa-bbbb-cccc",
+    "aliases": ["CVE-2024-0001"],
+    "summary": "Remote code execution",
+    "severity": [{"type": "CVSS_V3", "score": CRITICAL_VECTOR}],
+    "database_specific": {"severity": "MODERATE"},
+}
+
+PYSEC_ADVISORY = {
+    "id": "PYSEC-2024-1",
+    "aliases": ["CVE-2024-0001", "GHSA-aaaa-bbbb-cccc"],
+    "details": "Remote code execution",
+}
+
+
+class TestOSVNormalization:
+    """Test OSV advisories mapped to vulnerability records"""
+    
+    @pytest.mark.parametrize("vector,score", [
+        (CRITICAL_VECTOR, 9.8),
+        ("CVSS:3.1/AV:N/AC:L/PR:N/UI:R/S:C/C:L/I:L/A:N", 6.1),
+        ("CVSS:3.1/AV:N/AC:L/PR:L/UI:N/S:C/C:H/I:H/A:H", 9.9),
+        ("CVSS:3.0/AV:L/AC:H/PR:H/UI:R/S:U/C:N/I:N/A:N", 0.0),
+        ("CVSS:4.0/AV:N/AC:L/AT:N/PR:N/UI:N/VC:H/VI:H/VA:H/SC:N/SI:N/SA:N", None),
+        ("CVSS:3.1/AV:N", None),
+    ])
+    def test_cvss3_base_score(self, vector, score):
+        assert cvss3_base_score(vector) == score
+    
+    def test_score_comes_from_vector(self):
+        record = SCAScanner._osv_to_oss_index(GHSA_ADVISORY)
+        
+        assert record["cvssScore"] == 9.8
+        assert record["cvssVector"] == CRITICAL_VECTOR
+    
+    def test_unscored_advisory_keeps_no_score(self):
+        record = SCAScanner._osv_to_oss_index(PYSEC_ADVISORY)
+        
+        assert record["cvssScore"] is None
+        assert record["severity"] is None
+    
+    def test_qualitative_severity_without_vector(self):
+        record = SCAScanner._osv_to_oss_index({
+            **PYSEC_ADVISORY,
+            "database_specific": {"severity": "HIGH"},
+        })
+        vuln, = SCAScanner()._build_vulnerabilities(
+            [{"purl": "pkg:pypi/demo@1.0"}],
+            [{"coordinates": "pkg:pypi/demo@1.0", "vulnerabilities": [record]}],
+        )
+        
+        assert vuln["cvss_score"] is None
+        assert vuln["severity"] == SeverityLevel.HIGH
+    
+    def test_aliases_collapse_to_scored_advisory(self):
+        records = [
+            SCAScanner._osv_to_oss_index(advisory)
+            for advisory in (PYSEC_ADVISORY, GHSA_ADVISORY)
+        ]
+        
+        deduped = SCAScanner._dedupe_osv(records)
+        
+        assert [record["id"] for record in deduped] == ["GHSA-aaaa-bbbb-cccc"]
+        assert deduped[0]["cve"] == "CVE-2024-0001"
+
+
+def osv_scanner(advisories):
+    """SCAScanner on a mock OSV API; advisories missing from the dict return 404"""
+    purl_ids = {"pkg:pypi/demo@1.0": ["GHSA-1", "GHSA-2"]}
+    
+    def handler(request):
+        if request.url.path == "/v1/querybatch":
+            queries = orjson.loads(request.content)["queries"]
+            return httpx.Response(200, json={"results": [
+                {"vulns": [{"id": vuln_id} for vuln_id in purl_ids.get(query["package"]["purl"], [])]}
+                for query in queries
+            ]})
+        vuln_id = request.url.path.rsplit("/", 1)[1]
+        if vuln_id in advisories:
+            return httpx.Response(200, json=advisories[vuln_id])
+        return httpx.Response(404)
+    
+    scanner = SCAScanner()
+    scanner.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return scanner
+
+
+class TestOSVCaching:
+    """Test which OSV results are cached"""
+    
+    DEP = {"purl": "pkg:pypi/demo@1.0", "ecosystem": "pypi", "name": "demo", "version": "1.0"}
+    ADVISORIES = {
+        "GHSA-1": {"id": "GHSA-1", "aliases": ["CVE-2024-0001"], "summary": "First"},
+        "GHSA-2": {
+            "id": "GHSA-2",
+            "aliases": ["CVE-2024-0002"],
+            "summary": "Second",
+            "severity": [{"type": "CVSS_V3", "score": CRITICAL_VECTOR}],
+        },
+    }
+    
+    @pytest.fixture(autouse=True)
+    def empty_caches(self, monkeypatch):
+        monkeypatch.setattr(sca_module, "_VULN_CACHE", {})
+        monkeypatch.setattr(sca_module, "_CLEAN_PURLS", set())
+    
+    async def test_fully_loaded_purl_is_cached(self):
+        scanner = osv_scanner(self.ADVISORIES)
+        
+        vulns = await scanner._query_osv([self.DEP])
+        
+        assert {vuln["cve_id"] for vuln in vulns} == {"CVE-2024-0001", "CVE-2024-0002"}
+        assert self.DEP["purl"] in sca_module._VULN_CACHE
+    
+    async def test_partially_loaded_purl_is_reported_but_not_cached(self):
+        scanner = osv_scanner({"GHSA-1": self.ADVISORIES["GHSA-1"]})
+        
+        vulns = await scanner._query_osv([self.DEP])
+        
+        assert [vuln["cve_id"] for vuln in vulns] == ["CVE-2024-0001"]
+        assert sca_module._VULN_CACHE == {}
+        assert self.DEP["purl"] not in sca_module._CLEAN_PURLS
+        
+        # The next scan asks again and picks up the advisory that failed
+        scanner = osv_scanner(self.ADVISORIES)
+        vulns = await scanner._query_osv([self.DEP])
+        
+        assert {vuln["cve_id"] for vuln in vulns} == {"CVE-2024-0001", "CVE-2024-0002"}
+
+
+class TestManifestDetection:
+    """Test manifests picked up from a checkout in the workspace root"""
+    
+    async def test_manifests_are_parsed_from_disk(self, tmp_path):
+        checkout = tmp_path / "repo"
+        checkout.mkdir()
+        (checkout / "requirements.txt").write_text("Django==3.2.1\nrequests==2.25.0\n")
+        (checkout / "package.json").write_text('{"dependencies": {"lodash": "^4.17.20"}}')
+        (checkout / "pom.xml").write_text("")
+        
+        scanner = SCAScanner(workspace_root=str(tmp_path))
+        detected = await scanner._detect_package_managers("repo", {})
+        
+        assert detected["pip"]["content"] == {"requirements.txt": checkout / "requirements.txt"}
+        assert set(detected) == {"npm", "pip", "maven"}
+        
+        pip_deps = SCAScanner._parse_manifest("pip", detected["pip"])
+        npm_deps = SCAScanner._parse_manifest("npm", detected["npm"])
+        maven_deps = SCAScanner._parse_manifest("maven", detected["maven"])
+        
+        assert [dep["purl"] for dep in pip_deps] == [
+            "pkg:pypi/Django@3.2.1", "pkg:pypi/requests@2.25.0",
+        ]
+        assert [dep["purl"] for dep in npm_deps] == ["pkg:npm/lodash@4.17.20"]
+        assert maven_deps == []
+    
+    async def test_missing_directory_detects_nothing(self, tmp_path):
+        detected = await SCAScanner(workspace_root=str(tmp_path))._detect_package_managers("absent", {})
+        
+        assert detected == {}
+    
+    @pytest.mark.parametrize("target", ["/", "..", "../outside", "repo/../..", "."])
+    async def test_targets_outside_workspace_are_not_read(self, tmp_path, target):
+        workspace = tmp_path / "workspace"
+        (workspace / "repo").mkdir(parents=True)
+        (tmp_path / "outside").mkdir()
+        for directory in (tmp_path, tmp_path / "outside", workspace):
+            (directory / "requirements.txt").write_text("Django==3.2.1\n")
+        
+        scanner = SCAScanner(workspace_root=str(workspace))
+        
+        assert await scanner._detect_package_managers(target, {}) == {}
+    
+    async def test_no_workspace_root_reads_nothing(self, tmp_path):
+        (tmp_path / "requirements.txt").write_text("Django==3.2.1\n")
+        
+        scanner = SCAScanner()
+        scanner.workspace_root = None
+        
+        assert await scanner._detect_package_managers(str(tmp_path), {}) == {}
+    
+    async def test_symlinked_manifest_outside_checkout_is_skipped(self, tmp_path):
+        checkout = tmp_path / "repo"
+        checkout.mkdir()
+        (tmp_path / "secret.txt").write_text("Django==3.2.1\n")
+        (checkout / "requirements.txt").symlink_to(tmp_path / "secret.txt")
+        
+        detected = await SCAScanner(workspace_root=str(tmp_path))._detect_package_managers("repo", {})
+        
+        assert detected == {}
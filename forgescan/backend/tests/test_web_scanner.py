@@ -0,0 +1,145 @@
+# tests/test_web_scanner.py
+"""
+Web scanner tests
+Tests: Concurrency limit, shared GETs, streamed body matching, finding deduplication
+"""
+
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.scanners.web_scanner import (
+    BODY_SCAN_CHUNK_BYTES,
+    BODY_SCAN_MAX_BYTES,
+    SQL_ERROR_RE,
+    XSS_PAYLOADS,
+    XSS_PROBES,
+    WebScanner,
+)
+
+
+SQL_ERROR = b"You have an error in your SQL syntax; check the manual for your MySQL server"
+
+
+async def stream_parts(request, *parts):
+    """Send parts as separate writes so the client reads them as separate chunks"""
+    response = web.StreamResponse()
+    await response.prepare(request)
+    for part in parts:
+        await response.write(part)
+        await asyncio.sleep(0.01)
+    await response.write_eof()
+    return response
+
+
+class ProbeTarget:
+    """Local HTTP server standing in for a scanned site"""
+    
+    def __init__(self):
+        self.hits = 0
+        self.in_flight = 0
+        self.peak = 0
+        app = web.Application()
+        app.router.add_get("/reflect", self.reflect)
+        app.router.add_get("/split-error", self.split_error)
+        app.router.add_get("/late-error", self.late_error)
+        app.router.add_get("/page", self.page)
+        app.router.add_route("*", "/slow", self.slow)
+        self.server = TestServer(app)
+    
+    def url(self, path):
+        return str(self.server.make_url(path))
+    
+    async def reflect(self, request):
+        # The query value lands across the first chunk boundary
+        body = b"x" * (BODY_SCAN_CHUNK_BYTES - 10) + request.query.get("q", "").encode()
+        return await stream_parts(request, body[:BODY_SCAN_CHUNK_BYTES], body[BODY_SCAN_CHUNK_BYTES:])
+    
+    async def split_error(self, request):
+        middle = len(SQL_ERROR) // 2
+        return await stream_parts(request, b"<html>" + SQL_ERROR[:middle], SQL_ERROR[middle:])
+    
+    async def late_error(self, request):
+        padding = b"x" * BODY_SCAN_CHUNK_BYTES
+        return await stream_parts(
+            request, *[padding] * (BODY_SCAN_MAX_BYTES // BODY_SCAN_CHUNK_BYTES + 1), SQL_ERROR
+        )
+    
+    async def page(self, request):
+        self.hits += 1
+        await asyncio.sleep(0.01)
+        return web.Response(text="<html>ok</html>")
+    
+    async def slow(self, request):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.02)
+        self.in_flight -= 1
+        return web.Response(status=200)
+
+
+@pytest.fixture
+async def target():
+    target = ProbeTarget()
+    await target.server.start_server()
+    yield target
+    await target.server.close()
+
+
+@pytest.fixture
+async def scanner():
+    scanner = WebScanner()
+    await scanner.initialize()
+    yield scanner
+    await scanner.cleanup()
+
+
+class TestRequestHandling:
+    """Test request concurrency and sharing"""
+    
+    async def test_probes_respect_concurrency_limit(self, scanner, target):
+        scanner._sem = asyncio.Semaphore(3)
+        
+        statuses = await asyncio.gather(*(
+            scanner._fetch_status(target.url("/slow")) for _ in range(12)
+        ))
+        
+        assert statuses == [200] * 12
+        assert target.peak <= 3
+    
+    async def test_concurrent_gets_share_one_request(self, scanner, target):
+        responses = await asyncio.gather(*(scanner._get(target.url("/page")) for _ in range(5)))
+        await scanner._get(target.url("/page"))
+        
+        assert target.hits == 1
+        assert {status for status, _, _ in responses} == {200}
+
+
+class TestBodyMatching:
+    """Test streamed, chunked body matching"""
+    
+    async def test_needle_across_chunk_boundary(self, scanner, target):
+        payload = "<script>alert('XSS')</script>"
+        url = target.url("/reflect") + "?q=" + payload
+        
+        assert await scanner._body_matches(url, XSS_PAYLOADS[payload])
+        assert not await scanner._body_matches(url, b"<img src=x onerror=alert('XSS')>")
+    
+    async def test_pattern_across_chunk_boundary(self, scanner, target):
+        assert await scanner._body_matches(target.url("/split-error"), SQL_ERROR_RE)
+    
+    async def test_match_after_scan_cap_is_ignored(self, scanner, target):
+        assert not await scanner._body_matches(target.url("/late-error"), SQL_ERROR_RE)
+
+
+class TestFindingDeduplication:
+    """Test findings are reported once per vulnerable parameter"""
+    
+    async def test_xss_reported_once_per_parameter(self, scanner, target):
+        await scanner._check_xss_vulnerabilities(target.url("/reflect"))
+        
+        # Only q is echoed; every payload reflects there, one finding results
+        assert [finding["parameter"] for finding in scanner.findings] == ["q"]
+        assert len([probe for probe in XSS_PROBES if probe[0] == "q"]) > 1